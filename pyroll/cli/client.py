@@ -0,0 +1,47 @@
+import json
+import os
+import shutil
+import socket
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from .config import DEFAULT_SOCKET_FILE
+
+
+def request(socket_file: Path, args: List[str], cwd: Optional[Path] = None) -> int:
+    """
+    Sends the command chain ARGS to the daemon listening on SOCKET_FILE (see the serve command),
+    writes the streamed output to stdout and stderr and returns the exit code.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.connect(str(socket_file))
+        message = dict(args=args, cwd=str(cwd or os.getcwd()), width=shutil.get_terminal_size().columns)
+        s.sendall((json.dumps(message) + "\n").encode("utf-8"))
+
+        for line in s.makefile("r", encoding="utf-8"):
+            message = json.loads(line)
+
+            if message["type"] == "output":
+                stream = sys.stderr if message["stream"] == "stderr" else sys.stdout
+                stream.write(message["text"])
+                stream.flush()
+            elif message["type"] == "exit":
+                return message["code"]
+
+    print("Connection to daemon closed unexpectedly.", file=sys.stderr)
+    return 1
+
+
+def run_client(args=None):
+    """
+    Entry point of the pyroll-client script: pyroll-client [-s/--socket FILE] COMMAND1 [ARGS]... [COMMAND2 [ARGS]...]...
+    The socket file defaults to the PYROLL_SOCKET environment variable or to the default of the serve command.
+    """
+    args = sys.argv[1:] if args is None else list(args)
+    socket_file = os.getenv("PYROLL_SOCKET", DEFAULT_SOCKET_FILE)
+
+    if args[:1] in [["-s"], ["--socket"]]:
+        socket_file, args = args[1], args[2:]
+
+    sys.exit(request(Path(socket_file), args))
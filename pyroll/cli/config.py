@@ -1,16 +1,36 @@
 from pathlib import Path
 
 import click as click
-import jinja2 as jinja2
 
 RES_DIR = Path(__file__).parent / "res"
 DEFAULT_INPUT_PY_FILE = Path("input.py")
+DEFAULT_INPUT_TOML_FILE = Path("input.toml")
+DEFAULT_INPUT_JSON_FILE = Path("input.json")
 DEFAULT_CONFIG_FILE = Path("config.toml")
+DEFAULT_SWEEP_FILE = Path("sweep.toml")
+DEFAULT_OPTIMIZE_FILE = Path("optimize.toml")
+DEFAULT_SENSITIVITY_FILE = Path("sensitivity.toml")
+DEFAULT_STATE_FILE = Path("state.pickle.gz")
 
 APP_DIR = Path(click.get_app_dir("pyroll"))
 GLOBAL_CONFIG_FILE = APP_DIR / "config.toml"
 DEFAULT_HISTORY_FILE = APP_DIR / "shell_history"
+DEFAULT_CACHE_DIR = APP_DIR / "cache"
+DEFAULT_DISCOVERY_CACHE_FILE = APP_DIR / "discovery.json"
+DEFAULT_MEMO_DIR = APP_DIR / "memo"
+DEFAULT_SOCKET_FILE = APP_DIR / "serve.sock"
+DEFAULT_QUEUE_FILE = Path("queue.sqlite")
 
-JINJA_ENV = jinja2.Environment(
-    loader=jinja2.FileSystemLoader(RES_DIR, encoding="utf-8")
-)
+
+def __getattr__(name):
+    # the template environment is created on first access, as importing jinja2 is only needed by few commands
+    if name == "JINJA_ENV":
+        import jinja2 as jinja2
+
+        global JINJA_ENV
+        JINJA_ENV = jinja2.Environment(
+            loader=jinja2.FileSystemLoader(RES_DIR, encoding="utf-8")
+        )
+        return JINJA_ENV
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,67 @@
+import hashlib
+import io
+import pickle
+import weakref
+from typing import Optional
+
+from pyroll.core import Unit
+
+PROTOCOL = pickle.HIGHEST_PROTOCOL
+
+
+def _rebuild_subunits(cls, owner, units):
+    result = cls.__new__(cls)
+    result._owner = weakref.ref(owner)
+    list.extend(result, units)
+    return result
+
+
+class Pickler(pickle.Pickler):
+    """
+    Pickler able to serialize pass sequences, units and profiles.
+    The core objects hold weak references to their parents, which the standard pickler refuses,
+    they are restored here as weak references to the unpickled referents.
+    """
+
+    def reducer_override(self, obj):
+        if isinstance(obj, weakref.ReferenceType):
+            return weakref.ref, (obj(),)
+        if isinstance(obj, Unit._SubUnitsList):
+            return _rebuild_subunits, (type(obj), obj._owner(), list(obj))
+        return NotImplemented
+
+
+def dump(obj, file):
+    """Pickles OBJ to the binary FILE object."""
+    Pickler(file, protocol=PROTOCOL).dump(obj)
+
+
+def dumps(obj) -> bytes:
+    """Pickles OBJ to a bytes object."""
+    buffer = io.BytesIO()
+    dump(obj, buffer)
+    return buffer.getvalue()
+
+
+load = pickle.load
+loads = pickle.loads
+
+
+class _FingerprintPickler(Pickler):
+    def reducer_override(self, obj):
+        if isinstance(obj, weakref.ReferenceType):
+            return type(None), ()
+        return super().reducer_override(obj)
+
+
+def fingerprint(obj) -> Optional[str]:
+    """
+    Returns a hash of the pickled state of OBJ, ignoring weak references to parents and other related objects.
+    Returns None if OBJ cannot be pickled, f.e. because it holds lambda functions.
+    """
+    buffer = io.BytesIO()
+    try:
+        _FingerprintPickler(buffer, protocol=PROTOCOL).dump(obj)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return None
+    return hashlib.sha256(buffer.getvalue()).hexdigest()
@@ -1,38 +1,161 @@
-from importlib.metadata import entry_points
-
 from .main import main
 
-from . import input
-
-main.add_command(input.input_py)
-
-from . import create
-
-main.add_command(create.create_input_py)
-main.add_command(create.create_config)
-main.add_command(create.create_project)
-
-from . import shell
-
-main.add_command(shell.shell)
-main.add_command(shell.reset)
-
-from . import solve
-
-main.add_command(solve.solve)
-
-from . import edit
-
-main.add_command(edit.edit)
-
-
-def _add_extension_commands():
-    commands = entry_points(group="pyroll.cli.commands")
-
-    for c in commands:
-        main.add_command(c.load())
+main.add_lazy_command(
+    "input-py", "pyroll.cli.program.input:input_py",
+    "Reads input data from the Python script FILE."
+)
+
+main.add_lazy_command(
+    "input-toml", "pyroll.cli.program.input:input_toml",
+    "Reads input data from the declarative TOML document FILE."
+)
+
+main.add_lazy_command(
+    "input-json", "pyroll.cli.program.input:input_json",
+    "Reads input data from the declarative JSON document FILE."
+)
+
+main.add_lazy_command(
+    "create-input-py", "pyroll.cli.program.create:create_input_py",
+    "Creates a sample input script in FILE that can be loaded using input-py command."
+)
+main.add_lazy_command(
+    "create-config", "pyroll.cli.program.create:create_config",
+    "Creates a standard config in FILE that can be used with the -c option."
+)
+main.add_lazy_command(
+    "create-project", "pyroll.cli.program.create:create_project",
+    "Creates a new PyRoll simulation project in the directory specified by -d/--dir."
+)
+
+main.add_lazy_command(
+    "shell", "pyroll.cli.program.shell:shell",
+    "Opens a shell or REPL (Read Evaluate Print Loop) for interactive usage."
+)
+main.add_lazy_command(
+    "reset", "pyroll.cli.program.shell:reset",
+    "Reset the state of the simulation data."
+)
+
+main.add_lazy_command(
+    "session", "pyroll.cli.program.shell:session",
+    "Switches to another named session with its own loaded input and solution or lists the sessions."
+)
+
+main.add_lazy_command(
+    "solve", "pyroll.cli.program.solve:solve",
+    "Runs the solution procedure on all loaded roll passes."
+)
+
+main.add_lazy_command(
+    "jobs", "pyroll.cli.program.jobs:jobs",
+    "Lists the background jobs started by 'solve --background' and collects the results of finished ones."
+)
+
+main.add_lazy_command(
+    "wait", "pyroll.cli.program.jobs:wait",
+    "Waits for background jobs to finish and collects their results."
+)
+
+main.add_lazy_command(
+    "cancel", "pyroll.cli.program.jobs:cancel",
+    "Cancels running background jobs."
+)
+
+main.add_lazy_command(
+    "watch", "pyroll.cli.program.incremental:watch",
+    "Watches the input script FILE and reloads it and solves incrementally whenever it changes."
+)
+
+main.add_lazy_command(
+    "save-state", "pyroll.cli.program.snapshot:save_state",
+    "Saves the simulation state to a compressed snapshot FILE."
+)
+
+main.add_lazy_command(
+    "load-state", "pyroll.cli.program.snapshot:load_state",
+    "Restores the simulation state from a snapshot FILE saved by the save-state command."
+)
+
+main.add_lazy_command(
+    "mem", "pyroll.cli.program.retention:mem",
+    "Reports the estimated memory footprint of the simulation state and the resident memory of the process."
+)
+
+main.add_lazy_command(
+    "export", "pyroll.cli.program.export:export",
+    "Exports the results of the solved units of the loaded pass sequence as typed columns in binary NumPy format."
+)
+
+main.add_lazy_command(
+    "compare", "pyroll.cli.program.compare:compare",
+    "Compares the numeric results of the units of two solved results or directories of results within tolerances."
+)
+
+main.add_lazy_command(
+    "solve-sweep", "pyroll.cli.program.sweep:solve_sweep",
+    "Solves variants of the loaded pass sequence as defined by the sweep spec in the TOML file SPEC."
+)
+
+main.add_lazy_command(
+    "optimize", "pyroll.cli.program.optimize:optimize",
+    "Searches values of free parameters of the loaded pass sequence within bounds meeting target values of results."
+)
+
+main.add_lazy_command(
+    "sensitivity", "pyroll.cli.program.sensitivity:sensitivity",
+    "Computes sensitivities of exit profile and roll force outputs with respect to parameters by finite differences."
+)
+
+main.add_lazy_command(
+    "solve-batch", "pyroll.cli.program.batch:solve_batch",
+    "Solves many input scripts like those read by the input-py command in parallel."
+)
+
+main.add_lazy_command(
+    "enqueue", "pyroll.cli.program.workqueue:enqueue",
+    "Adds jobs to solve the input FILES to a work queue processed by worker commands, possibly on other hosts."
+)
+
+main.add_lazy_command(
+    "worker", "pyroll.cli.program.workqueue:worker",
+    "Processes jobs from a work queue filled by the enqueue command."
+)
+
+main.add_lazy_command(
+    "queue-status", "pyroll.cli.program.workqueue:queue_status",
+    "Shows the count of jobs per status in a work queue and optionally writes the records of all jobs."
+)
+
+main.add_lazy_command(
+    "cache-stats", "pyroll.cli.program.cache:cache_stats",
+    "Shows statistics of the solution cache."
+)
+main.add_lazy_command(
+    "cache-clear", "pyroll.cli.program.cache:cache_clear",
+    "Deletes all entries of the solution cache."
+)
+
+main.add_lazy_command(
+    "serve", "pyroll.cli.program.serve:serve",
+    "Runs a daemon executing command chains sent by clients (see the pyroll-client script) over a Unix domain socket."
+)
+
+main.add_lazy_command(
+    "bench", "pyroll.cli.program.bench:bench",
+    "Benchmarks the phases of CLI usage separately."
+)
+
+main.add_lazy_command(
+    "doctor", "pyroll.cli.program.doctor:doctor",
+    "Diagnoses the CLI installation and configuration, f.e. where the startup time and memory go."
+)
+
+main.add_lazy_command(
+    "edit", "pyroll.cli.program.edit:edit",
+    "Open and edit a specified file in a text editor."
+)
 
 
 def run_cli(args=None):
-    _add_extension_commands()
     main(args)
@@ -0,0 +1,161 @@
+import contextlib
+import glob
+import json
+import multiprocessing
+import multiprocessing.connection
+import os
+import sys
+from pathlib import Path
+from timeit import default_timer as timer
+from typing import Callable, Iterable, List, Optional, Tuple
+
+import click as click
+
+from .input import load_input_py
+from .state import State
+from .worker import init_worker, solve_and_summarize
+from ..rich import console_to_stderr
+
+
+@click.command()
+@click.option(
+    "-g", "--glob", "patterns",
+    help="Glob pattern of input scripts to solve, relative to the working directory. May be given multiple times.",
+    multiple=True
+)
+@click.option(
+    "-m", "--manifest",
+    help="Text file listing input scripts to solve, one per line, relative to the manifest file.",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path), default=None
+)
+@click.option(
+    "-j", "--workers",
+    help="Count of worker processes to use. Defaults to the count of CPUs.",
+    type=click.IntRange(min=1), default=None
+)
+@click.option(
+    "-o", "--output",
+    help="JSON lines file to stream the result records to. If '-', records are written to stdout "
+         "and console output is moved to stderr.",
+    type=click.Path(dir_okay=False, allow_dash=True, path_type=str), default="-", show_default=True
+)
+@click.pass_obj
+def solve_batch(state: State, patterns: Tuple[str], manifest: Path, workers: int, output: str):
+    """
+    Solves many input scripts like those read by the input-py command in parallel.
+    Each script is loaded and solved in its own worker process, so that hook functions and modules
+    defined by one script do not leak into others. Where available, the worker processes are forked
+    from a server process with PyRolL Core and the plugins already imported.
+    A JSON record with the status, durations and exit profile dimensions is written per script as it finishes.
+    """
+    files = discover_input_files(patterns, manifest)
+
+    if not files:
+        state.logger.critical("No input scripts found. Use the -g/--glob or -m/--manifest options to specify them.")
+        sys.exit(1)
+
+    failed = 0
+
+    with contextlib.ExitStack() as stack:
+        if output == "-":
+            stack.enter_context(console_to_stderr())
+        stream = stack.enter_context(click.open_file(output, "w", encoding="utf-8"))
+
+        state.logger.info("Solving %d input scripts.", len(files))
+
+        for file, result in solve_isolated(state, files, workers):
+            record = dict(file=str(file), **result)
+            stream.write(json.dumps(record) + "\n")
+            stream.flush()
+
+            if record["status"] != "ok":
+                failed += 1
+                state.logger.error("Solution of %s failed with error: %s", record["file"], record["error"])
+
+        state.logger.info("Finished %d input scripts, %d failed.", len(files), failed)
+
+
+def discover_input_files(patterns: Tuple[str], manifest: Path) -> List[Path]:
+    """Collects the input script paths matching the glob PATTERNS and listed in the MANIFEST file."""
+    files = [Path(f) for p in patterns for f in sorted(glob.glob(p, recursive=True))]
+
+    if manifest:
+        for line in manifest.read_text(encoding="utf-8").splitlines():
+            line = line.strip()
+            if line and not line.startswith("#"):
+                files.append(manifest.parent / line)
+
+    return list(dict.fromkeys(f.resolve() for f in files))
+
+
+def _context(plugins: List[str], modules: List[str]):
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+
+    context = multiprocessing.get_context("forkserver")
+    # only effective before the server process is started, which happens on first use
+    context.set_forkserver_preload(["pyroll.core", "pyroll.cli.program.batch", *modules, *plugins])
+    return context
+
+
+def solve_isolated(
+        state: State, items: List, workers: Optional[int], solve: Callable[[object], dict] = None
+) -> Iterable[Tuple[object, dict]]:
+    """
+    Solves each of ITEMS in a new process, running at most WORKERS at once (the count of CPUs if None).
+    SOLVE is a module level function returning the result record of an item,
+    by default the items are input script files which are loaded and solved.
+    Yields the items with their result records in order of completion.
+    """
+    solve = solve or _solve_file
+    context = _context(state.plugins, [solve.__module__])
+    workers = workers or os.cpu_count() or 1
+    pending = list(reversed(items))
+    running = {}
+
+    try:
+        while pending or running:
+            while pending and len(running) < workers:
+                item = pending.pop()
+                receiver, sender = context.Pipe(duplex=False)
+                process = context.Process(
+                    target=_run_item, args=(sender, solve, item, state.config, state.plugins), daemon=True
+                )
+                process.start()
+                sender.close()
+                running[receiver] = (item, process)
+
+            for receiver in multiprocessing.connection.wait(list(running)):
+                item, process = running.pop(receiver)
+                try:
+                    result = receiver.recv()
+                except EOFError:
+                    result = None
+                receiver.close()
+                process.join()
+
+                if result is None:
+                    result = dict(status="failed", error=f"Worker process exited with code {process.exitcode}.")
+                yield item, result
+    finally:
+        for receiver, (_, process) in running.items():
+            process.terminate()
+            process.join()
+            receiver.close()
+
+
+def _run_item(connection, solve: Callable[[object], dict], item, config: dict, plugins: List[str]):
+    init_worker(config, plugins)
+    connection.send(solve(item))
+    connection.close()
+
+
+def _solve_file(file: Path) -> dict:
+    start = timer()
+    try:
+        in_profile, sequence = load_input_py(file)
+    except Exception as e:
+        return dict(status="failed", load_duration=timer() - start, error=f"Error during reading of input file: {e}")
+    load_duration = timer() - start
+
+    return dict(load_duration=load_duration, **solve_and_summarize(in_profile, sequence))
@@ -0,0 +1,218 @@
+import contextlib
+import copy
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from timeit import default_timer as timer
+from typing import Callable, Tuple, Iterable
+
+import click as click
+from rich.table import Table
+
+from .input import load_input_py
+from .main import load_config, installed_pyroll_versions
+from .state import State
+from ..config import RES_DIR
+from ..rich import console
+
+PHASES = ["startup", "config", "plugins", "input", "solve"]
+
+_IMPORT_SCRIPT = """
+import importlib, time
+for m in {preload!r}:
+    importlib.import_module(m)
+start = time.perf_counter()
+importlib.import_module({module!r})
+print(time.perf_counter() - start)
+"""
+
+
+@click.command()
+@click.option(
+    "-r", "--repeat",
+    help="Count of measured repetitions per benchmark.",
+    type=click.IntRange(min=1), default=3, show_default=True
+)
+@click.option(
+    "-w", "--warmup",
+    help="Count of unmeasured repetitions per benchmark before measuring.",
+    type=click.IntRange(min=0), default=1, show_default=True
+)
+@click.option(
+    "-P", "--phase", "phases",
+    help="Phase to benchmark. May be given multiple times. Defaults to all phases.",
+    type=click.Choice(PHASES), multiple=True, default=PHASES, show_default=True
+)
+@click.option(
+    "-n", "--passes",
+    help="Count of roll passes of a synthetic pass sequence to solve. May be given multiple times.",
+    type=click.IntRange(min=1), multiple=True, default=[100], show_default=True
+)
+@click.option(
+    "-o", "--output",
+    help="JSON file to write the results to.",
+    type=click.Path(dir_okay=False, path_type=Path), default=None
+)
+@click.pass_context
+def bench(ctx: click.Context, repeat: int, warmup: int, phases: Tuple[str], passes: Tuple[int], output: Path):
+    """
+    Benchmarks the phases of CLI usage separately: startup, config loading, plugin import,
+    input script execution and solution of the bundled input.py and of synthetic long pass sequences.
+    Imports are timed in a clean interpreter, so those of plugins include importing PyRolL Core,
+    their own import time without it is reported separately as 'import-own:<plugin>'.
+    The results are printed as table and can be saved as JSON to compare across versions and plugin sets.
+    """
+    state: State = ctx.obj
+    root_params = ctx.find_root().params
+    results = {}
+
+    for name, func in _gen_benchmarks(state, root_params, phases, passes):
+        with console.status(f"[bold green]Running benchmark {name}..."):
+            for _ in range(warmup):
+                func()
+            times = [func() for _ in range(repeat)]
+
+        results[name] = dict(
+            times=times,
+            min=min(times),
+            mean=statistics.mean(times),
+            median=statistics.median(times),
+            stdev=statistics.stdev(times) if len(times) > 1 else 0.0,
+            max=max(times),
+        )
+        state.logger.info("Finished benchmark %s: %.4f s (median).", name, results[name]["median"])
+
+    table = Table(title="Benchmark Results")
+    table.add_column("Benchmark")
+    for c in ["Min [s]", "Median [s]", "Mean [s]", "Std. Dev. [s]", "Max [s]"]:
+        table.add_column(c, justify="right")
+    for name, r in results.items():
+        table.add_row(name, *[f"{r[k]:.4f}" for k in ["min", "median", "mean", "stdev", "max"]])
+    console.print(table)
+
+    if output:
+        output.write_text(json.dumps(dict(meta=_meta(state, repeat, warmup), results=results), indent=2))
+        state.logger.info("Wrote benchmark results to: %s", output.absolute())
+
+
+def synthetic_sequence(pass_count: int):
+    """Creates an in profile and a pass sequence of alternating oval and round passes with PASS_COUNT roll passes."""
+    import pyroll.core as pr
+
+    in_profile = pr.Profile.round(
+        diameter=30e-3,
+        temperature=1200 + 273.15,
+        strain=0,
+        material=["C45", "steel"],
+        flow_stress=40e6,
+        density=7.7e3,
+        specific_heat_capacity=465,
+        thermal_conductivity=23,
+    )
+
+    def _gen_units():
+        for i in range(1, pass_count + 1):
+            if i % 2:
+                label, groove = f"Oval {i}", pr.CircularOvalGroove(r1=6e-3, r2=40e-3, depth=8e-3)
+            else:
+                label, groove = f"Round {i}", pr.RoundGroove(r1=1e-3, r2=12.5e-3, depth=11.5e-3)
+
+            yield pr.RollPass(
+                label=label,
+                roll=pr.Roll(groove=groove, nominal_radius=160e-3, rotational_frequency=1),
+                gap=2e-3,
+            )
+
+            if i < pass_count:
+                yield pr.Transport(label=f"{label} => {i + 1}", duration=1)
+
+    return in_profile, pr.PassSequence(list(_gen_units()))
+
+
+def _gen_benchmarks(
+        state: State, root_params: dict, phases: Iterable[str], passes: Iterable[int]
+) -> Iterable[Tuple[str, Callable[[], float]]]:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+
+    if "startup" in phases:
+        def _startup():
+            start = timer()
+            subprocess.run([sys.executable, "-m", "pyroll.cli", "--help"], env=env, capture_output=True, check=True)
+            return timer() - start
+
+        yield "startup", _startup
+
+    if "config" in phases:
+        def _config():
+            start = timer()
+            with _quiet():
+                load_config(root_params["config_file"], root_params["global_config"])
+            return timer() - start
+
+        yield "config", _config
+
+    if "plugins" in phases:
+        def _import(module: str, preload: Tuple[str, ...] = ()) -> Callable[[], float]:
+            def _run():
+                result = subprocess.run(
+                    [sys.executable, "-c", _IMPORT_SCRIPT.format(module=module, preload=preload)],
+                    env=env, capture_output=True, check=True, text=True
+                )
+                return float(result.stdout.splitlines()[-1])
+
+            return _run
+
+        yield "import:pyroll.core", _import("pyroll.core")
+
+        for plugin in state.plugins:
+            yield f"import:{plugin}", _import(plugin)
+            yield f"import-own:{plugin}", _import(plugin, ("pyroll.core",))
+
+    if "input" in phases:
+        def _input():
+            start = timer()
+            load_input_py(RES_DIR / "input.py")
+            return timer() - start
+
+        yield "input", _input
+
+    if "solve" in phases:
+        inputs = [("solve:input.py", load_input_py(RES_DIR / "input.py"))]
+        inputs += [(f"solve:synthetic-{n}", synthetic_sequence(n)) for n in passes]
+
+        for name, base in inputs:
+            def _solve(base=base):
+                in_profile, sequence = copy.deepcopy(base)
+                start = timer()
+                sequence.solve(in_profile)
+                return timer() - start
+
+            yield name, _solve
+
+
+@contextlib.contextmanager
+def _quiet():
+    quiet = console.quiet
+    console.quiet = True
+    try:
+        yield
+    finally:
+        console.quiet = quiet
+
+
+def _meta(state: State, repeat: int, warmup: int) -> dict:
+    from .. import VERSION
+
+    return dict(
+        cli_version=VERSION,
+        python_version=platform.python_version(),
+        platform=platform.platform(),
+        plugins=state.plugins,
+        distributions=installed_pyroll_versions(),
+        repeat=repeat,
+        warmup=warmup,
+    )
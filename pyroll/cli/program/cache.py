@@ -0,0 +1,207 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+from pathlib import Path
+from typing import Optional, List
+
+import click as click
+from rich.table import Table
+
+from .main import installed_pyroll_versions
+from .state import State
+from .. import pickling
+from ..config import DEFAULT_CACHE_DIR
+from ..rich import console
+
+DEFAULT_MAX_SIZE = 1024 ** 3
+
+
+class SolutionCache:
+    """
+    On-disk cache of solved pass sequences.
+    Entries are addressed by a hash of the input script, the effective config,
+    the loaded plugins and the versions of installed PyRolL packages.
+    The least recently used entries are evicted if the total size exceeds ``max_size``.
+    Failures to store or read an entry are logged as warnings and do not affect the solution.
+    """
+
+    def __init__(
+            self, dir: Path = DEFAULT_CACHE_DIR, max_size: int = DEFAULT_MAX_SIZE,
+            logger: Optional[logging.Logger] = None
+    ):
+        self.dir = dir
+        """Directory to store the entries in."""
+
+        self.max_size = max_size
+        """Maximum total size of all entries in bytes."""
+
+        self.logger = logger or logging.getLogger("pyroll.cli")
+        """Logger to report failures to store or read entries to."""
+
+    @classmethod
+    def from_config(cls, config: dict, logger: Optional[logging.Logger] = None) -> "SolutionCache":
+        """Creates an instance from the ``cache`` table of CONFIG."""
+        cache_config = config.get("cache", {})
+        return cls(
+            dir=Path(cache_config.get("dir", DEFAULT_CACHE_DIR)),
+            max_size=int(cache_config.get("max_size", DEFAULT_MAX_SIZE)),
+            logger=logger,
+        )
+
+    @staticmethod
+    def key(state: State) -> Optional[str]:
+        """Computes the key of the current input in STATE, returns None if the input has no known source hash."""
+        if not state.input_hash:
+            return None
+
+        key = json.dumps(
+            dict(
+                input=state.input_hash,
+                config=state.config,
+                plugins=state.plugins,
+                versions=installed_pyroll_versions()
+            ),
+            sort_keys=True, default=str
+        )
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def _file(self, key: str) -> Path:
+        return self.dir / f"{key}.pickle"
+
+    @property
+    def _stats_file(self) -> Path:
+        return self.dir / "stats.json"
+
+    def entries(self) -> List[Path]:
+        """Lists the entry files, least recently used first."""
+        if not self.dir.exists():
+            return []
+        return sorted(self.dir.glob("*.pickle"), key=lambda f: f.stat().st_mtime)
+
+    def get(self, key: str):
+        """
+        Returns the cached object for KEY or None if there is no entry.
+        Entries that cannot be read, f.e. as they are truncated, count as miss and are deleted.
+        """
+        file = self._file(key)
+
+        try:
+            with file.open("rb") as f:
+                result = pickling.load(f)
+        except FileNotFoundError:
+            self._count("misses")
+            return None
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, IndexError) as e:
+            self.logger.warning("Deleted unreadable solution cache entry %s: %s", key, e)
+            file.unlink(missing_ok=True)
+            self._count("misses")
+            return None
+
+        os.utime(file)
+        self._count("hits")
+        return result
+
+    def put(self, key: str, obj) -> bool:
+        """
+        Stores OBJ as entry for KEY and evicts least recently used entries if needed.
+        Returns whether the entry was stored, which fails if OBJ cannot be pickled, f.e. as it holds lambda functions.
+        """
+        self.dir.mkdir(parents=True, exist_ok=True)
+        file = self._file(key)
+        tmp = file.with_suffix(f".{os.getpid()}.tmp")
+
+        try:
+            with tmp.open("wb") as f:
+                pickling.dump(obj, f)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            tmp.unlink(missing_ok=True)
+            self.logger.warning("Could not store solution in cache, as it cannot be pickled: %s", e)
+            return False
+        os.replace(tmp, file)
+
+        self.evict()
+        return True
+
+    def evict(self) -> int:
+        """Deletes least recently used entries until the total size fits ``max_size``, returns the count deleted."""
+        entries = [(f, f.stat().st_size) for f in self.entries()]
+        total = sum(s for _, s in entries)
+        count = 0
+
+        for f, s in entries:
+            if total <= self.max_size:
+                break
+            f.unlink(missing_ok=True)
+            total -= s
+            count += 1
+
+        return count
+
+    def clear(self) -> int:
+        """Deletes all entries and statistics, returns the count of deleted entries."""
+        entries = self.entries()
+        for f in entries:
+            f.unlink(missing_ok=True)
+        self._stats_file.unlink(missing_ok=True)
+        return len(entries)
+
+    def stats(self) -> dict:
+        """Returns statistics about the entries and the hits and misses since the last clearing."""
+        entries = self.entries()
+        counts = self._read_counts()
+        return dict(
+            dir=str(self.dir),
+            entries=len(entries),
+            size=sum(f.stat().st_size for f in entries),
+            max_size=self.max_size,
+            hits=counts.get("hits", 0),
+            misses=counts.get("misses", 0),
+        )
+
+    def _read_counts(self) -> dict:
+        try:
+            return json.loads(self._stats_file.read_text())
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _count(self, name: str):
+        self.dir.mkdir(parents=True, exist_ok=True)
+        counts = self._read_counts()
+        counts[name] = counts.get(name, 0) + 1
+        self._stats_file.write_text(json.dumps(counts))
+
+
+@click.command()
+@click.pass_obj
+def cache_stats(state: State):
+    """Shows statistics of the solution cache."""
+    stats = SolutionCache.from_config(state.config).stats()
+
+    table = Table(title="Solution Cache", show_header=False)
+    table.add_column(style="bold")
+    table.add_column(justify="right")
+
+    table.add_row("Directory", stats["dir"])
+    table.add_row("Entries", str(stats["entries"]))
+    table.add_row("Size", f"{stats['size'] / 1024 ** 2:.2f} MiB")
+    table.add_row("Maximum Size", f"{stats['max_size'] / 1024 ** 2:.2f} MiB")
+    table.add_row("Hits", str(stats["hits"]))
+    table.add_row("Misses", str(stats["misses"]))
+
+    console.print(table)
+
+
+@click.command()
+@click.option(
+    "-y/-n", "--yes/--no",
+    help="Confirm to clear without prompt.",
+    default=False,
+)
+@click.pass_obj
+def cache_clear(state: State, yes: bool):
+    """Deletes all entries of the solution cache."""
+    if yes or click.confirm("Clear solution cache?"):
+        count = SolutionCache.from_config(state.config).clear()
+        state.logger.info("Deleted %d entries from solution cache.", count)
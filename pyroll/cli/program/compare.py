@@ -0,0 +1,275 @@
+import json
+import math
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import click as click
+import numpy as np
+from rich.table import Table
+
+from .export import read_columns, flatten_sequence, SCHEMA_FILE_NAME
+from .state import State
+from .. import pickling
+from ..rich import console
+
+RESULT_SUFFIXES = [".npz", ".gz", ".pickle"]
+"""Suffixes of result files: exported NumPy archives, state snapshots and solution cache entries."""
+
+KEY_COLUMNS = ["index", "label", "type"]
+
+
+class ResultMismatchError(ValueError):
+    """Raised if two results cannot be compared as their units differ."""
+
+
+def is_result(path: Path) -> bool:
+    """Whether PATH is a result readable by :py:func:`load_result`."""
+    return path.suffix in RESULT_SUFFIXES or (path / SCHEMA_FILE_NAME).is_file()
+
+
+def load_result(path: Path) -> Dict[str, np.ndarray]:
+    """
+    Loads a solved result as columns like those of :py:func:`export.flatten_sequence`.
+    PATH may be an export directory or ``.npz`` archive written by the 'export' command (read without converting),
+    a state snapshot (``.gz``) written by 'save-state' or a solution cache entry (``.pickle``).
+    """
+    if path.suffix == ".gz":
+        from .snapshot import load_snapshot
+        sequence = load_snapshot(path)["sequence"]
+    elif path.suffix == ".pickle":
+        with path.open("rb") as f:
+            _, sequence = pickling.load(f)
+    else:
+        return read_columns(path)
+
+    if sequence is None or sequence.out_profile is None:
+        raise ValueError(f"The pass sequence in {path} is not solved.")
+
+    return flatten_sequence(sequence)
+
+
+def find_pairs(a: Path, b: Path) -> Tuple[List[Tuple[str, Path, Path]], List[str]]:
+    """
+    Returns the pairs of results to compare as name and paths, and the names of results existing only on one side.
+    If A and B are results themselves, they form the only pair.
+    Otherwise, they are directories whose results are paired by name.
+    """
+    if is_result(a) or is_result(b):
+        return [(a.name, a, b)], []
+
+    entries_a = {p.name: p for p in a.iterdir() if is_result(p)}
+    entries_b = {p.name: p for p in b.iterdir() if is_result(p)}
+
+    pairs = [(n, entries_a[n], entries_b[n]) for n in sorted(entries_a.keys() & entries_b.keys())]
+    unpaired = sorted(entries_a.keys() ^ entries_b.keys())
+    return pairs, unpaired
+
+
+def _check_keys(a: Dict[str, np.ndarray], b: Dict[str, np.ndarray]):
+    only_a, only_b = sorted(a.keys() - b.keys()), sorted(b.keys() - a.keys())
+    if only_a or only_b:
+        raise ResultMismatchError(f"Columns differ: {only_a} only in A, {only_b} only in B.")
+
+    differing = sorted(c for c in a if (a[c].dtype.kind == "f") != (b[c].dtype.kind == "f"))
+    if differing:
+        raise ResultMismatchError(f"Columns are numeric only on one side: {differing}.")
+
+    if len(a["index"]) != len(b["index"]):
+        raise ResultMismatchError(f"Unit counts differ: {len(a['index'])} and {len(b['index'])}.")
+
+    for c in ["label", "type"]:
+        differing = np.flatnonzero(np.asarray(a[c]) != np.asarray(b[c]))
+        if len(differing):
+            i = differing[0]
+            raise ResultMismatchError(f"Unit {c}s differ at index {i}: '{a[c][i]}' and '{b[c][i]}'.")
+
+
+class Comparison:
+    """
+    Accumulates the numeric columns of many result pairs and compares them at once per quantity
+    with vectorized array operations.
+    Two values are equal within the tolerances if ``|a - b| <= atol + rtol * |b|``, NaN equals only NaN
+    and infinities equal only infinities of the same sign.
+    """
+
+    def __init__(self, rtol: float, atol: float):
+        self.rtol = rtol
+        self.atol = atol
+
+        self.names: List[str] = []
+        """Names of the added pairs."""
+
+        self.mismatches: Dict[str, str] = {}
+        """Reasons by name of pairs whose units or columns differ or which could not be loaded."""
+
+        self._labels: List[np.ndarray] = []
+        self._values: Dict[str, Tuple[List[np.ndarray], List[np.ndarray], List[np.ndarray]]] = {}
+
+    def add(self, name: str, a: Dict[str, np.ndarray], b: Dict[str, np.ndarray]):
+        """Adds the pair of results A and B under NAME."""
+        try:
+            _check_keys(a, b)
+        except ResultMismatchError as e:
+            self.mismatches[name] = str(e)
+            return
+
+        pair = len(self.names)
+        self.names.append(name)
+        self._labels.append(np.asarray(a["label"]))
+
+        for c in a:
+            if c in KEY_COLUMNS or a[c].dtype.kind != "f":
+                continue
+
+            values_a, values_b, pairs = self._values.setdefault(c, ([], [], []))
+            values_a.append(np.asarray(a[c]))
+            values_b.append(np.asarray(b[c]))
+            pairs.append(np.full(len(a[c]), pair, dtype=np.int64))
+
+    def compare(self) -> Tuple[Dict[str, dict], Dict[str, int]]:
+        """
+        Compares the accumulated values and returns per quantity the count of compared values and of violations
+        of the tolerances, the maximum absolute and relative deviation and the location of the worst violation
+        (or of the maximum relative deviation if there is none).
+        Returns also the count of violations per pair name, only for pairs with violations.
+        """
+        results = {}
+        pair_counts = np.zeros(len(self.names), dtype=np.int64)
+
+        for c, (values_a, values_b, pairs) in sorted(self._values.items()):
+            a = np.concatenate(values_a)
+            b = np.concatenate(values_b)
+            pair = np.concatenate(pairs)
+            row = np.concatenate([np.arange(len(v)) for v in values_a])
+
+            nan_a = np.isnan(a)
+            nan_b = np.isnan(b)
+            with np.errstate(invalid="ignore"):
+                deviation = np.abs(a - b)
+            deviation[(a == b) | (nan_a & nan_b)] = 0
+            deviation[nan_a ^ nan_b] = np.inf
+
+            scale = np.abs(b)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                relative = np.where(deviation == 0, 0.0, deviation / scale)
+            relative[np.isinf(deviation)] = np.inf
+
+            excess = deviation - (self.atol + self.rtol * np.where(np.isfinite(scale), scale, 0))
+            violations = excess > 0
+            pair_counts += np.bincount(pair[violations], minlength=len(self.names))
+
+            worst = int(np.argmax(excess)) if violations.any() else int(np.argmax(relative)) if len(a) else None
+
+            results[c] = dict(
+                compared=int(len(a)),
+                violations=int(violations.sum()),
+                max_abs_deviation=float(deviation.max()) if len(a) else 0.0,
+                max_rel_deviation=float(relative.max()) if len(a) else 0.0,
+                worst=dict(
+                    pair=self.names[pair[worst]],
+                    index=int(row[worst]),
+                    unit=str(self._labels[pair[worst]][row[worst]]),
+                    a=float(a[worst]),
+                    b=float(b[worst]),
+                ) if worst is not None else None,
+            )
+
+        return results, {self.names[i]: int(n) for i, n in enumerate(pair_counts) if n}
+
+
+@click.command()
+@click.argument("a", type=click.Path(exists=True, path_type=Path))
+@click.argument("b", type=click.Path(exists=True, path_type=Path))
+@click.option(
+    "-r", "--rtol",
+    help="Relative tolerance of deviations, relative to the values of B.",
+    type=click.FloatRange(min=0), default=1e-5, show_default=True
+)
+@click.option(
+    "-a", "--atol",
+    help="Absolute tolerance of deviations.",
+    type=click.FloatRange(min=0), default=1e-8, show_default=True
+)
+@click.option(
+    "-o", "--output",
+    help="JSON file to write the comparison results to.",
+    type=click.Path(dir_okay=False, path_type=Path), default=None
+)
+@click.pass_obj
+def compare(state: State, a: Path, b: Path, rtol: float, atol: float, output: Path):
+    """
+    Compares the numeric results of all units of the solved results A and B within tolerances
+    and reports the worst deviation per quantity. Exits with code 1 if any deviation exceeds the tolerances
+    or the results cannot be compared.
+
+    A and B may be export directories or archives written by 'export', state snapshots written by 'save-state'
+    or solution cache entries. They may also be directories of such results, whose results are compared in pairs
+    by name. All pairs are compared at once per quantity.
+    """
+    pairs, unpaired = find_pairs(a, b)
+    comparison = Comparison(rtol, atol)
+
+    for name in unpaired:
+        comparison.mismatches[name] = "Result exists only on one side."
+
+    with console.status("[bold green]Loading results...") as status:
+        for i, (name, path_a, path_b) in enumerate(pairs):
+            try:
+                comparison.add(name, load_result(path_a), load_result(path_b))
+            except (OSError, ValueError, KeyError) as e:
+                comparison.mismatches[name] = str(e)
+            status.update(f"[bold green]Loaded {i + 1}/{len(pairs)} result pairs...")
+
+    results, pair_violations = comparison.compare()
+
+    for name, reason in comparison.mismatches.items():
+        state.logger.error("Could not compare %s: %s", name, reason)
+
+    console.print(_results_table(results))
+    state.logger.info(
+        "Compared %d result pairs, %d have deviations beyond the tolerances, %d could not be compared.",
+        len(comparison.names), len(pair_violations), len(comparison.mismatches)
+    )
+
+    if output:
+        output.write_text(json.dumps(_json_safe(dict(
+            rtol=rtol, atol=atol, pairs=len(comparison.names), quantities=results,
+            pair_violations=pair_violations, mismatches=comparison.mismatches,
+        )), indent=2), encoding="utf-8")
+        state.logger.info("Wrote comparison results to: %s", output.absolute())
+
+    if pair_violations or comparison.mismatches:
+        sys.exit(1)
+
+
+def _json_safe(obj):
+    """Replaces non-finite floats in OBJ by the strings 'nan', 'inf' and '-inf', which are not valid JSON numbers."""
+    if isinstance(obj, dict):
+        return {k: _json_safe(v) for k, v in obj.items()}
+    if isinstance(obj, float) and not math.isfinite(obj):
+        return str(obj)
+    return obj
+
+
+def _results_table(results: Dict[str, dict]) -> Table:
+    table = Table(title="Worst Deviations")
+    table.add_column("Quantity")
+    for c in ["Compared", "Violations", "Max. Abs. Dev.", "Max. Rel. Dev."]:
+        table.add_column(c, justify="right")
+    table.add_column("Worst At")
+    for c in ["A", "B"]:
+        table.add_column(c, justify="right")
+
+    for c, r in results.items():
+        worst = r["worst"]
+        table.add_row(
+            c, str(r["compared"]), str(r["violations"]),
+            f"{r['max_abs_deviation']:.3g}", f"{r['max_rel_deviation']:.3g}",
+            f"{worst['pair']}: {worst['unit']} (#{worst['index']})" if worst else "-",
+            f"{worst['a']:.6g}" if worst else "-",
+            f"{worst['b']:.6g}" if worst else "-",
+            style="red" if r["violations"] else None,
+        )
+
+    return table
@@ -1,14 +1,19 @@
+import hashlib
 import importlib
+import importlib.metadata
+import json
+import logging
 import sys
 from pathlib import Path
+from typing import Optional
 
 import click as click
 import tomli
 import tomli_w
 
 from .state import State
-from ..config import DEFAULT_CONFIG_FILE, JINJA_ENV, DEFAULT_INPUT_PY_FILE, RES_DIR
-import pyroll.core
+from ..config import DEFAULT_CONFIG_FILE, DEFAULT_INPUT_PY_FILE, RES_DIR, DEFAULT_DISCOVERY_CACHE_FILE
+import pyroll
 
 
 @click.command()
@@ -30,62 +35,31 @@ import pyroll.core
          "As plugins are considered: all packages in the 'pyroll' namespace package except 'core'.",
     default=True
 )
+@click.option(
+    "--refresh",
+    help="Discover plugins and config constants anew instead of using the cached results of a previous run. "
+         "Needed if plugins have changed without changing their installed versions, f.e. in editable installs.",
+    is_flag=True, default=False
+)
 @click.pass_obj
-def create_config(state: State, file: Path, include_plugins: bool, include_config_constants: bool):
+def create_config(state: State, file: Path, include_plugins: bool, include_config_constants: bool, refresh: bool):
     """Creates a standard config in FILE that can be used with the -c option."""
     if file.exists():
         click.confirm(f"File {file} already exists, overwrite?", abort=True)
 
+    from ..config import JINJA_ENV
     template = JINJA_ENV.get_template("config.toml")
 
-    import pkgutil
-
-    if include_plugins:
-        plugins = [
-            "pyroll." + module.name
-            for module in pkgutil.iter_modules(pyroll.__path__)
-            if module.name not in ["core", "cli", "report", "export"]
-        ]
-    else:
-        plugins = []
+    discovery = discover_plugins(
+        state.logger,
+        cache_file=Path(state.config.get("cache", {}).get("discovery_file", DEFAULT_DISCOVERY_CACHE_FILE)),
+        config=state.config,
+        include_config_constants=include_config_constants,
+        refresh=refresh,
+    )
 
-    if include_config_constants:
-        def _gen_modules():
-            modules = [
-                "pyroll." + m.name
-                for m in pkgutil.iter_modules(pyroll.__path__)
-            ]
-            for m in modules:
-                try:
-                    module = importlib.import_module(m)
-                    sys.modules[m] = module
-                    yield module
-                except ImportError:
-                    continue
-
-        def _convert(value: object):
-            if isinstance(value, Path):
-                return str(value)
-            return value
-
-        def _gen_values(module):
-            config = getattr(module, "Config", None)
-            if config:
-                for n in config.to_dict():
-                    v = getattr(config, n)
-                    try:
-                        yield tomli_w.dumps({n: _convert(v)})
-                    except TypeError:
-                        state.logger.error(f"Could not serialize '{module.__name__}.{n}'. Skipping.")
-                        continue
-
-        config_constants = {
-            m.__name__: values
-            for m in _gen_modules()
-            if (values := list(_gen_values(m)))
-        }
-    else:
-        config_constants = dict()
+    plugins = discovery["plugins"] if include_plugins else []
+    config_constants = discovery["config_constants"] if include_config_constants else dict()
 
     result = template.render(
         plugins=plugins,
@@ -95,6 +69,109 @@ def create_config(state: State, file: Path, include_plugins: bool, include_confi
     state.logger.info(f"Created config file: %s", file.absolute())
 
 
+def _discovery_key(config: dict) -> str:
+    distributions = sorted({f"{d.metadata['Name']}=={d.version}" for d in importlib.metadata.distributions()})
+    key = json.dumps([sys.version, distributions, config.get("pyroll", {})], sort_keys=True, default=str)
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def _discover_plugin_names():
+    import pkgutil
+
+    return [
+        "pyroll." + module.name
+        for module in pkgutil.iter_modules(pyroll.__path__)
+        if module.name not in ["core", "cli", "report", "export"]
+    ]
+
+
+def _discover_config_constants(logger: logging.Logger):
+    import pkgutil
+
+    def _gen_modules():
+        modules = [
+            "pyroll." + m.name
+            for m in pkgutil.iter_modules(pyroll.__path__)
+        ]
+        for m in modules:
+            try:
+                module = importlib.import_module(m)
+                sys.modules[m] = module
+                yield module
+            except ImportError:
+                continue
+
+    def _convert(value: object):
+        if isinstance(value, Path):
+            return str(value)
+        return value
+
+    def _gen_values(module):
+        config = getattr(module, "Config", None)
+        if config:
+            for n in config.to_dict():
+                v = getattr(config, n)
+                try:
+                    yield tomli_w.dumps({n: _convert(v)})
+                except TypeError:
+                    logger.error(f"Could not serialize '{module.__name__}.{n}'. Skipping.")
+                    continue
+
+    return {
+        m.__name__: values
+        for m in _gen_modules()
+        if (values := list(_gen_values(m)))
+    }
+
+
+def discover_plugins(
+        logger: logging.Logger, cache_file: Path, config: Optional[dict] = None,
+        include_config_constants: bool = True, refresh: bool = False
+) -> dict:
+    """
+    Discovers the installed plugins and the serialized config constants of all modules in the 'pyroll' namespace.
+    Importing all modules to find their config constants is expensive,
+    so the results are cached in CACHE_FILE, keyed by the names and versions of all installed distributions
+    and the ``pyroll`` table of the applied CONFIG, as it overrides the values of the constants.
+    Returns a dict with the keys 'plugins' and, if INCLUDE_CONFIG_CONSTANTS, 'config_constants'.
+    """
+    key = _discovery_key(config or {})
+    cache = {}
+
+    if not refresh:
+        try:
+            cache = json.loads(cache_file.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            pass
+
+    if cache.get("key") != key:
+        cache = dict(key=key)
+
+    changed = False
+
+    if "plugins" not in cache:
+        cache["plugins"] = _discover_plugin_names()
+        changed = True
+    else:
+        logger.debug("Using cached plugin list from: %s", cache_file)
+
+    if include_config_constants:
+        if "config_constants" not in cache:
+            cache["config_constants"] = _discover_config_constants(logger)
+            changed = True
+        else:
+            logger.debug("Using cached config constants from: %s", cache_file)
+
+    if changed:
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            cache_file.write_text(json.dumps(cache), encoding="utf-8")
+        except OSError as e:
+            logger.warning("Could not write plugin discovery cache: %s", e)
+
+    return cache
+
+
 @click.command()
 @click.option(
     "-f", "--file",
@@ -120,8 +197,13 @@ def create_input_py(state: State, file: Path):
     type=click.Path(file_okay=False, writable=True, path_type=Path),
     default=".", show_default=True
 )
+@click.option(
+    "--refresh",
+    help="Discover plugins and config constants anew instead of using the cached results of a previous run.",
+    is_flag=True, default=False
+)
 @click.pass_context
-def create_project(ctx: click.Context, dir: Path):
+def create_project(ctx: click.Context, dir: Path, refresh: bool):
     """
     Creates a new PyRoll simulation project in the directory specified by -d/--dir.
     The directory will be created if not already existing.
@@ -133,5 +215,5 @@ def create_project(ctx: click.Context, dir: Path):
 
     dir.mkdir(exist_ok=True)
 
-    ctx.invoke(create_config, include_plugins=True, file=dir / DEFAULT_CONFIG_FILE)
+    ctx.invoke(create_config, include_plugins=True, file=dir / DEFAULT_CONFIG_FILE, refresh=refresh)
     ctx.invoke(create_input_py, file=dir / DEFAULT_INPUT_PY_FILE)
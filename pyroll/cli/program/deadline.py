@@ -0,0 +1,136 @@
+from timeit import default_timer as timer
+from typing import Dict, Optional
+
+from pyroll.core import PassSequence
+from rich.table import Table
+
+
+class SolveTimeoutError(Exception):
+    """Raised by :py:class:`DeadlineGuard` if the solution exceeds a time budget."""
+
+    def __init__(self, message: str, report: dict):
+        super().__init__(message)
+
+        self.report = report
+        """Details about the offending unit and its last iteration state."""
+
+
+class DeadlineGuard:
+    """
+    Event listener for :py:class:`SolveMonitor` aborting the solution by raising :py:class:`SolveTimeoutError`
+    if the total elapsed time exceeds TIMEOUT or the solution of a top-level unit exceeds its time budget.
+    The budget of a unit is looked up by label in UNIT_TIMEOUTS, falling back to UNIT_TIMEOUT.
+    Time budgets of None or 0 are not enforced.
+    The budgets are checked at the start of each unit and each iteration,
+    so an abort may happen later than the budget if single iterations take long.
+    """
+
+    def __init__(
+            self, sequence: PassSequence,
+            timeout: Optional[float] = None,
+            unit_timeout: Optional[float] = None,
+            unit_timeouts: Dict[str, float] = None
+    ):
+        self.sequence = sequence
+        self.timeout = timeout
+        self.unit_timeout = unit_timeout
+        self.unit_timeouts = unit_timeouts or {}
+        self._unit_start: Dict[int, float] = {}
+        self._iterations: Dict[int, int] = {}
+
+    @classmethod
+    def from_config(cls, sequence: PassSequence, config: dict, timeout: Optional[float] = None) -> "DeadlineGuard":
+        """
+        Creates an instance from the ``solve`` table of CONFIG
+        with the keys ``timeout``, ``unit_timeout`` and the table ``unit_timeouts``.
+        TIMEOUT overrides the value from the config if not None.
+        """
+        solve_config = config.get("solve", {})
+        return cls(
+            sequence,
+            timeout=timeout if timeout is not None else solve_config.get("timeout", None),
+            unit_timeout=solve_config.get("unit_timeout", None),
+            unit_timeouts=solve_config.get("unit_timeouts", {}),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any budget is to be enforced."""
+        return bool(self.timeout or self.unit_timeout or any(self.unit_timeouts.values()))
+
+    def __call__(self, event: dict):
+        kind = event["event"]
+
+        if kind == "unit_start":
+            self._unit_start[event["index"]] = timer()
+            self._iterations[event["index"]] = 0
+        elif kind == "iteration":
+            self._iterations[event["index"]] = event["iteration"]
+        elif kind == "unit_finish":
+            self._unit_start.pop(event["index"], None)
+
+        if kind not in ["unit_start", "iteration", "sequence_iteration"]:
+            return
+
+        if self.timeout and event["elapsed"] > self.timeout:
+            index = next(iter(self._unit_start), None)
+            self._abort(index, "total", self.timeout, event["elapsed"])
+
+        if kind == "iteration":
+            index = event["index"]
+            budget = self.unit_timeouts.get(event["unit"], self.unit_timeout)
+            elapsed = timer() - self._unit_start[index]
+            if budget and elapsed > budget:
+                self._abort(index, "unit", budget, elapsed)
+
+    def _abort(self, index: Optional[int], kind: str, budget: float, elapsed: float):
+        report = dict(budget=kind, limit=budget, elapsed=elapsed)
+
+        if index is None:
+            message = f"Solution exceeded the total time budget of {budget} s."
+        else:
+            unit = self.sequence[index]
+            report.update(
+                index=index, unit=unit.label, iterations=self._iterations[index], **last_iteration_state(unit)
+            )
+            message = (
+                f"Solution exceeded the {'total' if kind == 'total' else 'unit'} time budget of {budget} s "
+                f"in unit '{unit.label}' (#{index}) after {report['iterations']} iterations."
+            )
+
+        raise SolveTimeoutError(message, report)
+
+
+def last_iteration_state(unit) -> dict:
+    """Collects the last residuum and key out profile values of a unit in solution."""
+    history = unit.convergence_history
+    result = dict(residuum=float(history[-1]["residuum"]) if history else None)
+
+    for name in ["width", "height", "temperature", "strain"]:
+        try:
+            result[f"out_{name}"] = float(getattr(unit.out_profile, name))
+        except (AttributeError, TypeError, ValueError):
+            result[f"out_{name}"] = None
+
+    return result
+
+
+def find_timeout(error: BaseException) -> Optional[SolveTimeoutError]:
+    """Returns the :py:class:`SolveTimeoutError` in the cause chain of ERROR, if any."""
+    while error is not None:
+        if isinstance(error, SolveTimeoutError):
+            return error
+        error = error.__cause__
+    return None
+
+
+def report_table(report: dict) -> Table:
+    """Creates a rich table of the report of a :py:class:`SolveTimeoutError`."""
+    table = Table(title="Solution Aborted", show_header=False)
+    table.add_column(style="bold")
+    table.add_column(justify="right")
+
+    for k, v in report.items():
+        table.add_row(k, f"{v:.6g}" if isinstance(v, float) else str(v))
+
+    return table
@@ -0,0 +1,179 @@
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from timeit import default_timer as timer
+from typing import List
+
+import click as click
+from rich.table import Table
+
+from .state import State
+from ..rich import console
+
+_STARTUP_SCRIPT = """
+import json, os, sys, time
+_start = time.perf_counter()
+args = json.loads(sys.argv[1])
+phases = []
+
+def rss():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return -1
+
+def phase(name, func):
+    print("{marker}" + name, file=sys.stderr, flush=True)
+    memory = rss()
+    start = time.perf_counter()
+    result = func()
+    duration = time.perf_counter() - start
+    phases.append(dict(name=name, duration=duration, memory=rss() - memory if memory >= 0 else None))
+    return result
+
+phase("cli", lambda: __import__("pyroll.cli.program"))
+
+import logging
+from pathlib import Path
+from pyroll.cli.program.main import load_config, configure_logging, load_plugins, apply_config_constants
+from pyroll.cli.rich import console, install_traceback_handler
+
+console.quiet = True
+phase("traceback_handler", install_traceback_handler)
+config = phase("config", lambda: load_config(Path(args["config_file"]), args["global_config"]))
+phase("logging", lambda: configure_logging(config))
+for p in args["plugins"]:
+    phase("plugin:" + p, lambda p=p: load_plugins([p], logging.getLogger("pyroll.cli")))
+phase("config_constants", lambda: apply_config_constants(config))
+
+print(json.dumps(dict(phases=phases, elapsed=time.perf_counter() - _start)))
+"""
+
+_PHASE_MARKER = "pyroll-doctor-phase: "
+
+_IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)$")
+
+
+@click.command()
+@click.option(
+    "-n", "--top",
+    help="Count of modules with the longest import time to show.",
+    type=click.IntRange(min=0), default=15, show_default=True
+)
+@click.option(
+    "-o", "--output",
+    help="JSON file to write the full report to.",
+    type=click.Path(dir_okay=False, path_type=Path), default=None
+)
+@click.pass_context
+def doctor(ctx: click.Context, top: int, output: Path):
+    """
+    Diagnoses the CLI installation and configuration by reporting where the time and memory of the CLI startup go:
+    importing the CLI, installing the traceback handler, parsing the config, setting up logging,
+    importing each plugin and applying config constants.
+    Imports are broken down per module including transitive dependencies.
+    """
+    state: State = ctx.obj
+    root_params = ctx.find_root().params
+    report = {}
+
+    with console.status("[bold green]Measuring startup..."):
+        report["startup"] = startup_report(root_params["config_file"], root_params["global_config"], state.plugins)
+
+    console.print(phases_table(report["startup"]))
+    console.print(imports_table(report["startup"], top))
+
+    if output:
+        output.write_text(json.dumps(report, indent=2))
+        state.logger.info("Wrote diagnosis report to: %s", output.absolute())
+
+
+def startup_report(config_file: Path, global_config: bool, plugins: List[str]) -> dict:
+    """
+    Runs the startup steps of the CLI in a fresh interpreter with import time tracing (``python -X importtime``)
+    and returns the duration and change of resident memory per phase and the import times per module.
+    The time spent before the first phase, mainly for starting the interpreter, is reported as phase 'interpreter'.
+    """
+    args = json.dumps(dict(config_file=str(config_file), global_config=global_config, plugins=plugins))
+    script = _STARTUP_SCRIPT.replace("{marker}", _PHASE_MARKER)
+
+    start = timer()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script, args],
+        env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path)),
+        capture_output=True, text=True,
+    )
+    wall = timer() - start
+
+    if result.returncode != 0:
+        raise click.ClickException(f"Startup measurement failed:\n{result.stderr[-2000:]}")
+
+    measured = json.loads(result.stdout.splitlines()[-1])
+    imports = parse_import_times(result.stderr)
+
+    phases = [dict(name="interpreter", duration=wall - measured["elapsed"], memory=None)] + measured["phases"]
+    for p in phases:
+        p["imports"] = sum(1 for i in imports if i["phase"] == p["name"])
+
+    return dict(wall=wall, phases=phases, imports=imports)
+
+
+def parse_import_times(text: str) -> List[dict]:
+    """
+    Parses the output of ``python -X importtime`` interleaved with phase markers into records
+    of module name, phase, nesting depth, own and cumulative import time in seconds.
+    """
+    phase = "interpreter"
+    imports = []
+
+    for line in text.splitlines():
+        if line.startswith(_PHASE_MARKER):
+            phase = line[len(_PHASE_MARKER):]
+            continue
+
+        match = _IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            imports.append(dict(
+                module=module, phase=phase, depth=(len(indent) - 1) // 2,
+                self=int(self_us) / 1e6, cumulative=int(cumulative_us) / 1e6,
+            ))
+
+    return imports
+
+
+def phases_table(report: dict) -> Table:
+    """Creates a rich table of the phases of a :py:func:`startup_report`."""
+    table = Table(title=f"Startup Phases ({report['wall'] * 1e3:.1f} ms total)")
+    table.add_column("Phase")
+    for c in ["Time [ms]", "Share", "Memory [MiB]", "Imported Modules"]:
+        table.add_column(c, justify="right")
+
+    for p in report["phases"]:
+        table.add_row(
+            p["name"],
+            f"{p['duration'] * 1e3:.1f}",
+            f"{p['duration'] / report['wall']:.1%}",
+            f"{p['memory'] / 1024 ** 2:.2f}" if p["memory"] is not None else "-",
+            str(p["imports"]),
+        )
+
+    return table
+
+
+def imports_table(report: dict, top: int) -> Table:
+    """Creates a rich table of the TOP modules of a :py:func:`startup_report` with the longest own import time."""
+    table = Table(title="Slowest Imports")
+    table.add_column("Module")
+    table.add_column("Phase")
+    for c in ["Self [ms]", "Cumulative [ms]"]:
+        table.add_column(c, justify="right")
+
+    for i in sorted(report["imports"], key=lambda i: i["self"], reverse=True)[:top]:
+        table.add_row(i["module"], i["phase"], f"{i['self'] * 1e3:.1f}", f"{i['cumulative'] * 1e3:.1f}")
+
+    return table
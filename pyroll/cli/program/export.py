@@ -0,0 +1,132 @@
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+import click as click
+import numpy as np
+
+from .state import State
+
+DEFAULT_EXPORT_DIR = Path("results")
+SCHEMA_FILE_NAME = "schema.json"
+
+COLUMNS: Dict[str, str] = {
+    "in_width": "in_profile.width",
+    "in_height": "in_profile.height",
+    "in_cross_section_area": "in_profile.cross_section.area",
+    "in_temperature": "in_profile.temperature",
+    "in_strain": "in_profile.strain",
+    "in_flow_stress": "in_profile.flow_stress",
+    "out_width": "out_profile.width",
+    "out_height": "out_profile.height",
+    "out_cross_section_area": "out_profile.cross_section.area",
+    "out_temperature": "out_profile.temperature",
+    "out_strain": "out_profile.strain",
+    "out_flow_stress": "out_profile.flow_stress",
+    "length": "length",
+    "duration": "duration",
+    "velocity": "velocity",
+    "power": "power",
+    "roll_force": "roll_force",
+    "roll_torque": "roll.roll_torque",
+    "roll_power": "roll.roll_power",
+    "contact_length": "roll.contact_length",
+}
+"""Numeric columns to export with the attribute paths of their values relative to each unit."""
+
+
+def _value(obj, path: str) -> float:
+    try:
+        for name in path.split("."):
+            obj = getattr(obj, name)
+        return float(obj)
+    except (AttributeError, TypeError, ValueError):
+        return np.nan
+
+
+def flatten_sequence(sequence) -> Dict[str, np.ndarray]:
+    """
+    Flattens the units of the solved SEQUENCE into typed columns.
+    The ``index``, ``label`` and ``type`` columns identify the units,
+    the numeric columns defined in :py:data:`COLUMNS` are float64 with NaN where a value is not available for a unit.
+    """
+    units = list(sequence)
+
+    columns = dict(
+        index=np.arange(len(units), dtype=np.int64),
+        label=np.array([u.label for u in units], dtype=str),
+        type=np.array([type(u).__name__ for u in units], dtype=str),
+    )
+
+    for name, path in COLUMNS.items():
+        columns[name] = np.array([_value(u, path) for u in units], dtype=np.float64)
+
+    return columns
+
+
+def write_columns(columns: Dict[str, np.ndarray], path: Path):
+    """
+    Writes COLUMNS to PATH.
+    If PATH has the suffix ``.npz``, a single uncompressed NumPy archive is written.
+    Otherwise, PATH is a directory getting one ``.npy`` file per column and a JSON schema listing columns,
+    dtypes and the row count, which can be memory-mapped by :py:func:`read_columns`.
+    """
+    if path.suffix == ".npz":
+        np.savez(path, **columns)
+        return
+
+    path.mkdir(parents=True, exist_ok=True)
+
+    for name, array in columns.items():
+        np.save(path / f"{name}.npy", array)
+
+    schema = dict(
+        rows=len(columns["index"]),
+        columns={name: array.dtype.str for name, array in columns.items()},
+    )
+    (path / SCHEMA_FILE_NAME).write_text(json.dumps(schema, indent=2), encoding="utf-8")
+
+
+def read_columns(path: Path, columns: List[str] = None, mmap: bool = True) -> Dict[str, np.ndarray]:
+    """
+    Reads the columns written by :py:func:`write_columns` from PATH, optionally only those named in COLUMNS.
+    The arrays of directory exports are memory-mapped read-only if MMAP is true, those of ``.npz`` files are loaded.
+    """
+    if path.suffix == ".npz":
+        with np.load(path) as archive:
+            return {n: archive[n] for n in (columns or archive.files)}
+
+    schema = json.loads((path / SCHEMA_FILE_NAME).read_text(encoding="utf-8"))
+    return {
+        n: np.load(path / f"{n}.npy", mmap_mode="r" if mmap else None)
+        for n in (columns or schema["columns"])
+    }
+
+
+@click.command()
+@click.option(
+    "-o", "--output",
+    help="Directory to write one memory-mappable NumPy array file per column to "
+         "or file with the suffix '.npz' to write a single NumPy archive to.",
+    type=click.Path(path_type=Path),
+    default=DEFAULT_EXPORT_DIR, show_default=True
+)
+@click.pass_obj
+def export(state: State, output: Path):
+    """
+    Exports the results of the solved units of the loaded pass sequence as typed columns in binary NumPy format.
+    Each unit forms one row, the columns hold the in and out profile dimensions, temperatures, strains and
+    flow stresses, durations, forces, torques and powers. Values not available for a unit are NaN.
+    """
+    if state.sequence is None:
+        state.logger.critical("No pass sequence loaded. Use a command like 'input-py' to load a pass sequence.")
+        sys.exit(1)
+    if state.sequence.out_profile is None:
+        state.logger.critical("Pass sequence is not solved. Use the 'solve' command first.")
+        sys.exit(1)
+
+    columns = flatten_sequence(state.sequence)
+    write_columns(columns, output)
+
+    state.logger.info("Exported %d units in %d columns to: %s", len(columns["index"]), len(columns), output.absolute())
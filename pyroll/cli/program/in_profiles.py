@@ -0,0 +1,104 @@
+import copy
+import json
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import List, Tuple, Iterable
+
+import tomli
+from pyroll.core import Profile
+from rich.table import Table
+
+from .input import _build_profile, _table, InputDocumentError
+from .state import State
+from .worker import init_worker, solve_and_summarize
+from .. import pickling
+
+SUMMARY_COLUMNS = ["out_width", "out_height", "out_temperature", "out_strain", "max_roll_force", "duration"]
+
+_sequence = None
+
+
+def load_in_profiles(file: Path) -> List[Tuple[str, Profile]]:
+    """
+    Reads the list of in profile definitions from the TOML or JSON file FILE.
+    The file defines the profiles in the array ``in_profiles`` (a JSON file may also be just the array),
+    each entry is a table like the ``in_profile`` table of declarative input documents (see 'input-json'),
+    extended by the entries of the optional ``defaults`` table. An optional ``name`` entry names the profile.
+    Returns a list of names and profiles.
+
+    :raises InputDocumentError: if the file content is invalid
+    """
+    text = file.read_text(encoding="utf-8")
+    document = json.loads(text) if file.suffix == ".json" else tomli.loads(text)
+
+    if isinstance(document, list):
+        document = dict(in_profiles=document)
+
+    defaults = _table("defaults", document.get("defaults", {}))
+    entries = document.get("in_profiles")
+
+    if not isinstance(entries, list) or not entries:
+        raise InputDocumentError("in_profiles: must be a non-empty list of profile tables")
+
+    def _gen_profiles():
+        for i, entry in enumerate(entries):
+            path = f"in_profiles[{i}]"
+            d = dict(defaults, **_table(path, entry))
+            name = str(d.pop("name", i))
+            yield name, _build_profile(path, d, {})
+
+    return list(_gen_profiles())
+
+
+def solve_in_profiles(state: State, in_profiles: List[Profile], workers: int) -> Iterable[Tuple[int, dict]]:
+    """
+    Solves copies of the loaded pass sequence for each of IN_PROFILES in a pool of worker processes.
+    The sequence is transferred once per worker, so geometry computed on creation of grooves is not redone.
+    Yields the index of the in profile and the result record in order of completion.
+    """
+    if workers == 1:
+        for i, p in enumerate(in_profiles):
+            yield i, solve_and_summarize(p, copy.deepcopy(state.sequence))
+        return
+
+    data = pickling.dumps(state.sequence)
+
+    with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_in_profiles_worker,
+            initargs=(state.config, state.plugins, data)
+    ) as executor:
+        futures = {executor.submit(_solve_in_profile, pickling.dumps(p)): i for i, p in enumerate(in_profiles)}
+        for f in as_completed(futures):
+            yield futures[f], f.result()
+
+
+def _init_in_profiles_worker(config: dict, plugins: List[str], data: bytes):
+    global _sequence
+    init_worker(config, plugins)
+    _sequence = pickling.loads(data)
+
+
+def _solve_in_profile(data: bytes) -> dict:
+    return solve_and_summarize(pickling.loads(data), copy.deepcopy(_sequence))
+
+
+def results_table(results: List[dict]) -> Table:
+    """Creates a rich table of the result records of :py:func:`solve_in_profiles` extended by names and dimensions."""
+    table = Table(title="In Profile Results")
+    table.add_column("#", justify="right")
+    table.add_column("name")
+    for c in ["in_width", "in_height", "status", *SUMMARY_COLUMNS]:
+        table.add_column(c, justify="right")
+
+    for r in results:
+        table.add_row(
+            str(r["index"]),
+            r["name"],
+            f"{r['in_width']:.6g}",
+            f"{r['in_height']:.6g}",
+            r["status"],
+            *[f"{r[c]:.6g}" if c in r else "-" for c in SUMMARY_COLUMNS],
+        )
+
+    return table
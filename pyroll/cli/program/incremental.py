@@ -0,0 +1,129 @@
+import contextlib
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import click as click
+from pyroll.core import Profile as BaseProfile, PassSequence
+
+from .state import State
+from ..config import DEFAULT_INPUT_PY_FILE
+
+
+def reusable_prefix_length(state: State, solution: Optional[Tuple[List[Optional[str]], PassSequence]] = None) -> int:
+    """
+    Returns the count of leading units of the loaded sequence whose definition equals those of SOLUTION,
+    which defaults to the previous solution.
+    Returns 0 if there is no such solution or the in profile differs.
+    Units with post-processors end the prefix, as their solution results cannot be restored exactly.
+    """
+    solution = solution or state.previous_solution
+
+    if not solution or not state.input_fingerprints:
+        return 0
+
+    previous_fingerprints, previous_sequence = solution
+
+    if state.input_fingerprints[0] is None or state.input_fingerprints[0] != previous_fingerprints[0]:
+        return 0
+
+    count = 0
+    for fp, previous_fp, unit in zip(state.input_fingerprints[1:], previous_fingerprints[1:], previous_sequence):
+        if fp is None or fp != previous_fp or any(True for _ in unit._yield_post_processors()):
+            break
+        count += 1
+
+    return count
+
+
+def frozen_solve(unit):
+    """Returns a replacement of the ``solve`` method of the solved UNIT returning its previous out profile."""
+    out_profile = BaseProfile(**{k: v for k, v in unit.out_profile.__dict__.items() if not k.startswith("_")})
+
+    def solve(in_profile):
+        return out_profile
+
+    return solve
+
+
+@contextlib.contextmanager
+def reuse_previous_solution(state: State):
+    """
+    Context manager replacing the unchanged leading units of the loaded sequence by the solved units
+    of the previous solution and freezing their solution to return their previous results while active.
+    Of the previous solution and those in the solution history, the one with the longest reusable prefix is used,
+    the most recent one if equal.
+    Yields the count of reused units.
+    The used solution is consumed by this.
+    """
+    count, solution = 0, state.previous_solution
+    for s in [state.previous_solution, *reversed(state.solution_history)]:
+        length = reusable_prefix_length(state, s) if s else 0
+        if length > count:
+            count, solution = length, s
+
+    if solution is state.previous_solution:
+        state.previous_solution = None
+    else:
+        state.solution_history = [s for s in state.solution_history if s is not solution]
+
+    _, previous_sequence = solution or (None, None)
+
+    reused = list(previous_sequence[:count]) if previous_sequence is not None else []
+
+    for i, unit in enumerate(reused):
+        state.sequence.subunits[i] = unit
+        unit.parent = state.sequence
+        unit.solve = frozen_solve(unit)
+
+    try:
+        yield count
+    finally:
+        for unit in reused:
+            del unit.solve
+
+
+@click.command()
+@click.option(
+    "-f", "--file",
+    help="Input script to watch.",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=DEFAULT_INPUT_PY_FILE, show_default=True
+)
+@click.option(
+    "-i", "--interval",
+    help="Polling interval in seconds.",
+    type=click.FloatRange(min=0, min_open=True), default=1.0, show_default=True
+)
+@click.pass_context
+def watch(ctx: click.Context, file: Path, interval: float):
+    """
+    Watches the input script FILE and reloads it and solves incrementally whenever it changes.
+    Runs until interrupted by Ctrl+C.
+    """
+    from .input import input_py
+    from .solve import solve
+
+    state: State = ctx.obj
+    last_change = None
+
+    state.logger.info("Watching for changes of: %s", file.absolute())
+
+    try:
+        while True:
+            try:
+                change = file.stat().st_mtime_ns
+            except OSError:  # f.e. replaced by an editor doing an atomic save, retry on next tick
+                time.sleep(interval)
+                continue
+
+            if change != last_change:
+                last_change = change
+                try:
+                    ctx.invoke(input_py, file=file)
+                    ctx.invoke(solve, incremental=True)
+                except Exception as e:
+                    state.logger.error("Processing of changed input failed: %s", e)
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        state.logger.info("Stopped watching.")
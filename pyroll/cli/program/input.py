@@ -1,12 +1,24 @@
+import hashlib
 import importlib.util
+import inspect
+import json
 import sys
 from pathlib import Path
+from typing import Tuple, Dict, Any
 import click as click
-from rich.pretty import pretty_repr
+import pyroll.core as pr
 from pyroll.core import Profile, PassSequence
+from pyroll.core.hooks import Hook, HookFunction
 
 from .state import State
-from ..config import DEFAULT_INPUT_PY_FILE
+from ..config import DEFAULT_INPUT_PY_FILE, DEFAULT_INPUT_TOML_FILE, DEFAULT_INPUT_JSON_FILE
+from ..rich import LazyPrettyRepr
+
+PROFILE_SHAPES = ["round", "square", "box", "diamond", "hexagon", "from_groove"]
+
+
+class InputDocumentError(ValueError):
+    """Raised if a declarative input document is invalid. The message is prefixed with the path of the faulty entry."""
 
 
 @click.command()
@@ -25,22 +37,222 @@ def input_py(state: State, file: Path):
     in_profile:\t\tProfile object defining the entry shape in the first pass
     sequence:\titerable of Unit objects (RollPass or Transport) defining the pass sequence
     """
+    _load_input(state, file, load_input_py)
+
+
+@click.command()
+@click.option(
+    "-f", "--file",
+    help="File to load from.",
+    type=click.Path(exists=True, dir_okay=False, writable=False, path_type=Path),
+    default=DEFAULT_INPUT_TOML_FILE, show_default=True
+)
+@click.pass_obj
+def input_toml(state: State, file: Path):
+    """
+    Reads input data from the declarative TOML document FILE.
+    See the 'input-json' command for the structure of the document.
+    """
+    _load_input(state, file, load_input_toml)
+
 
+@click.command()
+@click.option(
+    "-f", "--file",
+    help="File to load from.",
+    type=click.Path(exists=True, dir_okay=False, writable=False, path_type=Path),
+    default=DEFAULT_INPUT_JSON_FILE, show_default=True
+)
+@click.pass_obj
+def input_json(state: State, file: Path):
+    """
+    Reads input data from the declarative JSON document FILE.
+    The document must have the following entries:
+
+    in_profile:\ttable of the in profile, 'shape' selects the Profile factory (f.e. 'round'),
+    \t\tthe other entries are passed as arguments
+
+    sequence:\tlist of tables of the units, 'type' selects the unit class (f.e. 'RollPass' or 'Transport'),
+    \t\tthe other entries are passed as arguments
+
+    grooves:\toptional table of named groove tables, 'type' selects the groove class (f.e. 'RoundGroove')
+
+    rolls:\t\toptional table of named roll tables
+
+    The 'roll' of a roll pass and the 'groove' of a roll or of the in profile may be
+    the name of a shared definition or an inline table. Inline roll tables may name a shared roll in 'use',
+    whose entries they override. Shared grooves are instantiated only once.
+    """
+    _load_input(state, file, load_input_json)
+
+
+def _load_input(state: State, file: Path, loader):
     state.logger.info(f"Reading input from: %s", file.absolute())
 
     try:
-        spec = importlib.util.spec_from_file_location("__pyroll_input__", file)
-        module = importlib.util.module_from_spec(spec)
-        sys.modules["__pyroll_input__"] = module
-        spec.loader.exec_module(module)
-        sequence = getattr(module, "sequence")
-        state.sequence = sequence if isinstance(sequence, PassSequence) else PassSequence(sequence)
-        state.in_profile = getattr(module, "in_profile")
+        in_profile, sequence = loader(file)
+        input_hash = hashlib.sha256(file.read_bytes()).hexdigest()
+        defines_hooks = loader is load_input_py and defines_hook_functions(sys.modules["__pyroll_input__"])
+        state.load(in_profile, sequence, input_hash=input_hash, hooks_hash=input_hash if defines_hooks else None)
     except Exception as e:
         state.logger.exception("Error during reading of input file.", exc_info=e)
         raise
 
     state.logger.info(f"Finished reading input.")
 
-    state.logger.info("Loaded in profile: %s", pretty_repr(state.in_profile, expand_all=True))
-    state.logger.info("Loaded pass sequence: %s", pretty_repr(state.sequence))
+    state.logger.info("Loaded in profile: %s", LazyPrettyRepr(state.in_profile, expand_all=True))
+    state.logger.info("Loaded pass sequence: %s", LazyPrettyRepr(state.sequence))
+
+
+def load_input_py(file: Path) -> Tuple[Profile, PassSequence]:
+    """Executes the Python script FILE and returns the in profile and pass sequence defined therein."""
+    spec = importlib.util.spec_from_file_location("__pyroll_input__", file)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["__pyroll_input__"] = module
+    spec.loader.exec_module(module)
+    sequence = getattr(module, "sequence")
+    sequence = sequence if isinstance(sequence, PassSequence) else PassSequence(sequence)
+    return getattr(module, "in_profile"), sequence
+
+
+def defines_hook_functions(module) -> bool:
+    """Returns whether the input script MODULE defines hook functions in its global namespace."""
+    return any(isinstance(v, HookFunction) for v in vars(module).values())
+
+
+def load_input_toml(file: Path) -> Tuple[Profile, PassSequence]:
+    """Reads the declarative TOML document FILE and returns the in profile and pass sequence defined therein."""
+    import tomli
+    return load_input_document(tomli.loads(file.read_text(encoding="utf-8")))
+
+
+def load_input_json(file: Path) -> Tuple[Profile, PassSequence]:
+    """Reads the declarative JSON document FILE and returns the in profile and pass sequence defined therein."""
+    return load_input_document(json.loads(file.read_text(encoding="utf-8")))
+
+
+def load_input_document(document: Dict[str, Any]) -> Tuple[Profile, PassSequence]:
+    """
+    Builds the in profile and pass sequence from a declarative DOCUMENT as described by the 'input-json' command.
+    The whole document is validated while building, before anything is solved.
+
+    :raises InputDocumentError: if the document is invalid
+    """
+    grooves = {
+        name: _build_groove(f"grooves.{name}", _table(f"grooves.{name}", d))
+        for name, d in _table("grooves", document.get("grooves", {})).items()
+    }
+    rolls = {
+        name: _table(f"rolls.{name}", d)
+        for name, d in _table("rolls", document.get("rolls", {})).items()
+    }
+
+    if "in_profile" not in document:
+        raise InputDocumentError("in_profile: missing")
+    in_profile = _build_profile("in_profile", _table("in_profile", document["in_profile"]), grooves)
+
+    if "sequence" not in document:
+        raise InputDocumentError("sequence: missing")
+    if not isinstance(document["sequence"], list):
+        raise InputDocumentError("sequence: must be a list of unit tables")
+
+    units = [
+        _build_unit(f"sequence[{i}]", _table(f"sequence[{i}]", d), grooves, rolls)
+        for i, d in enumerate(document["sequence"])
+    ]
+
+    return in_profile, PassSequence(units)
+
+
+def _table(path: str, value) -> dict:
+    if not isinstance(value, dict):
+        raise InputDocumentError(f"{path}: must be a table")
+    return value
+
+
+def _class(path: str, name, base: type) -> type:
+    cls = getattr(pr, name, None) if isinstance(name, str) else None
+    if not isinstance(cls, type) or not issubclass(cls, base):
+        raise InputDocumentError(f"{path}.type: unknown {base.__name__} type '{name}'")
+    return cls
+
+
+def _check_keys(path: str, cls: type, factory, kwargs: dict):
+    # units, rolls and profiles accept arbitrary keyword arguments, so misspelled keys would be silently ignored
+    parameters = {
+        n for n, p in inspect.signature(factory).parameters.items()
+        if p.kind not in (inspect.Parameter.VAR_KEYWORD, inspect.Parameter.VAR_POSITIONAL)
+    }
+    hooks = {n for c in cls.__mro__ for n, v in vars(c).items() if isinstance(v, Hook)}
+
+    for key in kwargs:
+        if key not in parameters and key not in hooks:
+            raise InputDocumentError(f"{path}.{key}: unknown key, neither a parameter nor a hook of {cls.__name__}")
+
+
+def _construct(path: str, factory, kwargs: dict, cls: type = None):
+    if cls is not None:
+        _check_keys(path, cls, factory, kwargs)
+
+    try:
+        return factory(**kwargs)
+    except (TypeError, ValueError) as e:
+        raise InputDocumentError(f"{path}: {e}") from e
+
+
+def _build_groove(path: str, d: dict) -> pr.GrooveBase:
+    kwargs = dict(d)
+    cls = _class(path, kwargs.pop("type", None), pr.GrooveBase)
+    return _construct(path, cls, kwargs)
+
+
+def _resolve_groove(path: str, value, grooves: Dict[str, pr.GrooveBase]) -> pr.GrooveBase:
+    if isinstance(value, str):
+        if value not in grooves:
+            raise InputDocumentError(f"{path}: unknown groove '{value}'")
+        return grooves[value]
+    return _build_groove(path, _table(path, value))
+
+
+def _build_profile(path: str, d: dict, grooves: Dict[str, pr.GrooveBase]) -> Profile:
+    kwargs = dict(d)
+    shape = kwargs.pop("shape", None)
+
+    if shape not in PROFILE_SHAPES:
+        raise InputDocumentError(f"{path}.shape: unknown profile shape '{shape}', expected one of {PROFILE_SHAPES}")
+
+    if "groove" in kwargs:
+        kwargs["groove"] = _resolve_groove(f"{path}.groove", kwargs["groove"], grooves)
+
+    return _construct(path, getattr(Profile, shape), kwargs, Profile)
+
+
+def _build_roll(path: str, value, grooves: Dict[str, pr.GrooveBase], rolls: Dict[str, dict]) -> pr.Roll:
+    if isinstance(value, str):
+        value = dict(use=value)
+    kwargs = dict(_table(path, value))
+
+    if "use" in kwargs:
+        name = kwargs.pop("use")
+        if name not in rolls:
+            raise InputDocumentError(f"{path}: unknown roll '{name}'")
+        kwargs = dict(rolls[name], **kwargs)
+
+    if "groove" not in kwargs:
+        raise InputDocumentError(f"{path}.groove: missing")
+    kwargs["groove"] = _resolve_groove(f"{path}.groove", kwargs["groove"], grooves)
+
+    # rolls hold solution results of their roll pass, so they are created per roll pass
+    return _construct(path, pr.Roll, kwargs, pr.Roll)
+
+
+def _build_unit(path: str, d: dict, grooves: Dict[str, pr.GrooveBase], rolls: Dict[str, dict]) -> pr.Unit:
+    kwargs = dict(d)
+    cls = _class(path, kwargs.pop("type", None), pr.Unit)
+
+    if issubclass(cls, pr.BaseRollPass):
+        if "roll" not in kwargs:
+            raise InputDocumentError(f"{path}.roll: missing")
+        kwargs["roll"] = _build_roll(f"{path}.roll", kwargs["roll"], grooves, rolls)
+
+    return _construct(path, cls, kwargs, cls)
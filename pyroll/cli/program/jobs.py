@@ -0,0 +1,230 @@
+import multiprocessing
+import multiprocessing.connection
+import time
+from dataclasses import dataclass, field
+from timeit import default_timer as timer
+from typing import List, Optional
+
+import click as click
+from rich.table import Table
+
+from .state import State
+from .. import pickling
+from ..rich import console
+
+
+@dataclass
+class BackgroundJob:
+    """A solution of the pass sequence of a session running in a worker process."""
+
+    id: int
+    session: str
+    sequence: object
+    """The submitted (unsolved) pass sequence, to check whether the session input is still the same on finish."""
+    process: multiprocessing.Process
+    connection: multiprocessing.connection.Connection
+    started: float = field(default_factory=timer)
+    status: str = "running"
+    duration: Optional[float] = None
+    error: Optional[str] = None
+    note: str = ""
+
+    @property
+    def running(self) -> bool:
+        return self.status == "running"
+
+    @property
+    def elapsed(self) -> float:
+        return self.duration if self.duration is not None else timer() - self.started
+
+
+def start_job(state: State) -> BackgroundJob:
+    """Starts solving the loaded pass sequence of the active session in a new worker process."""
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(
+        target=_run_job,
+        args=(sender, state.config, state.plugins, pickling.dumps((state.in_profile, state.sequence))),
+        daemon=True,
+    )
+    process.start()
+    sender.close()
+
+    job = BackgroundJob(
+        id=len(state.jobs) + 1, session=state.session, sequence=state.sequence,
+        process=process, connection=receiver
+    )
+    state.jobs.append(job)
+    return job
+
+
+def _run_job(connection, config: dict, plugins: List[str], data: bytes):
+    from .worker import init_worker
+
+    init_worker(config, plugins)
+    console.quiet = True  # do not interfere with the prompt of the shell
+
+    in_profile, sequence = pickling.loads(data)
+    start = timer()
+
+    try:
+        sequence.solve(in_profile)
+        result = dict(status="ok", duration=timer() - start, data=pickling.dumps((in_profile, sequence)))
+    except Exception as e:
+        result = dict(status="failed", duration=timer() - start, error=str(e))
+
+    connection.send_bytes(pickling.dumps(result))
+    connection.close()
+
+
+def collect_jobs(state: State) -> List[BackgroundJob]:
+    """
+    Collects the results of finished jobs and returns those jobs.
+    Solutions are applied to the session the job was started from,
+    unless the session's input was changed, solved or the session was deleted meanwhile.
+    """
+    finished = []
+
+    for job in state.jobs:
+        if not job.running:
+            continue
+
+        if job.connection.poll():
+            try:
+                result = pickling.loads(job.connection.recv_bytes())
+            except EOFError:  # worker process died without sending a result
+                result = None
+            job.process.join()
+        elif not job.process.is_alive():
+            result = None
+        else:
+            continue
+
+        if result is None:
+            job.status = "failed"
+            job.duration = timer() - job.started
+            job.error = f"Worker process exited with code {job.process.exitcode}."
+        else:
+            job.status = result["status"]
+            job.duration = result["duration"]
+            job.error = result.get("error")
+
+        job.connection.close()
+        finished.append(job)
+
+        if job.status != "ok":
+            job.sequence = None
+            state.logger.error("Background job %d of session '%s' failed: %s", job.id, job.session, job.error)
+            continue
+
+        target = state.session_state(job.session)
+        if target is None or target.sequence is not job.sequence or target.sequence.in_profile is not None:
+            job.note = "discarded, session input changed"
+            state.logger.warning(
+                "Background job %d of session '%s' finished, but the input of the session was changed or solved "
+                "meanwhile, so the solution was discarded.", job.id, job.session
+            )
+            continue
+
+        target.in_profile, target.sequence = pickling.loads(result["data"])
+        job.sequence = None
+        job.note = "applied"
+        state.logger.info(
+            "Background job %d of session '%s' finished in %.3f s, applied the solution.",
+            job.id, job.session, job.duration
+        )
+
+        if target is state:
+            from .retention import apply_retention
+            apply_retention(state)
+
+    return finished
+
+
+def _select(state: State, ids: List[int]) -> List[BackgroundJob]:
+    if not ids:
+        return [j for j in state.jobs if j.running]
+
+    by_id = {j.id: j for j in state.jobs}
+    unknown = [i for i in ids if i not in by_id]
+    if unknown:
+        raise click.BadParameter(f"Unknown job IDs: {unknown}.", param_hint="'IDS'")
+
+    return [by_id[i] for i in ids]
+
+
+@click.command()
+@click.pass_obj
+def jobs(state: State):
+    """Lists the background jobs started by 'solve --background' and collects the results of finished ones."""
+    collect_jobs(state)
+
+    table = Table(title="Background Jobs")
+    table.add_column("ID", justify="right")
+    table.add_column("Session")
+    table.add_column("Status")
+    table.add_column("Time [s]", justify="right")
+    table.add_column("Note")
+
+    for j in state.jobs:
+        table.add_row(str(j.id), j.session, j.status, f"{j.elapsed:.3f}", j.error or j.note)
+
+    console.print(table)
+
+
+@click.command()
+@click.argument("ids", type=int, nargs=-1)
+@click.option(
+    "-t", "--timeout",
+    help="Maximum time to wait in seconds.",
+    type=click.FloatRange(min=0), default=None
+)
+@click.pass_obj
+def wait(state: State, ids: List[int], timeout: Optional[float]):
+    """Waits for the background jobs with IDS (all running ones if not given) to finish and collects their results."""
+    selected = _select(state, ids)
+    deadline = time.monotonic() + timeout if timeout is not None else None
+
+    with console.status("[bold green]Waiting for background jobs..."):
+        while True:
+            collect_jobs(state)
+            running = [j for j in selected if j.running]
+            if not running:
+                break
+
+            remaining = deadline - time.monotonic() if deadline is not None else None
+            if remaining is not None and remaining <= 0:
+                state.logger.warning("Timed out waiting for %d background jobs.", len(running))
+                break
+
+            multiprocessing.connection.wait(
+                [j.connection for j in running] + [j.process.sentinel for j in running], remaining
+            )
+
+
+@click.command()
+@click.argument("ids", type=int, nargs=-1)
+@click.option(
+    "-a", "--all", "all_",
+    help="Cancel all running jobs.",
+    is_flag=True
+)
+@click.pass_obj
+def cancel(state: State, ids: List[int], all_: bool):
+    """Cancels the running background jobs with IDS by terminating their worker processes."""
+    if not ids and not all_:
+        raise click.UsageError("Give the IDs of the jobs to cancel or --all.")
+
+    collect_jobs(state)
+
+    for job in _select(state, [] if all_ else ids):
+        if not job.running:
+            state.logger.warning("Background job %d is not running anymore.", job.id)
+            continue
+
+        job.process.terminate()
+        job.process.join()
+        job.connection.close()
+        job.status = "cancelled"
+        job.duration = timer() - job.started
+        job.sequence = None
+        state.logger.info("Cancelled background job %d of session '%s'.", job.id, job.session)
@@ -1,22 +1,100 @@
+import atexit
+import copy
 import importlib
+import importlib.metadata
 import logging
 import logging.config
+import logging.handlers
 import os
+import queue
 import sys
+from importlib.metadata import entry_points, EntryPoint
 from pathlib import Path
-from typing import List
+from typing import List, Dict, Tuple, Optional
 import click as click
-import pyroll.core
 import tomli
-from rich.logging import RichHandler
-from rich.pretty import pretty_repr
 
 from .state import State
-from ..config import DEFAULT_CONFIG_FILE, GLOBAL_CONFIG_FILE, APP_DIR, JINJA_ENV
-from ..rich import console, SUPPRESS_TRACEBACKS
+from ..config import DEFAULT_CONFIG_FILE, GLOBAL_CONFIG_FILE, APP_DIR
+from ..rich import console, SUPPRESS_TRACEBACKS, install_traceback_handler, LazyPrettyRepr, console_to_stderr
 
 
-@click.group(chain=True)
+class LazyGroup(click.Group):
+    """
+    Command group resolving its subcommands only when they are invoked.
+    Built-in subcommands are registered by import path using :py:meth:`add_lazy_command`,
+    extension subcommands are discovered from the ``pyroll.cli.commands`` entry point group.
+    So the modules defining them (and their dependencies) are only imported if actually needed.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands: Dict[str, Tuple[str, str]] = {}
+        self._extension_commands: Optional[Dict[str, EntryPoint]] = None
+        self._resolved = set()
+
+    def add_lazy_command(self, name: str, import_path: str, short_help: str):
+        """
+        Registers a subcommand to import on first use.
+
+        :param name: the name of the subcommand
+        :param import_path: the import path of the command object in the form 'package.module:attribute'
+        :param short_help: the help text to list in the help page without importing the command
+        """
+        self.lazy_commands[name] = (import_path, short_help)
+
+    @property
+    def extension_commands(self) -> Dict[str, EntryPoint]:
+        """Entry points of the ``pyroll.cli.commands`` group by name."""
+        if self._extension_commands is None:
+            self._extension_commands = {ep.name: ep for ep in entry_points(group="pyroll.cli.commands")}
+        return self._extension_commands
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        return sorted(set(self.commands) | set(self.lazy_commands) | set(self.extension_commands))
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        if cmd_name not in self.commands and cmd_name not in self._resolved:
+            self._resolved.add(cmd_name)
+
+            if cmd_name in self.lazy_commands:
+                module, attr = self.lazy_commands[cmd_name][0].split(":")
+                self.add_command(getattr(importlib.import_module(module), attr), cmd_name)
+            elif cmd_name in self.extension_commands:
+                self.add_command(self.extension_commands[cmd_name].load(), cmd_name)
+            else:
+                # extension commands may be named differently from their entry points
+                for n, ep in self.extension_commands.items():
+                    if n not in self.commands:
+                        command = ep.load()
+                        self.commands.setdefault(command.name, command)
+
+        return self.commands.get(cmd_name)
+
+    def format_commands(self, ctx: click.Context, formatter: click.HelpFormatter) -> None:
+        names = [
+            n for n in self.list_commands(ctx)
+            if n not in self.commands or not self.commands[n].hidden
+        ]
+
+        if not names:
+            return
+
+        limit = formatter.width - 6 - max(len(n) for n in names)
+
+        def _short_help(name):
+            if name in self.commands:
+                return self.commands[name].get_short_help_str(limit)
+            if name in self.lazy_commands:
+                return click.Command(name, help=self.lazy_commands[name][1]).get_short_help_str(limit)
+            help = f"Extension command from '{self.extension_commands[name].value}'."
+            return click.Command(name, help=help).get_short_help_str(limit)
+
+        with formatter.section("Commands"):
+            formatter.write_dl([(n, _short_help(n)) for n in names])
+
+
+@click.group(cls=LazyGroup, chain=True)
 @click.pass_context
 @click.option("--config-file", "-c", default=DEFAULT_CONFIG_FILE, help="The configuration TOML file.",
               type=click.Path(dir_okay=False, path_type=Path))
@@ -30,22 +108,54 @@ from ..rich import console, SUPPRESS_TRACEBACKS
 )
 def main(ctx: click.Context, config_file: Path, global_config: bool, plugin: List[str], dir: Path):
     if ctx.obj:
+        if ctx.obj.jobs:
+            from .jobs import collect_jobs
+            collect_jobs(ctx.obj)
         return
 
-    from .. import VERSION
-    console.print(f"This is [green]PyRolL CLI v{VERSION}[/green] using [b]PyRolL Core v{pyroll.core.VERSION}[/b].\n",
-                  highlight=False)
+    # startup messages go to stderr, to keep stdout free for machine-readable output of commands
+    with console_to_stderr():
+        from .. import VERSION
+        core_version = importlib.metadata.version("pyroll-core")
+        console.print(f"This is [green]PyRolL CLI v{VERSION}[/green] using [b]PyRolL Core v{core_version}[/b].\n",
+                      highlight=False)
+
+        install_traceback_handler()
+
+        state = State()
+        ctx.obj = state
+
+        dir.mkdir(exist_ok=True)
+        os.chdir(dir)
+
+        config = load_config(config_file, global_config)
+        state.config = config
+
+        configure_logging(config)
+        console.print()
+
+        state.logger = logging.getLogger("pyroll.cli")
+
+        plugins = list(plugin)
+        if "plugins" in config["pyroll"]:
+            plugins += list(config["pyroll"]["plugins"])
+
+        state.plugins = plugins
+        load_plugins(plugins, state.logger)
 
-    state = State()
-    ctx.obj = state
+        if plugins:
+            state.logger.info(f"Loaded plugins: %s", LazyPrettyRepr(plugins))
 
-    dir.mkdir(exist_ok=True)
-    os.chdir(dir)
+        apply_config_constants(config)
 
+
+def load_config(config_file: Path, global_config: bool) -> dict:
+    """Loads and merges the global config file (if enabled) and the local CONFIG_FILE (if existing)."""
     config = dict(pyroll=dict())
 
     if global_config:
         if not GLOBAL_CONFIG_FILE.exists():
+            from ..config import JINJA_ENV
             APP_DIR.mkdir(exist_ok=True)
             template = JINJA_ENV.get_template("config.toml")
             result = template.render(plugins=[], config_constants={})
@@ -60,49 +170,136 @@ def main(ctx: click.Context, config_file: Path, global_config: bool, plugin: Lis
         console.print(f"Using local config file: {config_file.resolve()}")
         config.update(tomli.loads(config_file.read_text()))
 
-    state.config = config
+    return config
+
+
+def configure_logging(config: dict):
+    """
+    Configures logging from the ``logging`` table of CONFIG or with default settings if not present.
+    If ``queue`` is true in the ``logging`` table, the configured handlers are moved behind a queue,
+    see :py:func:`start_queued_logging`.
+    """
+    stop_queued_logging()
 
     if "logging" in config:
         console.print("Configured logging from config.")
 
+        logging_config = dict(config["logging"])
+        queued = logging_config.pop("queue", False)
+
         # parse module names for traceback suppression
-        for n, h in config["logging"]["handlers"].items():
+        for n, h in logging_config.get("handlers", {}).items():
             if "tracebacks_suppress" in h:
                 h["tracebacks_suppress"] = [_try_parse_module_suppression(s) for s in h["tracebacks_suppress"]]
 
-        logging.config.dictConfig(config["logging"])
+        logging.config.dictConfig(logging_config)
+
+        if queued:
+            start_queued_logging()
     else:
         console.print("Using default logging.")
+        from rich.logging import RichHandler
         logging.basicConfig(
             level="INFO", format='[bold]%(name)s:[/bold] %(message)s', datefmt="[%X]",
             handlers=[RichHandler(markup=True, rich_tracebacks=True, tracebacks_suppress=SUPPRESS_TRACEBACKS)]
         )
-    console.print()
 
-    state.logger = logging.getLogger("pyroll.cli")
 
-    plugins = list(plugin)
-    if "plugins" in config["pyroll"]:
-        plugins += list(config["pyroll"]["plugins"])
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler merging the message arguments in the emitting thread (as they may change afterwards),
+    but keeping the exception info, so that the target handlers can still render rich tracebacks.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+_queued_logging: List[Tuple[logging.Logger, logging.Handler, logging.handlers.QueueListener, int]] = []
+
+
+def start_queued_logging():
+    """
+    Moves the handlers of all configured loggers behind a queue, which is processed by a listener thread,
+    so that emitting log records does not block on formatting and writing them.
+    Each queue handler's level is the lowest of its target handlers' levels,
+    so records discarded by all targets are dropped before their message is formatted.
+    The listeners are stopped at exit, flushing all pending records.
+    """
+    loggers = [logging.getLogger(), *logging.getLogger().manager.loggerDict.values()]
+
+    for logger in loggers:
+        handlers = list(getattr(logger, "handlers", []))
+        if not handlers or any(isinstance(h, logging.handlers.QueueHandler) for h in handlers):
+            continue
+
+        queue_handler = _QueueHandler(queue.SimpleQueue())
+        queue_handler.setLevel(min(h.level for h in handlers))
+        listener = logging.handlers.QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
 
+        for h in handlers:
+            logger.removeHandler(h)
+        logger.addHandler(queue_handler)
+
+        listener.start()
+        _queued_logging.append((logger, queue_handler, listener, os.getpid()))
+
+    if _queued_logging:
+        atexit.unregister(stop_queued_logging)
+        atexit.register(stop_queued_logging)
+
+
+def stop_queued_logging():
+    """
+    Stops the listeners started by :py:func:`start_queued_logging` and attaches their handlers directly again.
+    In forked child processes (where the listener threads do not exist) the handlers are only reattached.
+    """
+    while _queued_logging:
+        logger, queue_handler, listener, pid = _queued_logging.pop()
+
+        if pid == os.getpid():
+            listener.stop()
+
+        logger.removeHandler(queue_handler)
+        for h in listener.handlers:
+            logger.addHandler(h)
+
+
+def load_plugins(plugins: List[str], logger: logging.Logger):
+    """Imports the plugin modules given in PLUGINS."""
     for p in plugins:
         try:
             importlib.import_module(p)
         except ImportError:
-            state.logger.exception(f"Failed to import the plugin: '%s'", p)
+            logger.exception(f"Failed to import the plugin: '%s'", p)
             raise
 
-    if plugins:
-        state.logger.info(f"Loaded plugins: %s", pretty_repr(plugins))
+
+def apply_config_constants(config: dict):
+    """Updates the ``Config`` classes of loaded core and plugin modules from the ``pyroll`` table of CONFIG."""
+    if isinstance(config["pyroll"].get("core", None), dict):
+        importlib.import_module("pyroll.core")  # not yet imported if no plugins were loaded
 
     for n, v in config["pyroll"].items():
         full_name = f"pyroll.{n}"
         if isinstance(v, dict) and full_name in sys.modules:
             module = sys.modules.get(full_name, None)
             if module:
-                config = getattr(module, "Config", None)
-                if config:
-                    config.update(v)
+                module_config = getattr(module, "Config", None)
+                if module_config:
+                    module_config.update(v)
+
+
+def installed_pyroll_versions() -> List[str]:
+    """Lists the names and versions of installed distributions of the PyRolL project as 'name==version'."""
+    return sorted(
+        f"{d.metadata['Name']}=={d.version}"
+        for d in importlib.metadata.distributions()
+        if d.metadata["Name"] and d.metadata["Name"].lower().startswith("pyroll")
+    )
 
 
 def _try_parse_module_suppression(key: str):
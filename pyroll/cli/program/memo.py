@@ -0,0 +1,257 @@
+import hashlib
+import json
+import os
+import pickle
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from pyroll.core.hooks import Hook
+from rich.table import Table
+
+from .. import pickling
+from ..config import DEFAULT_MEMO_DIR
+
+DEFAULT_MAX_ENTRIES = 10_000
+
+DEFAULT_MEMO_HOOKS = {
+    "ThreeRollPass.usable_width": ["roll.groove", "gap"],
+    "BaseRollPass.usable_cross_section": ["roll.groove", "gap", "usable_width"],
+    "BaseRollPass.tip_cross_section": ["roll.groove", "gap", "tip_width"],
+    "BaseRollPass.technologically_orientated_contour_lines": ["roll.groove", "gap", "orientation"],
+    "Roll.contour_points": ["groove"],
+}
+"""
+Hooks memoized by default with the attribute paths of the hook host their results are determined by.
+The class of the hook host is always part of the key, as subclasses may implement the hooks differently.
+The usable width of two-roll passes is not memoized, as it is a plain lookup of the groove's usable width.
+"""
+
+_MISSING = object()
+
+
+class HookMemo:
+    """
+    Memoization of the results of whitelisted hooks, whose results are pure functions of some attributes
+    of the hook host, like the geometry of the groove.
+    Results are kept in a bounded in-process LRU cache and, if ``dir`` is given, in an on-disk store,
+    addressed by the hook and a hash of the determining attributes.
+    The store is salted with the loaded plugins and the versions of installed PyRolL packages,
+    as these define the hook functions.
+
+    While installed, ``Hook.get_result`` of ``pyroll.core`` is replaced to look up the results of whitelisted hooks,
+    which are called on the first access of a hook value and on each reevaluation of the hook caches
+    in the solution iterations.
+    Memoized results are shared between hook hosts, so they must not be mutated.
+    """
+
+    def __init__(
+            self, hooks: Dict[str, List[str]], max_entries: int = DEFAULT_MAX_ENTRIES,
+            dir: Optional[Path] = None, salt: str = ""
+    ):
+        self.hooks = {tuple(k.rsplit(".", 1)): [tuple(p.split(".")) for p in v] for k, v in hooks.items()}
+        """Whitelisted hooks by owner class qualname and hook name with the paths of the determining attributes."""
+
+        self.max_entries = max_entries
+        """Maximum count of entries in the in-process cache."""
+
+        self.dir = dir
+        """Directory of the on-disk store, None to use only the in-process cache."""
+
+        self.salt = salt
+        """String to include in all keys."""
+
+        self.stats: Dict[str, Dict[str, int]] = {}
+        """Count of hits in memory, hits on disk and misses per whitelisted hook."""
+
+        self._entries = OrderedDict()
+        self._lookup: Dict[Tuple[type, str], Optional[Tuple[str, list]]] = {}
+        self._original = None
+
+    @classmethod
+    def from_config(cls, config: dict, plugins: List[str]) -> "HookMemo":
+        """Creates an instance from the ``memoize`` table of CONFIG."""
+        from .main import installed_pyroll_versions
+
+        memo_config = config.get("memoize", {})
+        disk = memo_config.get("disk", False)
+        salt = json.dumps(dict(plugins=plugins, versions=installed_pyroll_versions()), sort_keys=True)
+
+        return cls(
+            hooks=memo_config.get("hooks", DEFAULT_MEMO_HOOKS),
+            max_entries=int(memo_config.get("max_entries", DEFAULT_MAX_ENTRIES)),
+            dir=Path(memo_config.get("dir", DEFAULT_MEMO_DIR)) if disk else None,
+            salt=hashlib.sha256(salt.encode()).hexdigest(),
+        )
+
+    @staticmethod
+    def enabled(config: dict) -> bool:
+        """Whether memoization is enabled by the ``memoize`` table of CONFIG."""
+        return bool(config.get("memoize", {}).get("enabled", False))
+
+    def _find(self, host_type: type, name: str) -> Optional[Tuple[str, list]]:
+        lookup_key = (host_type, name)
+
+        try:
+            return self._lookup[lookup_key]
+        except KeyError:
+            pass
+
+        result = None
+        for c in host_type.__mro__:
+            paths = self.hooks.get((c.__qualname__, name))
+            if paths is not None:
+                result = f"{c.__qualname__}.{name}", paths
+                break
+
+        self._lookup[lookup_key] = result
+        return result
+
+    def key(self, hook_name: str, paths: list, instance) -> Optional[str]:
+        """
+        Returns the key of the result of the hook on INSTANCE or None if the attributes cannot be hashed.
+        The key includes the class of INSTANCE besides the determining attributes.
+        """
+        host_type = type(instance)
+        digest = hashlib.sha256(f"{self.salt}:{hook_name}:{host_type.__module__}.{host_type.__qualname__}".encode())
+
+        for path in paths:
+            obj = instance
+            try:
+                for a in path:
+                    obj = getattr(obj, a)
+            except AttributeError:
+                return None
+
+            # each value is pickled on its own, as references between them would change the pickled bytes
+            try:
+                digest.update(pickling.dumps(obj))
+            except (pickle.PicklingError, TypeError, AttributeError):
+                return None
+
+        return digest.hexdigest()
+
+    def get_result(self, hook: Hook, instance):
+        """Replacement of ``Hook.get_result`` memoizing the results of whitelisted hooks."""
+        found = self._find(type(instance), hook.name)
+        if found is None:
+            return self._original(hook, instance)
+
+        hook_name, paths = found
+        key = self.key(hook_name, paths, instance)
+        if key is None:
+            return self._original(hook, instance)
+
+        stats = self.stats.setdefault(hook_name, dict(hits=0, disk_hits=0, misses=0))
+
+        result = self._entries.get(key, _MISSING)
+        if result is not _MISSING:
+            self._entries.move_to_end(key)
+            stats["hits"] += 1
+            return result
+
+        result = self._read(key)
+        if result is not _MISSING:
+            stats["disk_hits"] += 1
+        else:
+            stats["misses"] += 1
+            result = self._original(hook, instance)
+            if result is None:
+                return None
+            self._write(key, result)
+
+        self._entries[key] = result
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+        return result
+
+    def _read(self, key: str):
+        if self.dir is None:
+            return _MISSING
+
+        try:
+            with (self.dir / f"{key}.pickle").open("rb") as f:
+                return pickling.load(f)
+        except (FileNotFoundError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return _MISSING
+
+    def _write(self, key: str, result):
+        if self.dir is None:
+            return
+
+        self.dir.mkdir(parents=True, exist_ok=True)
+        file = self.dir / f"{key}.pickle"
+        tmp = file.with_suffix(f".{os.getpid()}.tmp")
+
+        try:
+            with tmp.open("wb") as f:
+                pickling.dump(result, f)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            tmp.unlink(missing_ok=True)
+            return
+        os.replace(tmp, file)
+
+    def install(self):
+        """Replaces ``Hook.get_result`` to use this instance."""
+        if self._original is not None:
+            return
+
+        memo = self
+        self._original = Hook.get_result
+
+        def get_result(hook, instance):
+            return memo.get_result(hook, instance)
+
+        Hook.get_result = get_result
+
+    def uninstall(self):
+        """Restores the original ``Hook.get_result``."""
+        if self._original is None:
+            return
+
+        Hook.get_result = self._original
+        self._original = None
+
+    def __enter__(self):
+        self.install()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.uninstall()
+
+    def stats_table(self) -> Table:
+        """Creates a rich table of the hit and miss counts per hook."""
+        table = Table(title="Hook Memoization")
+        table.add_column("Hook")
+        for c in ["Hits", "Disk Hits", "Misses", "Hit Rate"]:
+            table.add_column(c, justify="right")
+
+        for name, s in sorted(self.stats.items()):
+            total = s["hits"] + s["disk_hits"] + s["misses"]
+            table.add_row(
+                name, str(s["hits"]), str(s["disk_hits"]), str(s["misses"]),
+                f"{(s['hits'] + s['disk_hits']) / total:.1%}" if total else "-"
+            )
+
+        return table
+
+
+_memo: Optional[HookMemo] = None
+
+
+def hook_memo(config: dict, plugins: List[str]) -> HookMemo:
+    """
+    Returns the memo of the process for CONFIG and PLUGINS, which is kept across solutions
+    as long as its settings do not change. The statistics are reset on each call.
+    """
+    global _memo
+    memo = HookMemo.from_config(config, plugins)
+
+    if _memo is None or (_memo.hooks, _memo.max_entries, _memo.dir, _memo.salt) != (
+            memo.hooks, memo.max_entries, memo.dir, memo.salt
+    ):
+        _memo = memo
+
+    _memo.stats = {}
+    return _memo
@@ -0,0 +1,316 @@
+import copy
+import hashlib
+import json
+import math
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Tuple, Iterable, Optional
+
+import click as click
+import tomli
+from rich.table import Table
+
+from .spec import AttributePath, first_affected_unit, gen_leaves, path_name, resolve_parent, set_parameter
+from .state import State
+from .worker import init_worker
+from .. import pickling
+from ..config import DEFAULT_OPTIMIZE_FILE
+from ..rich import console
+
+Parameter = Tuple[AttributePath, float, float]
+Target = Tuple[AttributePath, float]
+
+DEFAULT_SEARCH_OPTIONS = dict(
+    max_evaluations=200,
+    tolerance=1e-4,
+    initial_step=0.25,
+    min_step=1e-3,
+)
+
+
+@click.command()
+@click.option(
+    "-s", "--spec",
+    help="TOML file defining the free parameters, targets and search options.",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=DEFAULT_OPTIMIZE_FILE, show_default=True
+)
+@click.option(
+    "-j", "--workers",
+    help="Count of worker processes to use. Defaults to the count of CPUs.",
+    type=click.IntRange(min=1), default=None
+)
+@click.option(
+    "-o", "--output",
+    help="JSON file to write the optimized parameter values, achieved target values and search history to.",
+    type=click.Path(dir_okay=False, path_type=Path), default=None
+)
+@click.pass_obj
+def optimize(state: State, spec: Path, workers: int, output: Path):
+    """
+    Searches values of free parameters of the loaded pass sequence within bounds meeting target values
+    of results, as defined by the spec in the TOML file SPEC. The best found solution becomes the loaded sequence.
+
+    The [parameters.units."<label>"] tables (may be nested, f.e. [parameters.units."<label>".roll.groove])
+    give the bounds of parameters as {min, max}. The [targets] table gives target values of attributes of
+    the pass sequence (f.e. out_profile.width = 0.025), [targets.units."<label>"] those of units.
+    The optional [search] table sets max_evaluations, tolerance (of the relative RMS deviation from the targets),
+    initial_step and min_step (as fraction of the bounds).
+
+    A pattern search is used, evaluating all neighbours of the current best point in parallel.
+    Candidates are solved starting from the solution of the point they are derived from.
+    """
+    if state.sequence is None or state.in_profile is None:
+        state.logger.critical("No pass sequence loaded. Use a command like 'input-py' to load a pass sequence.")
+        sys.exit(1)
+
+    try:
+        parameters, targets, options = parse_optimize_spec(tomli.loads(spec.read_text()))
+        start = [_initial_value(state.sequence, p) for p in parameters]
+        for path, _ in targets:
+            resolve_parent(state.sequence, path)
+    except (ValueError, KeyError, AttributeError, IndexError) as e:
+        raise click.BadParameter(str(e), param_hint="'-s' / '--spec'") from e
+
+    state.logger.info("Optimizing %d parameters for %d targets.", len(parameters), len(targets))
+
+    with console.status("[bold green]Optimizing...") as status:
+        search = PatternSearch(state, parameters, targets, options, workers)
+        for evaluations, best in search.run(start):
+            status.update(
+                f"[bold green]Optimizing... {evaluations} evaluations, "
+                f"best deviation {best['objective']:.3g}, step {search.step:.3g}"
+            )
+
+    best = search.best
+
+    if best is None or not math.isfinite(best["objective"]):
+        state.logger.error("No candidate could be solved successfully.")
+        sys.exit(1)
+
+    _load_best(state, parameters, best)
+
+    state.logger.info(
+        "Finished after %d evaluations with relative RMS deviation %.3g from targets.",
+        len(search.history), best["objective"]
+    )
+    console.print(_results_table(parameters, targets, start, best))
+
+    if output:
+        output.write_text(json.dumps(dict(
+            parameters={path_name(p): v for (p, _, _), v in zip(parameters, best["values"])},
+            achieved={path_name(p): v for (p, _), v in zip(targets, best["achieved"])},
+            objective=best["objective"],
+            history=search.history,
+        ), indent=2), encoding="utf-8")
+        state.logger.info("Wrote optimization results to: %s", output.absolute())
+
+
+def _load_best(state: State, parameters: List[Parameter], best: dict):
+    """
+    Loads the solved sequence of the BEST record as new input.
+    Its input hash and the fingerprints of the units changed by the parameters are derived from those of the
+    loaded input and the parameter values, as if the variant had been loaded from an input file and then solved.
+    """
+    values = json.dumps(best["values"])
+    fingerprints = list(state.input_fingerprints) if state.input_fingerprints else None
+    input_hash = hashlib.sha256(f"{state.input_hash}:{values}".encode()).hexdigest() if state.input_hash else None
+
+    if fingerprints:
+        for i in {first_affected_unit(state.sequence, p) for p, _, _ in parameters}:
+            fp = fingerprints[i + 1]
+            fingerprints[i + 1] = hashlib.sha256(f"{fp}:{values}".encode()).hexdigest() if fp else None
+
+    state.load(state.in_profile, pickling.loads(best.pop("data")), input_hash=input_hash)
+    state.input_fingerprints = fingerprints
+
+
+def parse_optimize_spec(spec: dict) -> Tuple[List[Parameter], List[Target], dict]:
+    """Parses an optimization spec dict into the lists of parameters and targets and the search options."""
+    parameters = [
+        (path, float(bounds["min"]), float(bounds["max"]))
+        for path, bounds in gen_leaves(spec.get("parameters", {}), (), lambda v: "min" in v and "max" in v)
+    ]
+    targets = [(path, float(v)) for path, v in gen_leaves(spec.get("targets", {}), (), lambda v: False)]
+
+    if not parameters:
+        raise ValueError("Optimization spec does not define any parameters.")
+    if not targets:
+        raise ValueError("Optimization spec does not define any targets.")
+    for path, lo, hi in parameters:
+        if not lo < hi:
+            raise ValueError(f"Lower bound of parameter '{path_name(path)}' must be less than its upper bound.")
+    for path, _, _ in parameters:
+        if path[0] != "units":
+            raise ValueError(f"Parameter '{'.'.join(path)}' is not in a 'units' table.")
+    for path in [p for p, _, _ in parameters] + [p for p, _ in targets]:
+        if path[0] == "units" and len(path) < 3:
+            raise ValueError(f"Invalid path '{'.'.join(path)}', expected a unit label and an attribute name.")
+
+    options = dict(DEFAULT_SEARCH_OPTIONS, **spec.get("search", {}))
+    return parameters, targets, options
+
+
+def _initial_value(sequence, parameter: Parameter) -> float:
+    path, lo, hi = parameter
+    value = getattr(resolve_parent(sequence, path), path[-1], None)
+    if value is None:
+        return (lo + hi) / 2
+    return min(max(float(value), lo), hi)
+
+
+def evaluate(base, parameters: List[Parameter], targets: List[Target], values: List[float]) -> dict:
+    """
+    Solves a copy of the solved or unsolved BASE in profile and sequence with the parameters set to VALUES
+    and returns a record with the relative RMS deviation from the targets as objective, the achieved values
+    and the pickled solved sequence.
+    """
+    in_profile, sequence = copy.deepcopy(base)
+
+    try:
+        for (path, _, _), v in zip(parameters, values):
+            set_parameter(sequence, path, v)
+
+        sequence.solve(in_profile)
+        achieved = [float(getattr(resolve_parent(sequence, p), p[-1])) for p, _ in targets]
+    except Exception as e:
+        return dict(values=values, objective=math.inf, status="failed", error=str(e))
+
+    objective = math.sqrt(sum(((a - t) / (abs(t) or 1)) ** 2 for a, (_, t) in zip(achieved, targets)) / len(targets))
+
+    return dict(
+        values=values, objective=objective, status="ok", achieved=achieved,
+        data=pickling.dumps(sequence)
+    )
+
+
+class PatternSearch:
+    """
+    Compass pattern search on the parameter values normalized to their bounds.
+    In each step, the points one step size away from the current best point along each parameter axis are solved
+    in parallel, starting from the solution of the best point (warm start).
+    The best point moves to the best improving candidate, or the step size is halved if none improves.
+    """
+
+    def __init__(
+            self, state: State, parameters: List[Parameter], targets: List[Target], options: dict,
+            workers: Optional[int]
+    ):
+        self.state = state
+        self.parameters = parameters
+        self.targets = targets
+        self.options = options
+        self.workers = workers
+
+        self.step = float(options["initial_step"])
+        """Current step size as fraction of the bounds."""
+
+        self.best: Optional[dict] = None
+        """Record of the best evaluated point."""
+
+        self.history: List[dict] = []
+        """Records of all evaluations without solution data."""
+
+    def _denormalize(self, u: List[float]) -> List[float]:
+        return [lo + x * (hi - lo) for x, (_, lo, hi) in zip(u, self.parameters)]
+
+    def _normalize(self, values: List[float]) -> List[float]:
+        return [(v - lo) / (hi - lo) for v, (_, lo, hi) in zip(values, self.parameters)]
+
+    def _neighbours(self, u: List[float]) -> List[List[float]]:
+        result = []
+        for i in range(len(u)):
+            for sign in [1, -1]:
+                n = list(u)
+                n[i] = min(max(u[i] + sign * self.step, 0.0), 1.0)
+                if n != u and n not in result:
+                    result.append(n)
+        return result
+
+    def run(self, start: List[float]) -> Iterable[Tuple[int, dict]]:
+        """Runs the search from the START values, yields the count of evaluations and the best record per step."""
+        base = (self.state.in_profile, self.state.sequence)
+        max_evaluations = int(self.options["max_evaluations"])
+
+        with _executor(self.state, self.workers) as executor:
+            self.best = self._record(executor.evaluate(base, self.parameters, self.targets, [start])[0])
+            yield len(self.history), self.best
+
+            while (
+                    len(self.history) < max_evaluations
+                    and self.best["objective"] > self.options["tolerance"]
+                    and self.step >= self.options["min_step"]
+            ):
+                center = self._normalize(self.best["values"])
+                candidates = self._neighbours(center)[:max_evaluations - len(self.history)]
+                base = (self.state.in_profile, pickling.loads(self.best["data"]))
+
+                records = [
+                    self._record(r) for r in
+                    executor.evaluate(base, self.parameters, self.targets, [self._denormalize(c) for c in candidates])
+                ]
+                improving = min(records, key=lambda r: r["objective"], default=None)
+
+                if improving is not None and improving["objective"] < self.best["objective"]:
+                    self.best = improving
+                else:
+                    self.step /= 2
+
+                yield len(self.history), self.best
+
+    def _record(self, record: dict) -> dict:
+        self.history.append({k: v for k, v in record.items() if k != "data"})
+        return record
+
+
+class _SerialExecutor:
+    def evaluate(self, base, parameters, targets, candidates: List[List[float]]) -> List[dict]:
+        return [evaluate(base, parameters, targets, c) for c in candidates]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+class _PoolExecutor:
+    def __init__(self, state: State, workers: Optional[int]):
+        self._pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=init_worker,
+            initargs=(state.config, state.plugins)
+        )
+
+    def evaluate(self, base, parameters, targets, candidates: List[List[float]]) -> List[dict]:
+        data = pickling.dumps(base)
+        futures = [self._pool.submit(_evaluate_pickled, data, parameters, targets, c) for c in candidates]
+        return [f.result() for f in futures]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._pool.shutdown(cancel_futures=True)
+
+
+def _executor(state: State, workers: Optional[int]):
+    return _SerialExecutor() if workers == 1 else _PoolExecutor(state, workers)
+
+
+def _evaluate_pickled(data: bytes, parameters, targets, values) -> dict:
+    return evaluate(pickling.loads(data), parameters, targets, values)
+
+
+def _results_table(parameters: List[Parameter], targets: List[Target], start: List[float], best: dict) -> Table:
+    table = Table(title="Optimization Results")
+    for c in ["", "Name", "Initial / Target", "Optimized / Achieved"]:
+        table.add_column(c, justify="left" if c in ["", "Name"] else "right")
+
+    for (path, _, _), s, v in zip(parameters, start, best["values"]):
+        table.add_row("parameter", path_name(path), f"{s:.6g}", f"{v:.6g}")
+    for (path, t), a in zip(targets, best["achieved"]):
+        table.add_row("target", path_name(path), f"{t:.6g}", f"{a:.6g}")
+
+    return table
@@ -0,0 +1,150 @@
+import cProfile
+import json
+from pathlib import Path
+from timeit import default_timer as timer
+from typing import Dict, Tuple, List
+
+from pyroll.core import Unit, HookFunction
+from rich.console import Group
+from rich.table import Table
+
+DEFAULT_PROFILE_FILE = Path("profile.json")
+PSTATS_SUFFIXES = [".pstats", ".prof"]
+
+
+def plugin_of(module: str) -> str:
+    """Returns the name of the plugin package (or other top level package) the module belongs to."""
+    parts = module.split(".")
+    if parts[0] == "pyroll" and len(parts) > 1:
+        return ".".join(parts[:2])
+    return parts[0]
+
+
+class SolveProfiler:
+    """
+    Context manager instrumenting the solution of units and the calls of hook functions in ``pyroll.core``.
+    Records wall time and iteration counts per unit and call counts, total and own wall time per hook function.
+    Optionally runs ``cProfile`` alongside to allow inspection using the ``pstats`` module.
+    """
+
+    def __init__(self, cprofile: bool = False):
+        self.units: Dict[int, dict] = {}
+        """Records per solved unit by id of the unit object."""
+
+        self.hooks: Dict[Tuple[str, str, str], dict] = {}
+        """Records per hook function by plugin, hook and function name."""
+
+        self.total_time = 0.0
+        """Total wall time spent inside the context."""
+
+        self.cprofile = cProfile.Profile() if cprofile else None
+        """The cProfile instance if enabled."""
+
+        self._stack: List[list] = []
+        self._originals = {}
+
+    def __enter__(self):
+        profiler = self
+        solve = Unit.solve
+        solve_subunits = Unit._solve_subunits
+        call = HookFunction.__call__
+
+        def _solve(unit, in_profile):
+            record = profiler.units.setdefault(
+                id(unit), dict(unit=str(unit), type=type(unit).__qualname__, time=0.0, iterations=0)
+            )
+            start = timer()
+            try:
+                return solve(unit, in_profile)
+            finally:
+                record["time"] += timer() - start
+
+        def _solve_subunits(unit):
+            if id(unit) in profiler.units:
+                profiler.units[id(unit)]["iterations"] += 1
+            return solve_subunits(unit)
+
+        def _call(function, instance):
+            frame = [timer(), 0.0]
+            profiler._stack.append(frame)
+            try:
+                return call(function, instance)
+            finally:
+                profiler._stack.pop()
+                elapsed = timer() - frame[0]
+                if profiler._stack:
+                    profiler._stack[-1][1] += elapsed
+
+                key = (
+                    plugin_of(function.module),
+                    f"{function.hook.owner.__qualname__}.{function.hook.name}",
+                    f"{function.module}.{function.qualname}",
+                )
+                record = profiler.hooks.setdefault(key, dict(calls=0, time=0.0, own_time=0.0))
+                record["calls"] += 1
+                record["time"] += elapsed
+                record["own_time"] += elapsed - frame[1]
+
+        self._originals = {
+            (Unit, "solve"): solve,
+            (Unit, "_solve_subunits"): solve_subunits,
+            (HookFunction, "__call__"): call,
+        }
+        Unit.solve = _solve
+        Unit._solve_subunits = _solve_subunits
+        HookFunction.__call__ = _call
+
+        self._start = timer()
+        if self.cprofile:
+            self.cprofile.enable()
+
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.cprofile:
+            self.cprofile.disable()
+        self.total_time += timer() - self._start
+
+        for (cls, name), original in self._originals.items():
+            setattr(cls, name, original)
+
+    def to_dict(self) -> dict:
+        """Returns the records as dict with lists sorted by descending time."""
+        return dict(
+            total_time=self.total_time,
+            units=sorted(self.units.values(), key=lambda r: r["time"], reverse=True),
+            hooks=sorted(
+                (dict(plugin=k[0], hook=k[1], function=k[2], **v) for k, v in self.hooks.items()),
+                key=lambda r: r["own_time"], reverse=True
+            ),
+        )
+
+    def save(self, file: Path):
+        """Saves the records as JSON file or the cProfile stats as pstats file, depending on the suffix of FILE."""
+        if file.suffix in PSTATS_SUFFIXES:
+            if not self.cprofile:
+                raise ValueError("cProfile was not enabled for this profiler.")
+            self.cprofile.dump_stats(file)
+        else:
+            file.write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+
+    def tables(self, max_rows: int = 20) -> Group:
+        """Creates rich tables of the records with the top MAX_ROWS entries."""
+        d = self.to_dict()
+
+        units = Table(title=f"Units (total solution time {d['total_time']:.3f} s)")
+        for c in ["Unit", "Type", "Iterations", "Time [s]"]:
+            units.add_column(c, justify="left" if c in ["Unit", "Type"] else "right")
+        for r in d["units"][:max_rows]:
+            units.add_row(r["unit"], r["type"], str(r["iterations"]), f"{r['time']:.4f}")
+
+        hooks = Table(title="Hook Functions")
+        for c in ["Plugin", "Hook", "Function", "Calls", "Time [s]", "Own Time [s]"]:
+            hooks.add_column(c, justify="left" if c in ["Plugin", "Hook", "Function"] else "right")
+        for r in d["hooks"][:max_rows]:
+            hooks.add_row(
+                r["plugin"], r["hook"], r["function"].split(".")[-1],
+                str(r["calls"]), f"{r['time']:.4f}", f"{r['own_time']:.4f}"
+            )
+
+        return Group(units, hooks)
@@ -0,0 +1,162 @@
+import json
+import time
+from timeit import default_timer as timer
+from typing import Callable, List, TextIO
+
+from pyroll.core import Unit, PassSequence
+from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, MofNCompleteColumn, TimeElapsedColumn
+
+from ..rich import console
+
+EventListener = Callable[[dict], None]
+
+
+class SolveMonitor:
+    """
+    Context manager observing the solution of the top-level units of a pass sequence in ``pyroll.core``.
+    Emits events as dicts to the given listeners:
+
+    - ``solve_start`` and ``solve_finish`` around the whole context,
+    - ``sequence_iteration`` on each iteration of the pass sequence itself,
+    - ``unit_start``, ``unit_finish`` and ``iteration`` for each top-level unit.
+
+    Each event has the keys ``event``, ``timestamp`` (seconds since epoch) and ``elapsed`` (seconds since start).
+    Units replaced by previous solutions (see ``solve --incremental``) are not solved and emit no events.
+    """
+
+    def __init__(self, sequence: PassSequence, listeners: List[EventListener]):
+        self.sequence = sequence
+        self.listeners = listeners
+
+        self.finished_units = 0
+        """Count of finished solutions of top-level units (which may be solved multiple times)."""
+
+        self._indices = {}
+        self._iterations = {}
+        self._sequence_iterations = 0
+        self._originals = {}
+
+    def emit(self, event: str, **data):
+        """Sends an event of given type with DATA to all listeners."""
+        elapsed = timer() - self._start
+        data = dict(event=event, timestamp=time.time(), elapsed=elapsed, **data)
+        for listener in self.listeners:
+            listener(data)
+
+    def units_per_second(self) -> float:
+        """Returns the count of finished unit solutions per second since start."""
+        elapsed = timer() - self._start
+        return self.finished_units / elapsed if elapsed > 0 else 0.0
+
+    def __enter__(self):
+        monitor = self
+        solve = Unit.solve
+        solve_subunits = Unit._solve_subunits
+
+        def _solve(unit, in_profile):
+            index = monitor._indices.get(id(unit))
+            if index is None:
+                return solve(unit, in_profile)
+
+            monitor._iterations[index] = 0
+            data = dict(index=index, unit=unit.label, type=type(unit).__qualname__)
+            monitor.emit("unit_start", **data)
+            start = timer()
+
+            try:
+                result = solve(unit, in_profile)
+            except Exception as e:
+                monitor.emit(
+                    "unit_finish", **data, status="failed", error=str(e),
+                    iterations=monitor._iterations[index], duration=timer() - start
+                )
+                raise
+
+            monitor.finished_units += 1
+            monitor.emit(
+                "unit_finish", **data, status="ok",
+                iterations=monitor._iterations[index], duration=timer() - start,
+                units_per_second=monitor.units_per_second()
+            )
+            return result
+
+        def _solve_subunits(unit):
+            if unit is monitor.sequence:
+                monitor._sequence_iterations += 1
+                monitor.emit("sequence_iteration", iteration=monitor._sequence_iterations)
+            else:
+                index = monitor._indices.get(id(unit))
+                if index is not None:
+                    monitor._iterations[index] += 1
+                    monitor.emit("iteration", index=index, unit=unit.label, iteration=monitor._iterations[index])
+
+            return solve_subunits(unit)
+
+        self._originals = {"solve": solve, "_solve_subunits": solve_subunits}
+        Unit.solve = _solve
+        Unit._solve_subunits = _solve_subunits
+
+        self._indices = {id(u): i for i, u in enumerate(self.sequence)}
+        self._start = timer()
+        self.emit("solve_start", units=len(self._indices))
+
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        for name, original in self._originals.items():
+            setattr(Unit, name, original)
+
+        self.emit(
+            "solve_finish", status="ok" if exc_type is None else "failed",
+            sequence_iterations=self._sequence_iterations, finished_units=self.finished_units,
+            units_per_second=self.units_per_second()
+        )
+
+
+class JsonlEventWriter:
+    """Event listener writing each event as JSON line to a text file object, flushing after each line."""
+
+    def __init__(self, file: TextIO):
+        self.file = file
+
+    def __call__(self, event: dict):
+        self.file.write(json.dumps(event) + "\n")
+        self.file.flush()
+
+
+class ProgressDisplay:
+    """
+    Context manager showing a live progress bar of the solution on the console,
+    with the current unit, its iteration count, the elapsed time and the rate of finished units.
+    To be used as event listener of a :py:class:`SolveMonitor`.
+    """
+
+    def __init__(self, total: int):
+        self.progress = Progress(
+            SpinnerColumn(),
+            TextColumn("[bold green]{task.description}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            TextColumn("iteration {task.fields[iteration]}"),
+            TimeElapsedColumn(),
+            TextColumn("{task.fields[rate]:.1f} units/s"),
+            console=console,
+        )
+        self._task = self.progress.add_task("Running solution process...", total=total, iteration=0, rate=0.0)
+
+    def __enter__(self):
+        self.progress.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.progress.stop()
+
+    def __call__(self, event: dict):
+        kind = event["event"]
+
+        if kind == "unit_start":
+            self.progress.update(self._task, description=event["unit"], iteration=0)
+        elif kind == "iteration":
+            self.progress.update(self._task, iteration=event["iteration"])
+        elif kind == "unit_finish" and event["status"] == "ok":
+            self.progress.update(self._task, completed=event["index"] + 1, rate=event["units_per_second"])
@@ -0,0 +1,142 @@
+import gc
+import os
+import sys
+import types
+from typing import Iterable
+
+import click as click
+from rich.table import Table
+
+from .state import State
+from ..rich import console
+
+RETENTION_MODES = ["full", "compact", "summary"]
+
+
+def retention_config(config: dict) -> dict:
+    """Returns the ``retention`` table of CONFIG completed with the defaults."""
+    result = dict(mode="full", keep_last=1)
+    result.update(config.get("retention", {}))
+
+    if result["mode"] not in RETENTION_MODES:
+        raise ValueError(f"Unknown retention mode '{result['mode']}', expected one of {RETENTION_MODES}.")
+
+    if not isinstance(result["keep_last"], int) or result["keep_last"] < 0:
+        raise ValueError(f"Retention option 'keep_last' must be a non-negative integer, got {result['keep_last']!r}.")
+
+    return result
+
+
+def compact_unit(unit):
+    """
+    Drops data of the solved UNIT and its subunits only needed during solution:
+    the disk elements (they are created anew if the unit is solved again), the convergence history
+    and the cached hook values of the unit, its profiles and its roll.
+    The values of root hooks are kept, as they are set explicitly after solving, others are recomputed on access.
+    """
+    from pyroll.core import DiskElementUnit
+
+    for u in unit.subunits:
+        compact_unit(u)
+
+    if isinstance(unit, DiskElementUnit):
+        unit._subunits = unit._SubUnitsList(unit, [])
+
+    unit.convergence_history = []
+
+    for host in [unit, unit.__dict__.get("in_profile"), unit.__dict__.get("out_profile"), unit.__dict__.get("roll")]:
+        if host is not None:
+            host.__cache__.clear()
+
+
+def apply_retention(state: State):
+    """
+    Reduces the results kept in STATE after solving according to the retention policy in the config.
+    In 'compact' mode, :py:func:`compact_unit` is applied to the sequence.
+    In 'summary' mode, the sequence is replaced by a summary of its results in ``State.summary``.
+    """
+    policy = retention_config(state.config)
+
+    if policy["mode"] == "full" or state.sequence is None:
+        return
+
+    if policy["mode"] == "summary":
+        from .worker import summarize
+
+        state.summary = summarize(state.in_profile, state.sequence)
+        state.sequence = None
+        state.previous_solution = None
+        state.solution_history = []
+        state.logger.info("Dropped the solved pass sequence, keeping only a summary of its results.")
+        return
+
+    compact_unit(state.sequence)
+    state.logger.info("Dropped disk elements, iteration histories and cached hook values of the solved pass sequence.")
+
+
+_EXCLUDED_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+
+def deep_size(obj, seen: set = None) -> int:
+    """
+    Estimates the memory footprint of OBJ in bytes as sum of the sizes of all objects reachable from it.
+    Classes, modules and functions are not followed. Objects in SEEN are skipped, all visited objects are added.
+    """
+    seen = set() if seen is None else seen
+    size = 0
+    stack = [obj]
+
+    while stack:
+        o = stack.pop()
+        if id(o) in seen or isinstance(o, _EXCLUDED_TYPES):
+            continue
+        seen.add(id(o))
+        size += sys.getsizeof(o, 0)
+        stack.extend(gc.get_referents(o))
+
+    return size
+
+
+def _gen_sizes(state: State) -> Iterable:
+    seen = set()
+    yield "Pass Sequence", deep_size(state.sequence, seen) if state.sequence is not None else 0
+    yield "In Profile", deep_size(state.in_profile, seen) if state.in_profile is not None else 0
+    yield "Previous Solution", deep_size(state.previous_solution, seen) if state.previous_solution else 0
+    yield "Solution History", deep_size(state.solution_history, seen) if state.solution_history else 0
+    yield "Summary", deep_size(state.summary, seen) if state.summary else 0
+    yield "Config", deep_size(state.config, seen)
+
+
+def _resident_memory() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return -1
+
+
+@click.command()
+@click.pass_obj
+def mem(state: State):
+    """
+    Reports the estimated memory footprint of the simulation state and the resident memory of the process.
+    Objects shared between state entries are only counted for the first.
+    """
+    table = Table(title="Memory Footprint", show_header=False)
+    table.add_column(style="bold")
+    table.add_column(justify="right")
+
+    total = 0
+    for name, size in _gen_sizes(state):
+        table.add_row(name, f"{size / 1024 ** 2:.2f} MiB")
+        total += size
+
+    table.add_row("Total State", f"{total / 1024 ** 2:.2f} MiB")
+
+    resident = _resident_memory()
+    if resident >= 0:
+        table.add_row("Resident Process Memory", f"{resident / 1024 ** 2:.2f} MiB")
+
+    table.add_row("Retention Mode", retention_config(state.config)["mode"])
+
+    console.print(table)
@@ -0,0 +1,269 @@
+import copy
+import json
+import math
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from timeit import default_timer as timer
+from typing import Dict, List, Tuple
+
+import click as click
+import tomli
+from rich.table import Table
+
+from .incremental import frozen_solve
+from .spec import AttributePath, first_affected_unit, gen_spec_leaves, path_name, resolve_parent, set_parameter
+from .state import State
+from .worker import init_worker
+from .. import pickling
+from ..config import DEFAULT_SENSITIVITY_FILE
+from ..rich import console
+
+Parameter = Tuple[AttributePath, float]
+Perturbation = Tuple[int, int, float, int]
+"""Index of the parameter, sign of the perturbation, perturbed value and count of reused units."""
+
+_base = None
+
+
+@click.command()
+@click.option(
+    "-s", "--spec",
+    help="TOML file defining the parameters to compute the sensitivities with respect to.",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=DEFAULT_SENSITIVITY_FILE, show_default=True
+)
+@click.option(
+    "--step",
+    help="Default perturbation of the parameters relative to their value (absolute if the value is zero).",
+    type=click.FloatRange(min=0, min_open=True), default=1e-2, show_default=True
+)
+@click.option(
+    "--central/--forward",
+    help="Use central differences (two solutions per parameter) instead of forward differences (one solution).",
+    default=False, show_default=True
+)
+@click.option(
+    "--reuse-prefix/--no-reuse-prefix",
+    help="Reuse the base solution of the units before the first unit affected by a parameter.",
+    default=True, show_default=True
+)
+@click.option(
+    "-n", "--normalized",
+    help="Show normalized sensitivities (relative change of output per relative change of parameter).",
+    is_flag=True
+)
+@click.option(
+    "-j", "--workers",
+    help="Count of worker processes to use. Defaults to the count of CPUs.",
+    type=click.IntRange(min=1), default=None
+)
+@click.option(
+    "-o", "--output",
+    help="JSON file to write the base outputs and the sensitivities to.",
+    type=click.Path(dir_okay=False, path_type=Path), default=None
+)
+@click.pass_obj
+def sensitivity(
+        state: State, spec: Path, step: float, central: bool, reuse_prefix: bool, normalized: bool, workers: int,
+        output: Path
+):
+    """
+    Computes the sensitivities of the exit profile dimensions, area and temperature and of the roll forces
+    of the loaded pass sequence with respect to the parameters defined in the TOML file SPEC by finite differences.
+    The perturbed variants are solved in parallel using a pool of worker processes.
+
+    The [in_profile] table and the [units."<label>"] tables (may be nested, f.e. [units."<label>".roll])
+    give the parameters as keys, with the relative perturbation step as value or true to use the default step.
+
+    A perturbation of a unit's parameter does not affect the units before it, so their solution is taken
+    from the base solution instead of solving them again.
+    """
+    if state.sequence is None or state.in_profile is None:
+        state.logger.critical("No pass sequence loaded. Use a command like 'input-py' to load a pass sequence.")
+        sys.exit(1)
+
+    if state.sequence.in_profile is not None:
+        state.logger.warning("The loaded pass sequence was already solved, perturbations start from its results.")
+
+    try:
+        parameters = parse_sensitivity_spec(tomli.loads(spec.read_text()), step)
+        values = [float(getattr(resolve_parent(state.sequence, p, state.in_profile), p[-1])) for p, _ in parameters]
+        first_units = [first_affected_unit(state.sequence, p) for p, _ in parameters]
+    except (ValueError, KeyError, AttributeError, TypeError) as e:
+        raise click.BadParameter(str(e), param_hint="'-s' / '--spec'") from e
+
+    template = (state.in_profile, state.sequence)
+
+    with console.status("[bold green]Solving base..."):
+        in_profile, solved = copy.deepcopy(template)
+        solved.solve(in_profile)
+        base_outputs = outputs(solved)
+
+    reusable = reusable_prefix_length(solved)
+    steps = [s * abs(v) or s for v, (_, s) in zip(values, parameters)]
+    perturbations = [
+        (i, sign, v + sign * h, min(k, reusable) if reuse_prefix else 0)
+        for i, (v, h, k) in enumerate(zip(values, steps, first_units))
+        for sign in ([1, -1] if central else [1])
+    ]
+
+    state.logger.info(
+        "Solving %d perturbations of %d parameters, reusing %d of %d unit solutions from the base solution.",
+        len(perturbations), len(parameters), sum(p[3] for p in perturbations), len(perturbations) * len(solved)
+    )
+    results = {}
+
+    with console.status("[bold green]Solving perturbations...") as status:
+        for (i, sign), result in _solve_perturbations(state, (*template, solved), parameters, perturbations, workers):
+            results[i, sign] = result
+            status.update(f"[bold green]Solved {len(results)}/{len(perturbations)} perturbations...")
+
+    failed = {k: r for k, r in results.items() if r["status"] != "ok"}
+    for (i, sign), r in failed.items():
+        state.logger.error(
+            "Solution of perturbation %s of %s failed with error: %s",
+            "+" if sign > 0 else "-", path_name(parameters[i][0]), r["error"]
+        )
+
+    jacobian = {}
+    elasticities = {}
+    for i, ((path, _), v, h) in enumerate(zip(parameters, values, steps)):
+        upper = results[i, 1].get("outputs")
+        lower = results[i, -1].get("outputs") if central else base_outputs
+        derivatives = {
+            o: (upper[o] - lower[o]) / (2 * h if central else h) if upper and lower else math.nan
+            for o in base_outputs
+        }
+        jacobian[path_name(path)] = derivatives
+        elasticities[path_name(path)] = {
+            o: d * v / y if y else math.nan for (o, d), y in zip(derivatives.items(), base_outputs.values())
+        }
+
+    state.logger.info("Finished %d perturbations, %d failed.", len(results), len(failed))
+    console.print(_results_table(elasticities if normalized else jacobian, normalized))
+
+    if output:
+        output.write_text(json.dumps(dict(
+            parameters={path_name(p): dict(value=v, step=h) for (p, _), v, h in zip(parameters, values, steps)},
+            outputs=base_outputs,
+            jacobian=jacobian,
+            elasticities=elasticities,
+            central=central,
+        ), indent=2), encoding="utf-8")
+        state.logger.info("Wrote sensitivities to: %s", output.absolute())
+
+
+def parse_sensitivity_spec(spec: dict, default_step: float) -> List[Parameter]:
+    """Parses a sensitivity spec dict into the list of parameter paths with their relative steps."""
+    parameters = list(gen_spec_leaves(spec, lambda v: False, "sensitivity"))
+
+    if not parameters:
+        raise ValueError("Sensitivity spec does not define any parameters.")
+
+    result = []
+    for path, step in parameters:
+        if step is True:
+            step = default_step
+        elif isinstance(step, bool) or not isinstance(step, (int, float)) or step <= 0:
+            raise ValueError(f"Step of parameter '{path_name(path)}' must be a positive number or true.")
+        result.append((path, float(step)))
+
+    return result
+
+
+def reusable_prefix_length(sequence) -> int:
+    """
+    Returns the count of leading units of the solved SEQUENCE whose solution can be reused.
+    Units with post-processors end the prefix, as their solution results cannot be restored exactly.
+    """
+    return next(
+        (i for i, u in enumerate(sequence) if any(True for _ in u._yield_post_processors())),
+        len(sequence)
+    )
+
+
+def outputs(sequence) -> Dict[str, float]:
+    """Collects the outputs to compute sensitivities of from a solved pass sequence."""
+    out_profile = sequence.out_profile
+
+    return dict(
+        out_width=float(out_profile.width),
+        out_height=float(out_profile.height),
+        out_cross_section_area=float(out_profile.cross_section.area),
+        out_temperature=float(out_profile.temperature),
+        **{f"{rp.label}.roll_force": float(rp.roll_force) for rp in sequence.roll_passes},
+    )
+
+
+def perturb(base, path: AttributePath, value: float, reuse: int):
+    """
+    Returns a copy of the in profile and sequence of BASE with the parameter at PATH set to VALUE.
+    BASE is a tuple of the unsolved in profile and sequence and the solved sequence.
+    The first REUSE units are replaced by copies of the solved units, which return their previous results on solution.
+    """
+    in_profile, sequence, solved = base
+    in_profile, sequence = copy.deepcopy((in_profile, sequence))
+
+    for i in range(reuse):
+        unit = copy.deepcopy(solved[i])
+        sequence.subunits[i] = unit
+        unit.parent = sequence
+        unit.solve = frozen_solve(unit)
+
+    set_parameter(sequence, path, value, in_profile)
+
+    return in_profile, sequence
+
+
+def _solve_perturbation(base, parameters: List[Parameter], perturbation: Perturbation) -> dict:
+    i, _, value, reuse = perturbation
+    start = timer()
+
+    try:
+        in_profile, sequence = perturb(base, parameters[i][0], value, reuse)
+        sequence.solve(in_profile)
+        return dict(status="ok", duration=timer() - start, outputs=outputs(sequence))
+    except Exception as e:
+        return dict(status="failed", duration=timer() - start, error=str(e))
+
+
+def _solve_perturbations(state: State, base, parameters: List[Parameter], perturbations: list, workers: int):
+    if workers == 1:
+        for p in perturbations:
+            yield p[:2], _solve_perturbation(base, parameters, p)
+        return
+
+    data = pickling.dumps(base)
+
+    with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_sensitivity_worker,
+            initargs=(state.config, state.plugins, data)
+    ) as executor:
+        futures = {executor.submit(_solve_base_perturbation, parameters, p): p[:2] for p in perturbations}
+        for f in as_completed(futures):
+            yield futures[f], f.result()
+
+
+def _init_sensitivity_worker(config: dict, plugins: List[str], data: bytes):
+    global _base
+    init_worker(config, plugins)
+    _base = pickling.loads(data)
+
+
+def _solve_base_perturbation(parameters: List[Parameter], perturbation: Perturbation) -> dict:
+    return _solve_perturbation(_base, parameters, perturbation)
+
+
+def _results_table(sensitivities: Dict[str, Dict[str, float]], normalized: bool) -> Table:
+    table = Table(title="Normalized Sensitivities" if normalized else "Sensitivities")
+    table.add_column("Parameter")
+    columns = next(iter(sensitivities.values()), {}).keys()
+    for c in columns:
+        table.add_column(c, justify="right")
+
+    for name, row in sensitivities.items():
+        table.add_row(name, *[f"{row[c]:.4g}" for c in columns])
+
+    return table
@@ -0,0 +1,142 @@
+import importlib
+import io
+import json
+import logging
+import os
+import socketserver
+import sys
+import traceback
+from pathlib import Path
+
+import click as click
+
+from .main import main, stop_queued_logging
+from .state import State
+from ..config import DEFAULT_SOCKET_FILE
+from ..rich import console
+
+
+class _SocketWriter(io.TextIOBase):
+    """Text stream sending everything written as JSON frames of given stream name to a socket file."""
+
+    def __init__(self, wfile, stream: str):
+        self._wfile = wfile
+        self._stream = stream
+
+    @property
+    def encoding(self):
+        return "utf-8"
+
+    def writable(self):
+        return True
+
+    def write(self, s: str) -> int:
+        if s:
+            _send(self._wfile, type="output", stream=self._stream, text=s)
+        return len(s)
+
+
+def _send(wfile, **message):
+    wfile.write((json.dumps(message) + "\n").encode("utf-8"))
+    wfile.flush()
+
+
+class _Server(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    base_state: State = None
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """
+    Handles a request in a forked child of the server process.
+    Expects a JSON line with the command chain 'args', the working directory 'cwd' and optionally the console 'width'.
+    Streams output as JSON lines of type 'output' and finally one of type 'exit' with the exit code.
+    """
+
+    def handle(self):
+        request = json.loads(self.rfile.readline())
+        base_state: State = self.server.base_state
+
+        stdout = _SocketWriter(self.wfile, "stdout")
+        stderr = _SocketWriter(self.wfile, "stderr")
+        sys.stdout, sys.stderr = stdout, stderr
+        console.file = stdout
+        if request.get("width"):
+            console.width = request["width"]
+
+        for logger in [logging.getLogger(), *logging.getLogger().manager.loggerDict.values()]:
+            for h in getattr(logger, "handlers", []):
+                if isinstance(h, logging.StreamHandler) and h.stream in [sys.__stdout__, sys.__stderr__]:
+                    h.setStream(stderr if h.stream is sys.__stderr__ else stdout)
+
+        state = State(
+            config=base_state.config,
+            plugins=list(base_state.plugins),
+            logger=base_state.logger,
+        )
+
+        base_state.logger.debug("Serving request: %s", request)
+
+        try:
+            os.chdir(request.get("cwd", "."))
+            main.main(request["args"], prog_name="pyroll", obj=state, standalone_mode=False)
+            code = 0
+        except click.ClickException as e:
+            e.show(stderr)
+            code = e.exit_code
+        except click.exceptions.Exit as e:
+            code = e.exit_code
+        except click.Abort:
+            stderr.write("Aborted!\n")
+            code = 1
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else 1
+        except Exception:
+            stderr.write(traceback.format_exc())
+            code = 1
+
+        _send(self.wfile, type="exit", code=code)
+
+
+@click.command()
+@click.option(
+    "-s", "--socket", "socket_file",
+    help="Unix domain socket file to listen on.",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=DEFAULT_SOCKET_FILE, show_default=True
+)
+@click.option(
+    "-j", "--workers",
+    help="Maximum count of requests to process concurrently.",
+    type=click.IntRange(min=1), default=os.cpu_count(), show_default=True
+)
+@click.pass_context
+def serve(ctx: click.Context, socket_file: Path, workers: int):
+    """
+    Runs a daemon executing command chains sent by clients (see the pyroll-client script) over a Unix domain socket.
+    Config, logging and plugins are loaded once at startup, each request is processed in a forked worker process
+    with its own state, so global options given in requests take no effect.
+    """
+    state: State = ctx.obj
+
+    # requests are processed in forked children, which do not inherit the listener threads of queued logging
+    stop_queued_logging()
+
+    # warm up everything requests may need
+    importlib.import_module("pyroll.core")
+    for n in main.list_commands(ctx):
+        main.get_command(ctx, n)
+
+    socket_file.parent.mkdir(parents=True, exist_ok=True)
+    socket_file.unlink(missing_ok=True)
+
+    with _Server(str(socket_file), _RequestHandler) as server:
+        server.base_state = state
+        server.max_children = workers
+        state.logger.info("Serving on: %s", socket_file.absolute())
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            state.logger.info("Stopped serving.")
+        finally:
+            socket_file.unlink(missing_ok=True)
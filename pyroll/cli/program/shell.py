@@ -1,6 +1,8 @@
 from pathlib import Path
+from typing import Optional
 
 import click as click
+from rich.table import Table
 
 from .main import main
 from .state import State
@@ -56,6 +58,55 @@ def shell(ctx, history_file):
 def reset(state: State, yes):
     """Reset the state of the simulation data."""
     if yes or click.confirm("Reset simulation state?"):
-        state.logger.info("Reset simulation state.")
+        state.logger.info("Reset simulation state of session '%s'.", state.session)
         state.in_profile = None
         state.sequence = None
+        state.input_hash = None
+        state.input_fingerprints = None
+        state.previous_solution = None
+        state.solution_history = []
+        state.summary = None
+
+
+@click.command()
+@click.argument("name", required=False)
+@click.option(
+    "-d", "--delete",
+    help="Delete the session NAME instead of switching to it.",
+    is_flag=True
+)
+@click.pass_obj
+def session(state: State, name: Optional[str], delete: bool):
+    """
+    Switches to the session NAME, creating it if not existing, or lists the sessions if NAME is not given.
+    Each session has its own loaded input and solution, the config and plugins are shared.
+    """
+    if name is None:
+        table = Table(title="Sessions")
+        table.add_column("Name")
+        table.add_column("Active")
+        table.add_column("Units", justify="right")
+        table.add_column("Solved")
+
+        for n in sorted([state.session, *state.sessions]):
+            s = state.session_state(n)
+            table.add_row(
+                n, "*" if n == state.session else "",
+                str(len(s.sequence)) if s.sequence is not None else "-",
+                "yes" if s.sequence is not None and s.sequence.in_profile is not None else "no",
+            )
+
+        console.print(table)
+        return
+
+    if delete:
+        if name == state.session:
+            raise click.BadParameter("Cannot delete the active session.", param_hint="'NAME'")
+        if state.sessions.pop(name, None) is None:
+            raise click.BadParameter(f"Unknown session '{name}'.", param_hint="'NAME'")
+        state.logger.info("Deleted session '%s'.", name)
+        return
+
+    created = name != state.session and name not in state.sessions
+    state.switch_session(name)
+    state.logger.info("%s session '%s'.", "Created and switched to" if created else "Switched to", name)
@@ -0,0 +1,121 @@
+import gzip
+import os
+import pickle
+import sys
+from pathlib import Path
+
+import click as click
+
+from .main import installed_pyroll_versions, load_plugins, apply_config_constants
+from .state import State
+from .. import pickling
+from ..config import DEFAULT_STATE_FILE
+
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_FIELDS = ["in_profile", "sequence", "config", "plugins", "input_hash", "input_fingerprints", "summary"]
+
+
+def save_snapshot(state: State, file: Path, compression_level: int = 6):
+    """
+    Saves the input, solution results and effective config of STATE to FILE as gzip compressed pickle.
+    The file is written atomically, so an existing snapshot is never left half overwritten.
+    Raises the error of pickling if the state cannot be pickled, f.e. as it holds lambda functions.
+    """
+    snapshot = dict(
+        format=SNAPSHOT_FORMAT,
+        versions=installed_pyroll_versions(),
+        **{f: getattr(state, f) for f in SNAPSHOT_FIELDS}
+    )
+
+    tmp = file.with_name(f"{file.name}.{os.getpid()}.tmp")
+    try:
+        with gzip.open(tmp, "wb", compresslevel=compression_level) as f:
+            pickling.dump(snapshot, f)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    os.replace(tmp, file)
+
+
+def load_snapshot(file: Path) -> dict:
+    """Loads a snapshot saved by :py:func:`save_snapshot` from FILE, decompressing while unpickling."""
+    with gzip.open(file, "rb") as f:
+        snapshot = pickling.load(f)
+
+    if not isinstance(snapshot, dict) or snapshot.get("format") != SNAPSHOT_FORMAT:
+        raise ValueError(f"File {file} is not a state snapshot of a supported format.")
+
+    return snapshot
+
+
+@click.command()
+@click.option(
+    "-f", "--file",
+    help="File to write to.",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=DEFAULT_STATE_FILE, show_default=True
+)
+@click.option(
+    "-l", "--compression-level",
+    help="Compression level of gzip, higher levels give smaller files but take longer.",
+    type=click.IntRange(min=0, max=9), default=6, show_default=True
+)
+@click.pass_obj
+def save_state(state: State, file: Path, compression_level: int):
+    """
+    Saves the simulation state (loaded in profile and pass sequence with their solution results
+    and the effective config) to a compressed snapshot FILE, which can be restored by the load-state command.
+    """
+    if state.sequence is None and state.summary is None:
+        state.logger.critical("No pass sequence loaded. Use a command like 'input-py' to load a pass sequence.")
+        sys.exit(1)
+
+    try:
+        save_snapshot(state, file, compression_level)
+    except (pickle.PicklingError, TypeError, AttributeError) as e:
+        state.logger.critical("Could not save state snapshot, as the state cannot be pickled: %s", e)
+        sys.exit(1)
+
+    state.logger.info("Saved state snapshot to: %s", file.absolute())
+
+
+@click.command()
+@click.option(
+    "-f", "--file",
+    help="File to load from.",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=DEFAULT_STATE_FILE, show_default=True
+)
+@click.pass_obj
+def load_state(state: State, file: Path):
+    """
+    Restores the simulation state from a snapshot FILE saved by the save-state command.
+    Plugins loaded when saving are loaded if not already and the config constants of the snapshot are applied.
+    """
+    state.logger.info("Reading state snapshot from: %s", file.absolute())
+
+    try:
+        snapshot = load_snapshot(file)
+    except Exception as e:
+        state.logger.exception("Error during reading of state snapshot.", exc_info=e)
+        raise
+
+    if snapshot["versions"] != installed_pyroll_versions():
+        state.logger.warning(
+            "The snapshot was saved with other versions of PyRolL packages, results may not be reproducible: %s",
+            ", ".join(snapshot["versions"])
+        )
+
+    missing_plugins = [p for p in snapshot["plugins"] if p not in state.plugins]
+    load_plugins(missing_plugins, state.logger)
+    state.plugins = state.plugins + missing_plugins
+
+    for f in SNAPSHOT_FIELDS:
+        if f != "plugins":
+            setattr(state, f, snapshot[f])
+    state.previous_solution = None
+    state.solution_history = []
+
+    apply_config_constants(state.config)
+
+    state.logger.info("Finished reading state snapshot.")
@@ -1,26 +1,257 @@
+import contextlib
 import sys
+from pathlib import Path
+from typing import Optional
 
 import click as click
 
+from .cache import SolutionCache
+from .deadline import DeadlineGuard, SolveTimeoutError, find_timeout, report_table
+from .incremental import reuse_previous_solution
+from .memo import HookMemo, hook_memo
+from .progress import SolveMonitor, JsonlEventWriter, ProgressDisplay
+from .retention import apply_retention
+from .profiler import SolveProfiler, DEFAULT_PROFILE_FILE, PSTATS_SUFFIXES
 from .state import State
-from ..rich import console
+from .warmstart import warm_start, IterationCounter
+from ..rich import console, console_to_stderr
 
 
 @click.command()
+@click.option(
+    "--cache/--no-cache",
+    help="Whether to restore the solution from the solution cache if available and to store it after solving. "
+         "Defaults to the 'enabled' value of the 'cache' config table.",
+    default=None
+)
+@click.option(
+    "--profile",
+    help="Profile the solution process per unit and per hook function and print the results. "
+         "Saves the results to the given file as JSON or, with '.pstats' or '.prof' suffix, as cProfile stats.",
+    type=click.Path(dir_okay=False, path_type=Path),
+    is_flag=False, flag_value=DEFAULT_PROFILE_FILE, default=None
+)
+@click.option(
+    "-i/-ni", "--incremental/--no-incremental",
+    help="Reuse the solution of the leading units that are unchanged since the previously solved input "
+         "and only solve from the first changed unit on. If the input script defines hook functions, "
+         "any change of it causes a full solution, hook functions of other modules are not checked for changes.",
+    default=False
+)
+@click.option(
+    "--events",
+    help="Write structured events of the solution process (start and finish of the solution and of each unit "
+         "and each iteration) in the given format to the file given by --events-file.",
+    type=click.Choice(["jsonl"]), default=None
+)
+@click.option(
+    "--events-file",
+    help="File to write events to. If '-', events are written to stdout and console output is moved to stderr.",
+    type=click.Path(dir_okay=False, allow_dash=True, path_type=str),
+    default="-", show_default=True
+)
+@click.option(
+    "--in-profiles", "in_profiles_file",
+    help="TOML or JSON file defining a list of in profiles to solve the loaded pass sequence for "
+         "instead of the loaded in profile. The solutions run in parallel and their results are shown in a table, "
+         "the loaded pass sequence is left unsolved.",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path), default=None
+)
+@click.option(
+    "-j", "--workers",
+    help="Count of worker processes to use with --in-profiles. Defaults to the count of CPUs.",
+    type=click.IntRange(min=1), default=None
+)
+@click.option(
+    "--timeout",
+    help="Total time budget of the solution in seconds, 0 for none. The solution is aborted if exceeded. "
+         "Defaults to the 'timeout' value of the 'solve' config table, "
+         "where also time budgets per unit can be given by 'unit_timeout' and the 'unit_timeouts' table.",
+    type=click.FloatRange(min=0), default=None
+)
+@click.option(
+    "--warm-start/--cold-start", "warm",
+    help="Whether to seed the solution of each unit with the converged values of the corresponding unit "
+         "of the previously solved input, if any. "
+         "Defaults to the 'warm_start' value of the 'solve' config table, which defaults to true.",
+    default=None
+)
+@click.option(
+    "--background",
+    help="Solve in a worker process and return at once, so that other commands can be used meanwhile in the shell. "
+         "See the 'jobs', 'wait' and 'cancel' commands. The solution is applied to the session when the job is "
+         "collected by one of these or any later command, if the session input is unchanged.",
+    is_flag=True
+)
 @click.pass_obj
-def solve(state: State):
+def solve(
+        state: State, cache: bool, profile: Path, incremental: bool, events: str, events_file: str,
+        in_profiles_file: Path, workers: int, timeout: float, warm: bool, background: bool
+):
     """Runs the solution procedure on all loaded roll passes."""
     if state.sequence is None:
         state.logger.critical("No pass sequence loaded. Use a command like 'input-py' to load a pass sequence.")
         sys.exit(1)
+
+    if in_profiles_file:
+        if cache or profile or incremental or events or timeout or background:
+            raise click.UsageError(
+                "The --in-profiles option cannot be combined with --cache, --profile, --incremental, --events, "
+                "--timeout or --background."
+            )
+        _solve_in_profiles(state, in_profiles_file, workers)
+        return
+
     if state.in_profile is None:
         state.logger.critical("No pass sequence loaded. Use a command like 'input-py' to load a pass sequence.")
         sys.exit(1)
 
-    with console.status("[bold green]Running solution process..."):
-        try:
+    if background:
+        if cache or profile or incremental or events or timeout:
+            raise click.UsageError(
+                "The --background option cannot be combined with --cache, --profile, --incremental, --events "
+                "or --timeout."
+            )
+        from .jobs import start_job
+
+        job = start_job(state)
+        state.logger.info("Started background job %d solving the pass sequence of session '%s'.", job.id, job.session)
+        return
+
+    if cache is None:
+        cache = state.config.get("cache", {}).get("enabled", False)
+
+    solution_cache = SolutionCache.from_config(state.config, state.logger) if cache else None
+    cache_key = solution_cache.key(state) if solution_cache else None
+
+    if solution_cache and not cache_key:
+        state.logger.warning("The loaded input has no known source, solution cache is not used.")
+
+    if cache_key:
+        cached = solution_cache.get(cache_key)
+        if cached:
+            state.in_profile, state.sequence = cached
+            state.logger.info("Restored solution from cache entry %s.", cache_key)
+            apply_retention(state)
+            return
+
+    if warm is None:
+        warm = state.config.get("solve", {}).get("warm_start", True)
+
+    profiler = SolveProfiler(cprofile=profile.suffix in PSTATS_SUFFIXES) if profile else None
+    memo = hook_memo(state.config, state.plugins) if HookMemo.enabled(state.config) else None
+
+    try:
+        with contextlib.ExitStack() as stack:
+            listeners = []
+            if events:
+                if events_file == "-":
+                    stack.enter_context(console_to_stderr())
+                listeners.append(JsonlEventWriter(stack.enter_context(click.open_file(events_file, "w"))))
+
+            listeners.append(stack.enter_context(ProgressDisplay(len(state.sequence))))
+
+            guard = DeadlineGuard.from_config(state.sequence, state.config, timeout)
+            if guard.enabled:
+                listeners.append(guard)
+
+            counter = IterationCounter()
+            listeners.append(counter)
+
+            if profiler:
+                stack.enter_context(profiler)
+
+            if memo:
+                stack.enter_context(memo)
+
+            seeded, previous_iterations = stack.enter_context(
+                warm_start(state) if warm else contextlib.nullcontext((0, None))
+            )
+
+            reused = stack.enter_context(
+                reuse_previous_solution(state) if incremental else contextlib.nullcontext(0)
+            )
+            if reused:
+                state.logger.info("Reusing the previous solution of %d unchanged leading units.", reused)
+
             state.logger.info("Starting solution process...")
-            state.sequence.solve(state.in_profile)
+            with SolveMonitor(state.sequence, listeners):
+                state.sequence.solve(state.in_profile)
             state.logger.info("Finished solution process.")
-        except RuntimeError as e:
-            state.logger.exception("Solution process failed with error:", exc_info=e)
+
+            # units replaced by reused ones were not solved, so their seeds were not used
+            if seeded > reused:
+                _report_warm_start(
+                    state, seeded - reused, len(state.sequence) - reused, counter.count,
+                    None if reused else previous_iterations
+                )
+    except (RuntimeError, SolveTimeoutError) as e:
+        timeout_error = find_timeout(e)
+        if timeout_error:
+            state.logger.error("Solution process aborted: %s", timeout_error)
+            console.print(report_table(timeout_error.report))
+            sys.exit(1)
+
+        state.logger.exception("Solution process failed with error:", exc_info=e)
+        return
+    finally:
+        if profiler:
+            _report_profile(state, profiler, profile)
+        if memo:
+            console.print(memo.stats_table())
+
+    if cache_key:
+        if solution_cache.put(cache_key, (state.in_profile, state.sequence)):
+            state.logger.info("Stored solution in cache entry %s.", cache_key)
+
+    apply_retention(state)
+
+
+def _solve_in_profiles(state: State, file: Path, workers: int):
+    from .in_profiles import load_in_profiles, solve_in_profiles, results_table
+    from .input import InputDocumentError
+
+    try:
+        in_profiles = load_in_profiles(file)
+    except (InputDocumentError, ValueError) as e:
+        raise click.BadParameter(str(e), param_hint="'--in-profiles'") from e
+
+    if state.sequence.in_profile is not None:
+        state.logger.warning("The loaded pass sequence was already solved, solutions start from its results.")
+
+    state.logger.info("Solving the pass sequence for %d in profiles.", len(in_profiles))
+    results = [None] * len(in_profiles)
+
+    with console.status("[bold green]Solving for in profiles...") as status:
+        for i, result in solve_in_profiles(state, [p for _, p in in_profiles], workers):
+            name, p = in_profiles[i]
+            results[i] = {**dict(index=i, name=name, in_width=float(p.width), in_height=float(p.height)), **result}
+            status.update(f"[bold green]Solved {sum(r is not None for r in results)}/{len(results)} in profiles...")
+
+    failed = [r for r in results if r["status"] != "ok"]
+    for r in failed:
+        state.logger.error("Solution for in profile %s failed with error: %s", r["name"], r["error"])
+
+    state.logger.info("Finished %d in profiles, %d failed.", len(results), len(failed))
+    console.print(results_table(results))
+
+
+def _report_warm_start(
+        state: State, seeded: int, solved: int, iterations: int, previous_iterations: Optional[int]
+):
+    state.logger.info(
+        "Warm-started %d of %d solved units from the previous solution, solution took %d iterations.",
+        seeded, solved, iterations
+    )
+
+    if previous_iterations is not None:
+        state.logger.info(
+            "Saved %d iterations compared to the %d iterations of the previous solution.",
+            previous_iterations - iterations, previous_iterations
+        )
+
+
+def _report_profile(state: State, profiler: SolveProfiler, file: Path):
+    console.print(profiler.tables())
+    profiler.save(file)
+    state.logger.info("Saved profiling results to: %s", file.absolute())
@@ -0,0 +1,113 @@
+import inspect
+from typing import Callable, Iterable, Tuple
+
+AttributePath = Tuple[str, ...]
+"""
+Path of an attribute as given in spec files: ``in_profile`` or ``units`` and a unit label followed by attribute names,
+or attribute names starting at the pass sequence.
+"""
+
+GROOVE_ALTERNATIVE_PARAMETERS = ["depth", "ground_width", "flank_angle", "usable_width"]
+"""Groove parameters defining the same geometry interchangeably, in order of preference when recreating grooves."""
+
+
+def gen_leaves(
+        table: dict, path: AttributePath, is_leaf: Callable[[dict], bool]
+) -> Iterable[Tuple[AttributePath, object]]:
+    """
+    Yields the attribute paths and values of the leaves of the nested TABLE, prefixing the paths with PATH.
+    Nested tables are descended into, unless IS_LEAF returns true for them.
+    """
+    for key, value in table.items():
+        if isinstance(value, dict) and not is_leaf(value):
+            yield from gen_leaves(value, path + (key,), is_leaf)
+        else:
+            yield path + (key,), value
+
+
+def gen_spec_leaves(spec: dict, is_leaf: Callable[[dict], bool], kind: str) -> Iterable[Tuple[AttributePath, object]]:
+    """
+    Yields the attribute paths and values of the leaves of the ``in_profile`` and ``units`` tables of SPEC
+    as described in :py:func:`gen_leaves`.
+    Raises ValueError on other tables, naming the spec KIND in the message.
+    """
+    for key, table in spec.items():
+        if key == "in_profile":
+            yield from gen_leaves(table, ("in_profile",), is_leaf)
+        elif key == "units":
+            for label, unit_table in table.items():
+                yield from gen_leaves(unit_table, ("units", label), is_leaf)
+        else:
+            raise ValueError(f"Unknown table '{key}' in {kind} spec, expected 'in_profile' or 'units'.")
+
+
+def resolve_parent(sequence, path: AttributePath, in_profile=None):
+    """
+    Returns the object holding the attribute at PATH in SEQUENCE or IN_PROFILE.
+    Paths starting with ``in_profile`` refer to the in profile of SEQUENCE if IN_PROFILE is not given.
+    """
+    if path[0] == "in_profile" and in_profile is not None:
+        obj, attrs = in_profile, path[1:]
+    elif path[0] == "units":
+        obj, attrs = sequence[path[1]], path[2:]
+    else:
+        obj, attrs = sequence, path
+
+    for a in attrs[:-1]:
+        obj = getattr(obj, a)
+
+    return obj
+
+
+def first_affected_unit(sequence, path: AttributePath) -> int:
+    """Returns the index of the top-level unit of SEQUENCE which is the first affected by the parameter at PATH."""
+    if path[0] == "in_profile":
+        return 0
+
+    unit = sequence[path[1]]
+    while unit.parent is not None and unit.parent is not sequence:
+        unit = unit.parent
+
+    return next(i for i, u in enumerate(sequence) if u is unit)
+
+
+def path_name(path: AttributePath) -> str:
+    """Returns the dotted name of PATH used in tables and result files, omitting the ``units`` prefix."""
+    if path[0] == "units":
+        return ".".join(path[1:])
+    return ".".join(path)
+
+
+def set_parameter(sequence, path: AttributePath, value: float, in_profile=None):
+    """
+    Sets the parameter at PATH in SEQUENCE or IN_PROFILE to VALUE.
+    Grooves are immutable, so groove parameters are set by recreating the groove from its required parameters,
+    the changed one and as few of :py:data:`GROOVE_ALTERNATIVE_PARAMETERS` as needed.
+    """
+    from pyroll.core import GrooveBase
+
+    obj = resolve_parent(sequence, path, in_profile)
+
+    if not isinstance(obj, GrooveBase):
+        setattr(obj, path[-1], value)
+        return
+
+    signature = inspect.signature(type(obj).__init__)
+    kwargs = {
+        n: getattr(obj, n) for n, p in signature.parameters.items()
+        if p.default is inspect.Parameter.empty and p.kind == inspect.Parameter.POSITIONAL_OR_KEYWORD and n != "self"
+    }
+    kwargs[path[-1]] = value
+    alternatives = [n for n in GROOVE_ALTERNATIVE_PARAMETERS if n in signature.parameters and n != path[-1]]
+
+    while True:
+        try:
+            groove = type(obj)(**kwargs)
+            break
+        except (TypeError, ValueError):
+            if not alternatives:
+                raise
+            n = alternatives.pop(0)
+            kwargs[n] = getattr(obj, n)
+
+    setattr(resolve_parent(sequence, path[:-1], in_profile), path[-2], groove)
@@ -1,11 +1,91 @@
+import hashlib
 import logging
 from dataclasses import dataclass, field
-from pyroll.core import Profile, PassSequence
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pyroll.core import Profile, PassSequence
+    from .jobs import BackgroundJob
+
+SESSION_FIELDS = [
+    "sequence", "in_profile", "input_hash", "input_fingerprints", "previous_solution", "solution_history", "summary"
+]
+"""Fields of :py:class:`State` specific to a session, the others are shared by all sessions."""
 
 
 @dataclass
 class State:
-    sequence: PassSequence = field(default_factory=lambda: None)
-    in_profile: Profile = field(default_factory=lambda: None)
+    sequence: "PassSequence" = field(default_factory=lambda: None)
+    in_profile: "Profile" = field(default_factory=lambda: None)
     config: dict = field(default_factory=dict)
     logger: logging.Logger = field(default_factory=lambda: None)
+    plugins: List[str] = field(default_factory=list)
+    input_hash: Optional[str] = field(default_factory=lambda: None)
+    input_fingerprints: Optional[List[Optional[str]]] = field(default_factory=lambda: None)
+    previous_solution: Optional[Tuple[List[Optional[str]], "PassSequence"]] = field(default_factory=lambda: None)
+    solution_history: List[Tuple[List[Optional[str]], "PassSequence"]] = field(default_factory=list)
+    summary: Optional[dict] = field(default_factory=lambda: None)
+    session: str = "default"
+    sessions: Dict[str, "State"] = field(default_factory=dict)
+    jobs: List["BackgroundJob"] = field(default_factory=list)
+
+    def load(
+            self, in_profile: "Profile", sequence: "PassSequence", input_hash: Optional[str] = None,
+            hooks_hash: Optional[str] = None
+    ):
+        """
+        Sets a newly loaded input.
+        Keeps the current pass sequence as previous solution if it was solved, to allow incremental solution.
+        Older previous solutions are moved to ``solution_history``, so that in total the last ``keep_last``
+        solutions are kept as configured in the ``retention`` config table.
+        HOOKS_HASH identifies hook functions defined along with the input, which the fingerprints of the units
+        do not cover. It is included in all fingerprints, so that no unit is considered unchanged if it differs.
+        """
+        from ..pickling import fingerprint
+        from .retention import retention_config
+
+        keep_last = retention_config(self.config)["keep_last"]
+
+        if self.sequence is not None and self.sequence.in_profile is not None and self.input_fingerprints:
+            if self.previous_solution:
+                self.solution_history.append(self.previous_solution)
+            self.previous_solution = (self.input_fingerprints, self.sequence)
+
+        if keep_last < 1:
+            self.previous_solution = None
+        del self.solution_history[:max(0, len(self.solution_history) - max(0, keep_last - 1))]
+
+        self.in_profile = in_profile
+        self.sequence = sequence
+        self.input_hash = input_hash
+        self.summary = None
+        self.input_fingerprints = [fingerprint(in_profile)] + [fingerprint(u) for u in sequence]
+
+        if hooks_hash:
+            self.input_fingerprints = [
+                hashlib.sha256(f"{hooks_hash}:{fp}".encode()).hexdigest() if fp else None
+                for fp in self.input_fingerprints
+            ]
+
+    def session_state(self, name: str) -> Optional["State"]:
+        """Returns the state of the session NAME (this instance for the active session) or None if not existing."""
+        return self if name == self.session else self.sessions.get(name)
+
+    def switch_session(self, name: str):
+        """
+        Makes NAME the active session, creating it empty if not existing.
+        The session specific fields of the previously active session are kept in ``sessions``
+        as a state sharing the config, logger and plugins.
+        """
+        if name == self.session:
+            return
+
+        shared = dict(config=self.config, logger=self.logger, plugins=self.plugins)
+        self.sessions[self.session] = State(
+            **{f: getattr(self, f) for f in SESSION_FIELDS}, **shared, session=self.session
+        )
+        target = self.sessions.pop(name, None) or State(**shared, session=name)
+
+        for f in SESSION_FIELDS:
+            setattr(self, f, getattr(target, f))
+        self.session = name
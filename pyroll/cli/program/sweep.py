@@ -0,0 +1,183 @@
+import copy
+import itertools
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import click as click
+import numpy as np
+import tomli
+from rich.table import Table
+
+from .spec import AttributePath, gen_spec_leaves, path_name, resolve_parent
+from .state import State
+from .worker import init_worker, solve_and_summarize
+from .. import pickling
+from ..config import DEFAULT_SWEEP_FILE
+from ..rich import console
+
+Variant = Dict[AttributePath, object]
+
+_base = None
+
+
+@click.command()
+@click.option(
+    "-s", "--spec",
+    help="TOML file defining the parameter sweep.",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=DEFAULT_SWEEP_FILE, show_default=True
+)
+@click.option(
+    "-j", "--workers",
+    help="Count of worker processes to use. Defaults to the count of CPUs.",
+    type=click.IntRange(min=1), default=None
+)
+@click.option(
+    "-o", "--output",
+    help="JSON lines file to write the results of all variants to.",
+    type=click.Path(dir_okay=False, path_type=Path), default=None
+)
+@click.pass_obj
+def solve_sweep(state: State, spec: Path, workers: int, output: Path):
+    """
+    Solves variants of the loaded pass sequence as defined by the sweep spec in the TOML file SPEC.
+    The variants are solved in parallel using a pool of worker processes.
+
+    The [in_profile] table and the [units."<label>"] tables (may be nested, f.e. [units."<label>".roll])
+    give the values of attributes to vary as list or as range table {start, stop, num} or {start, stop, step}.
+    The top-level key 'mode' selects how to combine the values: 'product' (default) or 'zip'.
+    """
+    if state.sequence is None or state.in_profile is None:
+        state.logger.critical("No pass sequence loaded. Use a command like 'input-py' to load a pass sequence.")
+        sys.exit(1)
+
+    if state.sequence.in_profile is not None:
+        state.logger.warning("The loaded pass sequence was already solved, variants start from its results.")
+
+    try:
+        axes, variants = parse_sweep_spec(tomli.loads(spec.read_text()))
+        for path in axes:
+            resolve_parent(state.sequence, path, state.in_profile)
+    except (ValueError, KeyError, AttributeError) as e:
+        raise click.BadParameter(str(e), param_hint="'-s' / '--spec'") from e
+
+    state.logger.info("Solving %d variants of %d swept parameters.", len(variants), len(axes))
+    results = [None] * len(variants)
+
+    with console.status("[bold green]Solving variants...") as status:
+        for i, result in _solve_variants(state, variants, workers):
+            results[i] = dict(index=i, **{path_name(p): v for p, v in variants[i].items()}, **result)
+            status.update(f"[bold green]Solved {sum(r is not None for r in results)}/{len(variants)} variants...")
+
+    failed = [r for r in results if r["status"] != "ok"]
+    for r in failed:
+        state.logger.error("Solution of variant %d failed with error: %s", r["index"], r["error"])
+
+    state.logger.info("Finished %d variants, %d failed.", len(results), len(failed))
+    console.print(_results_table(axes, results))
+
+    if output:
+        output.write_text("".join(json.dumps(r) + "\n" for r in results), encoding="utf-8")
+        state.logger.info("Wrote sweep results to: %s", output.absolute())
+
+
+def parse_sweep_spec(spec: dict) -> Tuple[List[AttributePath], List[Variant]]:
+    """Parses a sweep spec dict into the list of swept attribute paths and the list of variants."""
+    spec = dict(spec)
+    mode = spec.pop("mode", "product")
+
+    values: Dict[AttributePath, list] = {
+        path: _expand(value) for path, value in gen_spec_leaves(spec, lambda v: "start" in v and "stop" in v, "sweep")
+    }
+
+    axes = list(values.keys())
+
+    if not axes:
+        raise ValueError("Sweep spec does not define any parameters to vary.")
+
+    if mode == "product":
+        combinations = itertools.product(*values.values())
+    elif mode == "zip":
+        if len({len(v) for v in values.values()}) > 1:
+            raise ValueError("All value lists must have the same length in 'zip' mode.")
+        combinations = zip(*values.values())
+    else:
+        raise ValueError(f"Unknown sweep mode '{mode}', expected 'product' or 'zip'.")
+
+    return axes, [dict(zip(axes, c)) for c in combinations]
+
+
+def apply_variant(in_profile, sequence, variant: Variant):
+    """Sets the attribute values given by VARIANT on the in profile and the units of the sequence."""
+    for path, value in variant.items():
+        obj = resolve_parent(sequence, path, in_profile)
+        setattr(obj, path[-1], value)
+
+
+def _expand(value) -> list:
+    if isinstance(value, list):
+        return value
+    if isinstance(value, dict):
+        start, stop = value["start"], value["stop"]
+        if "num" in value:
+            return [float(v) for v in np.linspace(start, stop, value["num"])]
+        if "step" in value:
+            return [float(v) for v in np.arange(start, stop + value["step"] / 2, value["step"])]
+        raise ValueError("Range tables must define either 'num' or 'step'.")
+    return [value]
+
+
+def _solve_variants(state: State, variants: List[Variant], workers: int):
+    if workers == 1:
+        for i, v in enumerate(variants):
+            yield i, _solve_variant((state.in_profile, state.sequence), v)
+        return
+
+    data = pickling.dumps((state.in_profile, state.sequence))
+
+    with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_sweep_worker,
+            initargs=(state.config, state.plugins, data)
+    ) as executor:
+        futures = {executor.submit(_solve_base_variant, v): i for i, v in enumerate(variants)}
+        for f in as_completed(futures):
+            yield futures[f], f.result()
+
+
+def _init_sweep_worker(config: dict, plugins: List[str], data: bytes):
+    global _base
+    init_worker(config, plugins)
+    _base = pickling.loads(data)
+
+
+def _solve_base_variant(variant: Variant) -> dict:
+    return _solve_variant(_base, variant)
+
+
+def _solve_variant(base, variant: Variant) -> dict:
+    in_profile, sequence = copy.deepcopy(base)
+    apply_variant(in_profile, sequence, variant)
+    return solve_and_summarize(in_profile, sequence)
+
+
+def _results_table(axes: List[AttributePath], results: List[dict]) -> Table:
+    table = Table(title="Sweep Results")
+    table.add_column("#", justify="right")
+    for p in axes:
+        table.add_column(path_name(p), justify="right")
+    for c in ["status", "out_width", "out_height", "max_roll_force", "duration"]:
+        table.add_column(c, justify="right")
+
+    for r in results:
+        table.add_row(
+            str(r["index"]),
+            *[f"{r[path_name(p)]:.6g}" if isinstance(r[path_name(p)], float) else str(r[path_name(p)]) for p in axes],
+            r["status"],
+            *[f"{r[c]:.6g}" if c in r else "-" for c in ["out_width", "out_height", "max_roll_force", "duration"]],
+        )
+
+    return table
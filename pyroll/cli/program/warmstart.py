@@ -0,0 +1,142 @@
+import contextlib
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .state import State
+
+
+def root_hook_names(host) -> List[str]:
+    """Returns the names of the root hooks applicable to the hook host HOST."""
+    from pyroll.core import root_hooks
+
+    return [h.name for h in root_hooks if isinstance(host, h.owner)]
+
+
+def _seed_values(host, previous_host, template=None):
+    """
+    Sets the values of root hooks of PREVIOUS_HOST explicitly on HOST, unless HOST has an explicit value itself.
+    Values of HOST that were just copied from TEMPLATE are not considered explicit.
+    """
+    if host is None or previous_host is None:
+        return
+
+    copied = template.__dict__ if template is not None else {}
+
+    for name in root_hook_names(host):
+        explicit = name in host.__dict__ and host.__dict__[name] is not copied.get(name, copied)
+        if not explicit and name in previous_host.__dict__:
+            host.__dict__[name] = previous_host.__dict__[name]
+
+
+def _pairs(units, previous_units) -> List[Tuple[object, object]]:
+    """
+    Pairs units with the previous units they correspond to.
+    Units are paired by position if both lists have equal length and the labels and types agree at all positions,
+    else by unique labels, so that an unrelated sequence of equal length is not paired.
+    Only units of equal type that were solved previously are paired.
+    """
+    if len(units) == len(previous_units) and all(
+            u.label == p.label and type(u) is type(p) for u, p in zip(units, previous_units)
+    ):
+        candidates = zip(units, previous_units)
+    else:
+        labels = [u.label for u in previous_units]
+        by_label = {u.label: u for u in previous_units if u.label and labels.count(u.label) == 1}
+        candidates = ((u, by_label.get(u.label)) for u in units)
+
+    return [
+        (u, p) for u, p in candidates
+        if p is not None and type(u) is type(p) and p.out_profile is not None
+    ]
+
+
+def _seed_unit(unit, previous, unchanged: bool, patched: list):
+    """
+    Patches the ``init_solve`` and ``get_root_hook_results`` methods of UNIT to seed the root hook values and
+    the convergence reference of the first iteration from the solved unit PREVIOUS.
+    Initial values set on the out profile by ``init_solve`` itself (f.e. the cross-section of roll passes)
+    are only replaced if the definition of the unit is UNCHANGED.
+    The subunits are seeded recursively once they are created.
+    """
+    init_solve = unit.init_solve
+    get_root_hook_results = unit.get_root_hook_results
+    previous_results = previous._old_results
+
+    def seeded_init_solve(in_profile):
+        del unit.init_solve
+        init_solve(in_profile)
+
+        _seed_values(unit, previous)
+        _seed_values(unit.out_profile, previous.out_profile, unit.out_profile if unchanged else unit.in_profile)
+        for name in ["roll", "engine"]:
+            _seed_values(getattr(unit, name, None), getattr(previous, name, None))
+
+        for u, p in _pairs(unit.subunits, previous.subunits):
+            _seed_unit(u, p, unchanged, patched)
+
+        if isinstance(previous_results, np.ndarray):
+            unit._old_results = previous_results
+
+    def seeded_get_root_hook_results():
+        del unit.get_root_hook_results
+        results = get_root_hook_results()
+
+        if np.shape(results) != np.shape(unit._old_results):
+            unit._old_results = np.nan
+
+        return results
+
+    unit.init_solve = seeded_init_solve
+    unit.get_root_hook_results = seeded_get_root_hook_results
+    patched.append(unit)
+
+
+def iteration_count(sequence) -> Optional[int]:
+    """Returns the total count of iterations of the top-level units in the last solution of SEQUENCE, if known."""
+    counts = [len(u.convergence_history) for u in sequence]
+    return sum(counts) if all(counts) else None
+
+
+@contextlib.contextmanager
+def warm_start(state: State):
+    """
+    Context manager seeding the solution of the units of the loaded sequence with the converged values of
+    the corresponding units of the previous solution, if any, while active.
+    The values of all root hooks (f.e. roll force, spread or temperature of the out profile, depending on
+    the loaded plugins) are used as initial guesses, and the previous results are used as reference for the
+    convergence check of the first iteration, so that a unit whose state is unchanged converges at once.
+    Units are paired as described in :py:func:`_pairs`.
+    Yields the count of seeded top-level units and the iteration count of the previous solution, if known.
+    """
+    if not state.previous_solution or state.sequence.in_profile is not None:
+        yield 0, None
+        return
+
+    previous_fingerprints, previous_sequence = state.previous_solution
+    fingerprints = {id(u): fp for u, fp in zip(state.sequence, (state.input_fingerprints or [None])[1:])}
+    previous_fingerprints = {id(u): fp for u, fp in zip(previous_sequence, previous_fingerprints[1:])}
+    pairs = _pairs(state.sequence, previous_sequence)
+    patched = []
+
+    for u, p in pairs:
+        fp = fingerprints.get(id(u))
+        _seed_unit(u, p, fp is not None and fp == previous_fingerprints.get(id(p)), patched)
+
+    try:
+        yield len(pairs), iteration_count(previous_sequence) if len(pairs) == len(state.sequence) else None
+    finally:
+        for u in patched:
+            u.__dict__.pop("init_solve", None)
+            u.__dict__.pop("get_root_hook_results", None)
+
+
+class IterationCounter:
+    """Event listener for :py:class:`SolveMonitor` counting the iterations of the top-level units."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, event: dict):
+        if event["event"] == "iteration":
+            self.count += 1
@@ -0,0 +1,51 @@
+import logging
+from timeit import default_timer as timer
+from typing import List
+
+from pyroll.core import Profile, PassSequence
+
+from .main import load_plugins, apply_config_constants, stop_queued_logging
+
+
+def init_worker(config: dict, plugins: List[str]):
+    """
+    Initializer for worker processes.
+    Loads the plugins and applies the config constants like ``main`` does for the parent process.
+    Queued logging inherited from the parent is replaced by direct handlers, as the listener threads are not forked.
+    Hook memoization is installed for the lifetime of the worker if enabled in the config.
+    """
+    from .memo import HookMemo, hook_memo
+
+    stop_queued_logging()
+    load_plugins(plugins, logging.getLogger("pyroll.cli"))
+    apply_config_constants(config)
+
+    if HookMemo.enabled(config):
+        hook_memo(config, plugins).install()
+
+
+def summarize(in_profile: Profile, sequence: PassSequence) -> dict:
+    """Collects the key results of a solved pass sequence in a flat dict of plain numbers."""
+    out_profile = sequence.out_profile
+    roll_forces = [float(rp.roll_force) for rp in sequence.roll_passes]
+
+    return dict(
+        in_width=float(in_profile.width),
+        in_height=float(in_profile.height),
+        out_width=float(out_profile.width),
+        out_height=float(out_profile.height),
+        out_cross_section_area=float(out_profile.cross_section.area),
+        out_temperature=float(out_profile.temperature),
+        out_strain=float(out_profile.strain),
+        max_roll_force=max(roll_forces, default=0.0),
+    )
+
+
+def solve_and_summarize(in_profile: Profile, sequence: PassSequence) -> dict:
+    """Solves the pass sequence and returns a result record with status, duration and summary of the results."""
+    start = timer()
+    try:
+        sequence.solve(in_profile)
+        return dict(status="ok", duration=timer() - start, **summarize(in_profile, sequence))
+    except Exception as e:
+        return dict(status="failed", duration=timer() - start, error=str(e))
@@ -0,0 +1,407 @@
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from timeit import default_timer as timer
+from typing import Optional, List, Tuple
+
+import click as click
+from rich.table import Table
+
+from .state import State
+from ..config import DEFAULT_QUEUE_FILE
+from ..rich import console
+
+JOB_KINDS = {
+    ".py": "input-py",
+    ".toml": "input-toml",
+    ".json": "input-json",
+    ".gz": "state",
+}
+"""Kinds of jobs by suffix of their input file."""
+
+JOB_STATUSES = ["pending", "running", "done", "failed"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    file TEXT NOT NULL,
+    config_key TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    created REAL NOT NULL,
+    finished REAL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, config_key, id);
+"""
+
+
+@dataclass
+class Job:
+    id: int
+    kind: str
+    file: str
+    attempts: int
+    max_attempts: int
+
+
+def config_key(state: State) -> str:
+    """
+    Computes the key of the config and plugins affecting solution results in STATE.
+    Workers only claim jobs enqueued with the same key, so jobs are solved with the config they were enqueued with.
+    """
+    key = json.dumps(dict(pyroll=state.config.get("pyroll", {}), plugins=sorted(state.plugins)), sort_keys=True)
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+class WorkQueue:
+    """
+    Job queue in a SQLite database file, which may reside on a shared file system to distribute jobs across hosts.
+    Workers claim jobs by taking a lease, which they have to renew while working on the job.
+    Jobs whose lease expired (f.e. because their worker died) are claimed again
+    until their maximum count of attempts is reached, failed jobs are retried likewise.
+    """
+
+    def __init__(self, file: Path, busy_timeout: float = 60):
+        self.file = file
+        """The database file."""
+
+        self.busy_timeout = busy_timeout
+        """Time in seconds to wait for locks held by other processes."""
+
+        db = self._connect()
+        try:
+            db.executescript(_SCHEMA)
+        finally:
+            db.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        # no WAL journal, as it does not work on network file systems
+        db = sqlite3.connect(self.file, timeout=self.busy_timeout, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        return db
+
+    @contextmanager
+    def _transaction(self):
+        db = self._connect()
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                yield db
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+        finally:
+            db.close()
+
+    def enqueue(self, files: List[Path], key: str, max_attempts: int = 3) -> List[int]:
+        """Adds jobs for the input FILES with the config KEY and returns their ids."""
+        now = time.time()
+        ids = []
+
+        with self._transaction() as db:
+            for f in files:
+                kind = JOB_KINDS.get(f.suffix)
+                if kind is None:
+                    raise ValueError(
+                        f"Unknown kind of input file '{f}', expected one of the suffixes {list(JOB_KINDS)}."
+                    )
+                cursor = db.execute(
+                    "INSERT INTO jobs (kind, file, config_key, max_attempts, created) VALUES (?, ?, ?, ?, ?)",
+                    (kind, str(f.absolute()), key, max_attempts, now)
+                )
+                ids.append(cursor.lastrowid)
+
+        return ids
+
+    def claim(self, owner: str, key: str, lease: float) -> Optional[Job]:
+        """
+        Claims the oldest pending job (or running job with expired lease) with the config KEY for OWNER
+        and leases it for LEASE seconds. Expired jobs without remaining attempts are marked as failed.
+        Returns None if there is no job to claim.
+        """
+        now = time.time()
+
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE jobs SET status = 'failed', finished = ?, error = 'Lease expired on last attempt.' "
+                "WHERE status = 'running' AND lease_expires < ? AND attempts >= max_attempts",
+                (now, now)
+            )
+            row = db.execute(
+                "SELECT * FROM jobs WHERE config_key = ? "
+                "AND (status = 'pending' OR (status = 'running' AND lease_expires < ?)) ORDER BY id LIMIT 1",
+                (key, now)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            db.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, lease_owner = ?, lease_expires = ? "
+                "WHERE id = ?",
+                (owner, now + lease, row["id"])
+            )
+
+        return Job(row["id"], row["kind"], row["file"], row["attempts"] + 1, row["max_attempts"])
+
+    def renew(self, job: Job, owner: str, lease: float) -> bool:
+        """Extends the lease of OWNER on JOB, returns False if the lease was lost to another worker."""
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE id = ? AND status = 'running' AND lease_owner = ?",
+                (time.time() + lease, job.id, owner)
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job: Job, owner: str, result: dict) -> bool:
+        """Marks JOB as done with RESULT, returns False if the lease was lost to another worker."""
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET status = 'done', finished = ?, result = ?, error = NULL, lease_expires = NULL "
+                "WHERE id = ? AND status = 'running' AND lease_owner = ?",
+                (time.time(), json.dumps(result), job.id, owner)
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, job: Job, owner: str, error: str) -> bool:
+        """
+        Records the failure of an attempt on JOB.
+        The job is pending again if it has attempts left, else failed.
+        Returns False if the lease was lost to another worker.
+        """
+        status = "pending" if job.attempts < job.max_attempts else "failed"
+
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET status = ?, finished = ?, error = ?, lease_owner = NULL, lease_expires = NULL "
+                "WHERE id = ? AND status = 'running' AND lease_owner = ?",
+                (status, time.time() if status == "failed" else None, error, job.id, owner)
+            )
+            return cursor.rowcount == 1
+
+    def release(self, job: Job, owner: str):
+        """Returns JOB to the queue without counting the attempt, f.e. if the worker is interrupted."""
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE jobs SET status = 'pending', attempts = attempts - 1, lease_owner = NULL, lease_expires = NULL "
+                "WHERE id = ? AND status = 'running' AND lease_owner = ?",
+                (job.id, owner)
+            )
+
+    def counts(self, key: Optional[str] = None) -> dict:
+        """Returns the count of jobs per status, optionally only of those with config KEY."""
+        db = self._connect()
+        try:
+            rows = db.execute(
+                "SELECT status, COUNT(*) FROM jobs WHERE ? IS NULL OR config_key = ? GROUP BY status", (key, key)
+            ).fetchall()
+        finally:
+            db.close()
+
+        return {s: 0 for s in JOB_STATUSES} | {r[0]: r[1] for r in rows}
+
+    def results(self) -> List[dict]:
+        """Returns id, file, status, attempts, result and error of all jobs."""
+        db = self._connect()
+        try:
+            rows = db.execute("SELECT id, file, status, attempts, result, error FROM jobs ORDER BY id").fetchall()
+        finally:
+            db.close()
+
+        return [dict(r, result=json.loads(r["result"]) if r["result"] else None) for r in rows]
+
+    @contextmanager
+    def keep_leased(self, job: Job, owner: str, lease: float):
+        """Context manager renewing the lease on JOB in a background thread while active."""
+        stop = threading.Event()
+
+        def _renew():
+            while not stop.wait(lease / 3):
+                if not self.renew(job, owner, lease):
+                    return
+
+        thread = threading.Thread(target=_renew, name=f"lease-{job.id}", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+
+def run_job(job: Job) -> dict:
+    """Loads the input of JOB, solves it and returns a result record with durations and summary."""
+    from .worker import solve_and_summarize
+
+    file = Path(job.file)
+    start = timer()
+
+    try:
+        if job.kind == "state":
+            from .snapshot import load_snapshot
+            snapshot = load_snapshot(file)
+            in_profile, sequence = snapshot["in_profile"], snapshot["sequence"]
+        else:
+            from . import input
+            loader = getattr(input, f"load_{job.kind.replace('-', '_')}")
+            in_profile, sequence = loader(file)
+    except Exception as e:
+        return dict(status="failed", load_duration=timer() - start, error=f"Error during reading of input file: {e}")
+
+    load_duration = timer() - start
+    return dict(load_duration=load_duration, **solve_and_summarize(in_profile, sequence))
+
+
+@click.command()
+@click.argument("files", nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option(
+    "-q", "--queue",
+    help="SQLite database file of the queue. Created if not existing.",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=DEFAULT_QUEUE_FILE, show_default=True
+)
+@click.option(
+    "-a", "--max-attempts",
+    help="Count of attempts to solve a job before it is considered failed.",
+    type=click.IntRange(min=1), default=3, show_default=True
+)
+@click.pass_obj
+def enqueue(state: State, files: Tuple[Path], queue: Path, max_attempts: int):
+    """
+    Adds jobs to solve the input FILES to a work queue processed by worker commands, possibly on other hosts.
+    The kind of each input is determined by its suffix: '.py' (input-py), '.toml' (input-toml), '.json' (input-json)
+    or '.gz' (state snapshot of save-state). Jobs are tagged with the current config and plugins,
+    only workers running with equal config and plugins claim them.
+    """
+    try:
+        ids = WorkQueue(queue).enqueue(list(files), config_key(state), max_attempts)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="FILES") from e
+
+    state.logger.info("Enqueued %d jobs (ids %d to %d) in: %s", len(ids), ids[0], ids[-1], queue.absolute())
+
+
+@click.command()
+@click.option(
+    "-q", "--queue",
+    help="SQLite database file of the queue.",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=DEFAULT_QUEUE_FILE, show_default=True
+)
+@click.option(
+    "-l", "--lease",
+    help="Duration of the lease on a job in seconds. The lease is renewed while solving, "
+         "jobs of workers that died are claimed again after it expired.",
+    type=click.FloatRange(min=0, min_open=True), default=300, show_default=True
+)
+@click.option(
+    "-i", "--poll-interval",
+    help="Time in seconds to wait before looking for new jobs if the queue is empty.",
+    type=click.FloatRange(min=0, min_open=True), default=5, show_default=True
+)
+@click.option(
+    "-n", "--max-jobs",
+    help="Count of jobs to process before exiting. Unlimited if not given.",
+    type=click.IntRange(min=1), default=None
+)
+@click.option(
+    "-x/-nx", "--exit-when-empty/--no-exit-when-empty",
+    help="Whether to exit if there are no pending or running jobs left instead of waiting for new ones.",
+    default=False
+)
+@click.pass_obj
+def worker(
+        state: State, queue: Path, lease: float, poll_interval: float, max_jobs: int, exit_when_empty: bool
+):
+    """
+    Processes jobs from a work queue filled by the enqueue command.
+    Only jobs enqueued with equal config and plugins are claimed. Each job is solved in a new process,
+    so that hook functions and modules defined by one input do not leak into others.
+    Any count of workers on any count of hosts sharing the queue file may run concurrently.
+    """
+    from .batch import solve_isolated
+
+    work_queue = WorkQueue(queue)
+    key = config_key(state)
+    owner = f"{socket.gethostname()}:{os.getpid()}"
+    processed = 0
+
+    state.logger.info("Worker %s processing jobs from: %s", owner, queue.absolute())
+
+    try:
+        while max_jobs is None or processed < max_jobs:
+            job = work_queue.claim(owner, key, lease)
+
+            if job is None:
+                counts = work_queue.counts(key)
+                if exit_when_empty and counts["pending"] == 0 and counts["running"] == 0:
+                    break
+                time.sleep(poll_interval)
+                continue
+
+            state.logger.info("Solving job %d (attempt %d of %d): %s", job.id, job.attempts, job.max_attempts, job.file)
+
+            try:
+                with work_queue.keep_leased(job, owner, lease):
+                    (_, result), = solve_isolated(state, [job], 1, run_job)
+            except KeyboardInterrupt:
+                work_queue.release(job, owner)
+                raise
+
+            if result["status"] == "ok":
+                stored = work_queue.complete(job, owner, result)
+            else:
+                state.logger.error("Job %d failed with error: %s", job.id, result["error"])
+                stored = work_queue.fail(job, owner, result["error"])
+
+            if not stored:
+                state.logger.warning("Lost lease on job %d, its result was discarded.", job.id)
+
+            processed += 1
+    except KeyboardInterrupt:
+        state.logger.info("Worker interrupted.")
+
+    state.logger.info("Worker %s finished after %d jobs.", owner, processed)
+
+
+@click.command()
+@click.option(
+    "-q", "--queue",
+    help="SQLite database file of the queue.",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=DEFAULT_QUEUE_FILE, show_default=True
+)
+@click.option(
+    "-o", "--output",
+    help="JSON lines file to write the records of all jobs to, '-' for standard output.",
+    type=click.File("w", encoding="utf-8"), default=None
+)
+@click.pass_obj
+def queue_status(state: State, queue: Path, output):
+    """Shows the count of jobs per status in a work queue and optionally writes the records of all jobs."""
+    work_queue = WorkQueue(queue)
+
+    table = Table(title="Work Queue", show_header=False)
+    table.add_column(style="bold")
+    table.add_column(justify="right")
+    for status, count in work_queue.counts().items():
+        table.add_row(status, str(count))
+    console.print(table)
+
+    if output:
+        for r in work_queue.results():
+            output.write(json.dumps(r) + "\n")
@@ -1,18 +1,63 @@
+import contextlib
+import importlib.util
+import sys
+from pathlib import Path
+
 from rich import get_console
 
 console = get_console()
 
-from rich.traceback import install
-import pyroll.core
 import click
 
 SUPPRESS_TRACEBACKS = [
-    pyroll.core.hooks.__file__,
+    str(Path(importlib.util.find_spec("pyroll.core").submodule_search_locations[0]) / "hooks.py"),
     click
 ]
 
-install(
-    console=console,
-    show_locals=False,
-    suppress=SUPPRESS_TRACEBACKS
-)
+
+class LazyPrettyRepr:
+    """
+    Wrapper of an object for use as log message argument, whose string conversion gives the pretty representation
+    of the object, so that it is only rendered if the record is actually emitted by a handler.
+    Keyword arguments are passed to :py:func:`rich.pretty.pretty_repr`.
+    """
+
+    def __init__(self, obj, **kwargs):
+        self.obj = obj
+        self.kwargs = kwargs
+
+    def __str__(self):
+        from rich.pretty import pretty_repr
+        return pretty_repr(self.obj, **self.kwargs)
+
+
+def _excepthook(type_, value, traceback):
+    from rich.traceback import Traceback
+
+    console.print(Traceback.from_exception(
+        type_, value, traceback,
+        show_locals=False,
+        suppress=SUPPRESS_TRACEBACKS
+    ))
+
+
+def install_traceback_handler():
+    """
+    Installs the rich traceback handler for uncaught exceptions.
+    The rich traceback machinery is only imported once an exception is actually to be rendered.
+    """
+    sys.excepthook = _excepthook
+
+
+@contextlib.contextmanager
+def console_to_stderr():
+    """
+    Context manager moving the console output, including the log records of rich handlers, to stderr,
+    to keep stdout free for machine-readable output.
+    """
+    stderr = console.stderr
+    console.stderr = True
+    try:
+        yield
+    finally:
+        console.stderr = stderr
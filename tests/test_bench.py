@@ -0,0 +1,38 @@
+import json
+
+from pyroll.cli.program import main
+import click.testing
+import os
+
+
+def test_bench(tmp_path):
+    runner = click.testing.CliRunner()
+
+    os.chdir(tmp_path)
+    result = runner.invoke(main, ["-nC", "bench", "-r", "2", "-w", "0", "-n", "4", "-o", "bench.json"])
+    print(result.output)
+
+    assert result.exit_code == 0
+
+    results = json.loads((tmp_path / "bench.json").read_text())["results"]
+    assert set(results) == {"startup", "config", "import:pyroll.core", "input", "solve:input.py", "solve:synthetic-4"}
+    assert all(len(r["times"]) == 2 for r in results.values())
+
+
+def test_bench_imports(tmp_path):
+    runner = click.testing.CliRunner()
+
+    os.chdir(tmp_path)
+    result = runner.invoke(
+        main, ["-nC", "-p", "pyroll.core.roll_pass", "bench", "-P", "plugins", "-r", "1", "-w", "0", "-o", "bench.json"]
+    )
+    print(result.output)
+
+    assert result.exit_code == 0
+
+    results = json.loads((tmp_path / "bench.json").read_text())["results"]
+    assert set(results) == {"import:pyroll.core", "import:pyroll.core.roll_pass", "import-own:pyroll.core.roll_pass"}
+
+    # imports are timed in a clean interpreter, so the one of pyroll.core itself is not skipped
+    assert results["import:pyroll.core"]["min"] > 0.01
+    assert results["import-own:pyroll.core.roll_pass"]["min"] < results["import:pyroll.core.roll_pass"]["min"]
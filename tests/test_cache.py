@@ -0,0 +1,80 @@
+from pyroll.cli.program import main
+from pyroll.cli.program.cache import SolutionCache
+from pyroll.cli.config import RES_DIR
+import click.testing
+import os
+
+INPUT = (RES_DIR / f"input.py").read_text()
+
+
+def _write_config(tmp_path):
+    (tmp_path / "config.toml").write_text(
+        f"[pyroll]\n[cache]\nenabled = true\ndir = '{(tmp_path / 'cache').as_posix()}'\n"
+    )
+
+
+def test_solve_cache(tmp_path):
+    (tmp_path / "input.py").write_text(INPUT)
+    _write_config(tmp_path)
+    runner = click.testing.CliRunner()
+    cache = SolutionCache(tmp_path / "cache")
+
+    os.chdir(tmp_path)
+    result = runner.invoke(main, ["-nC", "input-py", "solve"])
+    print(result.output)
+
+    assert result.exit_code == 0
+    assert cache.stats()["entries"] == 1
+    assert cache.stats()["misses"] == 1
+
+    result = runner.invoke(main, ["-nC", "input-py", "solve", "cache-stats"])
+    print(result.output)
+
+    assert result.exit_code == 0
+    assert cache.stats()["hits"] == 1
+
+    result = runner.invoke(main, ["-nC", "cache-clear", "-y"])
+    print(result.output)
+
+    assert result.exit_code == 0
+    assert cache.stats()["entries"] == 0
+
+
+def test_solve_cache_corrupt_entry(tmp_path, caplog):
+    (tmp_path / "input.py").write_text(INPUT)
+    _write_config(tmp_path)
+    runner = click.testing.CliRunner()
+    cache = SolutionCache(tmp_path / "cache")
+
+    os.chdir(tmp_path)
+    result = runner.invoke(main, ["-nC", "input-py", "solve"])
+    assert result.exit_code == 0
+
+    entry, = cache.entries()
+    entry.write_bytes(entry.read_bytes()[:100])
+
+    result = runner.invoke(main, ["-nC", "input-py", "solve"])
+    print(result.output)
+
+    assert result.exit_code == 0
+    assert "Deleted unreadable solution cache entry" in caplog.text
+    assert cache.stats()["misses"] == 2
+    assert cache.stats()["hits"] == 0
+    assert cache.stats()["entries"] == 1
+
+
+def test_solve_cache_unpicklable(tmp_path, caplog):
+    (tmp_path / "input.py").write_text(INPUT.replace("duration=1", "duration=1, note=lambda: None"))
+    _write_config(tmp_path)
+    runner = click.testing.CliRunner()
+    cache = SolutionCache(tmp_path / "cache")
+
+    os.chdir(tmp_path)
+    result = runner.invoke(main, ["-nC", "input-py", "solve", "export"])
+    print(result.output)
+
+    assert result.exit_code == 0
+    assert "Could not store solution in cache" in caplog.text
+    assert cache.stats()["entries"] == 0
+    assert not list((tmp_path / "cache").glob("*.tmp"))
+    assert (tmp_path / "results").is_dir()
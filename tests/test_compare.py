@@ -0,0 +1,113 @@
+import json
+import os
+
+import click.testing
+import numpy as np
+import pytest
+
+from pyroll.cli.config import RES_DIR
+from pyroll.cli.program import main
+from pyroll.cli.program.compare import Comparison, load_result
+from pyroll.cli.program.export import read_columns, write_columns
+
+INPUT = (RES_DIR / f"input.py").read_text()
+
+
+def test_compare(tmp_path):
+    (tmp_path / "input.py").write_text(INPUT)
+    runner = click.testing.CliRunner()
+
+    os.chdir(tmp_path)
+    result = runner.invoke(
+        main, ["-nC", "input-py", "solve", "export", "-o", "a.npz", "save-state", "-f", "a.gz"]
+    )
+    print(result.output)
+    assert result.exit_code == 0
+
+    columns = read_columns(tmp_path / "a.npz")
+    assert load_result(tmp_path / "a.gz").keys() == columns.keys()
+
+    result = runner.invoke(main, ["-nC", "compare", "-o", "same.json", "a.npz", "a.gz"])
+    print(result.output)
+    assert result.exit_code == 0
+    report = json.loads((tmp_path / "same.json").read_text())
+    assert report["pairs"] == 1
+    assert all(q["violations"] == 0 for q in report["quantities"].values())
+
+    perturbed = dict(columns)
+    perturbed["out_width"] = columns["out_width"] * np.array([1, 1, 1.01])
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    for i in range(3):
+        write_columns(columns, tmp_path / "a" / f"{i}.npz")
+        write_columns(perturbed if i == 1 else columns, tmp_path / "b" / f"{i}.npz")
+    write_columns(columns, tmp_path / "a" / "only_a.npz")
+
+    result = runner.invoke(main, ["-nC", "compare", "-o", "dirs.json", "a", "b"])
+    print(result.output)
+    assert result.exit_code == 1
+
+    report = json.loads((tmp_path / "dirs.json").read_text())
+    assert report["pairs"] == 3
+    assert report["pair_violations"] == {"1.npz": 1}
+    assert list(report["mismatches"]) == ["only_a.npz"]
+
+    width = report["quantities"]["out_width"]
+    assert width["violations"] == 1
+    assert width["worst"]["pair"] == "1.npz"
+    assert width["worst"]["unit"] == "Round II"
+    assert np.isclose(width["max_rel_deviation"], 0.01 / 1.01)
+
+
+def test_comparison_nan_and_mismatch():
+    a = dict(
+        index=np.arange(2), label=np.array(["x", "y"]), type=np.array(["T", "T"]),
+        value=np.array([1.0, np.nan]), other=np.array([np.nan, 2.0]),
+    )
+    b = dict(a, other=np.array([np.nan, np.nan]))
+
+    comparison = Comparison(rtol=1e-5, atol=1e-8)
+    comparison.add("pair", a, b)
+    comparison.add("relabeled", a, dict(a, label=np.array(["x", "z"])))
+    comparison.add("extended", a, dict(a, extra=np.array([1.0, 2.0])))
+    comparison.add("retyped", a, dict(a, value=np.array(["1", "nan"])))
+
+    results, pair_violations = comparison.compare()
+    assert results["value"]["violations"] == 0
+    assert results["other"]["violations"] == 1
+    assert results["other"]["worst"]["unit"] == "y"
+    assert pair_violations == {"pair": 1}
+    assert "labels differ at index 1" in comparison.mismatches["relabeled"]
+    assert "['extra'] only in B" in comparison.mismatches["extended"]
+    assert "['value']" in comparison.mismatches["retyped"]
+
+
+def test_comparison_inf(tmp_path):
+    a = dict(
+        index=np.arange(3), label=np.array(["x", "y", "z"]), type=np.array(["T", "T", "T"]),
+        value=np.array([np.inf, -np.inf, 1.0]), other=np.array([np.inf, np.inf, 1.0]),
+    )
+    b = dict(a, other=np.array([np.inf, -np.inf, np.inf]))
+
+    comparison = Comparison(rtol=2, atol=1e-8)
+    comparison.add("pair", a, b)
+
+    results, pair_violations = comparison.compare()
+    assert results["value"]["violations"] == 0
+    assert results["value"]["max_abs_deviation"] == 0
+    assert results["value"]["max_rel_deviation"] == 0
+    assert results["other"]["violations"] == 2
+    assert results["other"]["max_rel_deviation"] == np.inf
+    assert pair_violations == {"pair": 2}
+
+    write_columns(a, tmp_path / "a.npz")
+    write_columns(b, tmp_path / "b.npz")
+    runner = click.testing.CliRunner()
+
+    os.chdir(tmp_path)
+    result = runner.invoke(main, ["-nC", "compare", "-o", "inf.json", "a.npz", "b.npz"])
+    print(result.output)
+    assert result.exit_code == 1
+
+    report = json.loads((tmp_path / "inf.json").read_text(), parse_constant=lambda c: pytest.fail(f"invalid {c}"))
+    assert report["quantities"]["other"]["max_abs_deviation"] == "inf"
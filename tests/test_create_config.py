@@ -1,3 +1,4 @@
+import json
 import os
 from pyroll.cli.program import main
 import click.testing
@@ -30,3 +31,46 @@ def test_create_config_with_plugins(tmp_path):
 
     f = (tmp_path / "config.toml")
     assert f.exists()
+
+
+def test_create_config_discovery_cache(tmp_path):
+    runner = click.testing.CliRunner()
+    cache_file = tmp_path / "discovery.json"
+    config = f"[cache]\ndir = '{(tmp_path / 'cache').as_posix()}'\ndiscovery_file = '{cache_file.as_posix()}'\n"
+    (tmp_path / "config.toml").write_text("[pyroll]\n" + config)
+
+    os.chdir(tmp_path)
+    result = runner.invoke(main, ["-nC", "create-config", "-f", "created.toml"])
+    print(result.output)
+
+    assert result.exit_code == 0
+    assert cache_file.exists()
+
+    cache = json.loads(cache_file.read_text())
+    cache["config_constants"] = {"pyroll.cached": ["VALUE = 42\n"]}
+    cache_file.write_text(json.dumps(cache))
+
+    result = runner.invoke(main, ["-nC", "create-config", "-f", "cached.toml"])
+    print(result.output)
+
+    assert result.exit_code == 0
+    assert "pyroll.cached" in (tmp_path / "cached.toml").read_text()
+
+    result = runner.invoke(main, ["-nC", "create-config", "-f", "refreshed.toml", "--refresh"])
+    print(result.output)
+
+    assert result.exit_code == 0
+    assert "pyroll.cached" not in (tmp_path / "refreshed.toml").read_text()
+
+    result = runner.invoke(main, ["-nC", "create-config", "-f", "cleared.toml", "cache-clear", "-y"])
+    assert result.exit_code == 0
+    assert cache_file.exists()
+
+    # values of the config constants are overridden by the pyroll table of other projects
+    cache_file.write_text(json.dumps(cache))
+    (tmp_path / "config.toml").write_text("[pyroll]\n[pyroll.other]\nVALUE = 1\n" + config)
+    result = runner.invoke(main, ["-nC", "create-config", "-f", "other.toml"])
+    print(result.output)
+
+    assert result.exit_code == 0
+    assert "pyroll.cached" not in (tmp_path / "other.toml").read_text()
@@ -0,0 +1,27 @@
+import json
+
+from pyroll.cli.program import main
+import click.testing
+import os
+
+
+def test_doctor_startup(tmp_path):
+    runner = click.testing.CliRunner()
+
+    os.chdir(tmp_path)
+    result = runner.invoke(main, ["-nC", "-p", "pyroll.core", "doctor", "-o", "doctor.json"])
+    print(result.output)
+
+    assert result.exit_code == 0
+    assert "Startup Phases" in result.output
+
+    report = json.loads((tmp_path / "doctor.json").read_text())["startup"]
+    phases = {p["name"]: p for p in report["phases"]}
+    assert list(phases) == [
+        "interpreter", "cli", "traceback_handler", "config", "logging", "plugin:pyroll.core", "config_constants"
+    ]
+    assert sum(p["duration"] for p in phases.values()) <= report["wall"] * 1.01
+
+    imports = {i["module"]: i for i in report["imports"]}
+    assert imports["pyroll.core.roll_pass"]["phase"] == "plugin:pyroll.core"
+    assert imports["numpy"]["phase"] == "plugin:pyroll.core"
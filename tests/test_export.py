@@ -0,0 +1,44 @@
+import os
+
+import click.testing
+import numpy as np
+
+from pyroll.cli.config import RES_DIR
+from pyroll.cli.program import main
+from pyroll.cli.program.export import read_columns, COLUMNS
+
+INPUT = (RES_DIR / f"input.py").read_text()
+
+
+def test_export(tmp_path):
+    (tmp_path / "input.py").write_text(INPUT)
+    runner = click.testing.CliRunner()
+
+    os.chdir(tmp_path)
+    result = runner.invoke(main, ["-nC", "input-py", "solve", "export", "export", "-o", "results.npz"])
+    print(result.output)
+
+    assert result.exit_code == 0
+
+    columns = read_columns(tmp_path / "results")
+    assert set(columns) == {"index", "label", "type", *COLUMNS}
+    assert isinstance(columns["out_width"], np.memmap)
+    assert list(columns["label"]) == ["Oval I", "I => II", "Round II"]
+    assert np.isnan(columns["roll_force"][1])
+    assert np.all(columns["out_cross_section_area"] < columns["in_cross_section_area"][0])
+
+    archive = read_columns(tmp_path / "results.npz", ["label", "out_width"])
+    assert set(archive) == {"label", "out_width"}
+    assert np.array_equal(archive["out_width"], columns["out_width"])
+
+
+def test_export_unsolved(tmp_path):
+    (tmp_path / "input.py").write_text(INPUT)
+    runner = click.testing.CliRunner()
+
+    os.chdir(tmp_path)
+    result = runner.invoke(main, ["-nC", "input-py", "export"])
+    print(result.output)
+
+    assert result.exit_code == 1
+    assert not (tmp_path / "results").exists()
@@ -0,0 +1,68 @@
+import json
+import os
+
+import click.testing
+import pytest
+import tomli
+
+from pyroll.cli.config import RES_DIR
+from pyroll.cli.program import main
+from pyroll.cli.program.input import load_input_document, load_input_py, InputDocumentError
+
+INPUT_TOML = (RES_DIR / "input.toml").read_text()
+
+
+def test_input_toml_equals_input_py():
+    in_profile, sequence = load_input_document(tomli.loads(INPUT_TOML))
+    sequence.solve(in_profile)
+
+    expected_in_profile, expected = load_input_py(RES_DIR / "input.py")
+    expected.solve(expected_in_profile)
+
+    assert [u.label for u in sequence] == [u.label for u in expected]
+    assert sequence.out_profile.cross_section.area == pytest.approx(expected.out_profile.cross_section.area)
+    assert sequence.out_profile.temperature == pytest.approx(expected.out_profile.temperature)
+
+
+def test_input_document_shared_grooves():
+    document = tomli.loads(INPUT_TOML)
+    document["sequence"].append(
+        dict(type="RollPass", label="Oval III", roll=dict(use="oval", nominal_radius=170e-3), gap=2e-3)
+    )
+    _, sequence = load_input_document(document)
+
+    assert sequence[0].roll is not sequence[3].roll
+    assert sequence[0].roll.groove is sequence[3].roll.groove
+    assert sequence[3].roll.nominal_radius == 170e-3
+
+
+@pytest.mark.parametrize(
+    "change, message",
+    [
+        (lambda d: d["sequence"][0].update(roll="missing"), "sequence[0].roll: unknown roll 'missing'"),
+        (lambda d: d["sequence"][1].update(type="Teleport"), "sequence[1].type: unknown Unit type 'Teleport'"),
+        (lambda d: d["grooves"]["oval"].update(type="Unit"), "grooves.oval.type: unknown GrooveBase type 'Unit'"),
+        (lambda d: d["in_profile"].update(shape="blob"), "in_profile.shape: unknown profile shape 'blob'"),
+        (lambda d: d.pop("sequence"), "sequence: missing"),
+        (lambda d: d["sequence"][0].update(gapp=2e-3), "sequence[0].gapp: unknown key"),
+        (lambda d: d["rolls"]["oval"].update(nominal_radus=0.1), "sequence[0].roll.nominal_radus: unknown key"),
+        (lambda d: d["in_profile"].update(temperatur=1000), "in_profile.temperatur: unknown key"),
+    ]
+)
+def test_input_document_errors(change, message):
+    document = tomli.loads(INPUT_TOML)
+    change(document)
+
+    with pytest.raises(InputDocumentError, match=message.replace("[", r"\[").replace("]", r"\]")):
+        load_input_document(document)
+
+
+def test_input_json(tmp_path):
+    (tmp_path / "input.json").write_text(json.dumps(tomli.loads(INPUT_TOML)))
+    runner = click.testing.CliRunner()
+
+    os.chdir(tmp_path)
+    result = runner.invoke(main, ["-nC", "input-json", "solve"])
+    print(result.output)
+
+    assert result.exit_code == 0
@@ -0,0 +1,88 @@
+import logging
+import os
+import signal
+
+import click.testing
+
+from pyroll.cli.config import RES_DIR
+from pyroll.cli.program import main
+from pyroll.cli.program.state import State
+
+INPUT = (RES_DIR / f"input.py").read_text()
+
+
+def _state():
+    return State(config=dict(pyroll=dict()), logger=logging.getLogger("pyroll.cli"))
+
+
+def test_solve_background(tmp_path):
+    (tmp_path / "input.py").write_text(INPUT)
+    runner = click.testing.CliRunner()
+    state = _state()
+
+    os.chdir(tmp_path)
+    result = runner.invoke(
+        main,
+        ["input-py", "solve", "--background", "session", "other", "input-py", "solve", "--background", "wait"],
+        obj=state
+    )
+    print(result.output)
+
+    assert result.exit_code == 0
+
+    result = runner.invoke(main, ["jobs"], obj=state)
+    assert "Background Jobs" in result.output
+
+    assert state.session == "other"
+    assert [j.status for j in state.jobs] == ["ok", "ok"]
+    assert [j.note for j in state.jobs] == ["applied", "applied"]
+    assert state.sequence.in_profile is not None
+    assert state.session_state("default").sequence.in_profile is not None
+    assert state.session_state("default").sequence is not state.sequence
+
+
+def test_solve_background_discarded_on_reload(tmp_path):
+    (tmp_path / "input.py").write_text(INPUT)
+    runner = click.testing.CliRunner()
+    state = _state()
+
+    os.chdir(tmp_path)
+    result = runner.invoke(main, ["input-py", "solve", "--background", "input-py", "wait"], obj=state)
+
+    assert result.exit_code == 0
+    assert state.jobs[0].note.startswith("discarded")
+    assert state.sequence.in_profile is None
+
+
+def test_cancel(tmp_path):
+    (tmp_path / "input.py").write_text(INPUT)
+    runner = click.testing.CliRunner()
+    state = _state()
+
+    os.chdir(tmp_path)
+    result = runner.invoke(main, ["input-py", "solve", "--background", "cancel", "--all"], obj=state)
+    print(result.output)
+
+    assert result.exit_code == 0
+    assert state.jobs[0].status in ["cancelled", "ok"]
+    assert not state.jobs[0].process.is_alive()
+
+
+def test_killed_worker(tmp_path):
+    (tmp_path / "input.py").write_text(INPUT)
+    runner = click.testing.CliRunner()
+    state = _state()
+
+    os.chdir(tmp_path)
+    result = runner.invoke(main, ["input-py", "solve", "--background"], obj=state)
+    assert result.exit_code == 0
+
+    os.kill(state.jobs[0].process.pid, signal.SIGKILL)
+
+    result = runner.invoke(main, ["wait"], obj=state)
+    print(result.output)
+
+    assert result.exit_code == 0
+    assert state.jobs[0].status == "failed"
+    assert str(-signal.SIGKILL) in state.jobs[0].error
+    assert state.sequence.in_profile is None
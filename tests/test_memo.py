@@ -0,0 +1,89 @@
+import logging
+import os
+
+import click.testing
+import pytest
+from pyroll.core.hooks import Hook
+
+from pyroll.cli.config import RES_DIR
+from pyroll.cli.program import main
+from pyroll.cli.program.input import load_input_py
+from pyroll.cli.program.memo import HookMemo, DEFAULT_MEMO_HOOKS
+from pyroll.cli.program.state import State
+
+INPUT = (RES_DIR / f"input.py").read_text()
+
+
+def _solve():
+    in_profile, sequence = load_input_py(RES_DIR / "input.py")
+    sequence.solve(in_profile)
+    return sequence
+
+
+def test_hook_memo(tmp_path):
+    expected = _solve()
+    original = Hook.get_result
+
+    with HookMemo(DEFAULT_MEMO_HOOKS, dir=tmp_path) as memo:
+        sequence = _solve()
+
+    assert Hook.get_result is original
+    assert sequence.out_profile.cross_section.area == pytest.approx(expected.out_profile.cross_section.area)
+    assert sequence[0].roll_force == pytest.approx(expected[0].roll_force)
+
+    stats = memo.stats["BaseRollPass.usable_cross_section"]
+    assert stats["misses"] == 2
+    assert stats["hits"] > 0
+    assert len(list(tmp_path.glob("*.pickle"))) > 0
+
+    with HookMemo(DEFAULT_MEMO_HOOKS, dir=tmp_path) as memo:
+        _solve()
+
+    assert memo.stats["BaseRollPass.usable_cross_section"]["misses"] == 0
+    assert memo.stats["BaseRollPass.usable_cross_section"]["disk_hits"] == 2
+
+
+def test_solve_memoize(tmp_path):
+    (tmp_path / "input.py").write_text(INPUT)
+    runner = click.testing.CliRunner()
+    state = State(
+        config=dict(pyroll=dict(), memoize=dict(enabled=True)),
+        logger=logging.getLogger("pyroll.cli")
+    )
+
+    os.chdir(tmp_path)
+    result = runner.invoke(main, ["-nC", "input-py", "solve"], obj=state)
+    print(result.output)
+
+    assert result.exit_code == 0
+    assert "Hook Memoization" in result.output
+    assert "Roll.contour_points" in result.output
+
+
+def _roll_pass(cls, gap):
+    import pyroll.core as pr
+
+    return cls(
+        label=cls.__name__,
+        roll=pr.Roll(groove=pr.RoundGroove(r1=1e-3, r2=10e-3, depth=3e-3, pad_angle=30), nominal_radius=160e-3),
+        gap=gap,
+    )
+
+
+def test_hook_memo_host_type_and_gap():
+    from pyroll.core import TwoRollPass, ThreeRollPass
+
+    expected = {
+        (cls, gap): (_roll_pass(cls, gap).usable_width, _roll_pass(cls, gap).usable_cross_section.area)
+        for cls in [TwoRollPass, ThreeRollPass] for gap in [2e-3, 4e-3]
+    }
+
+    with HookMemo(DEFAULT_MEMO_HOOKS) as memo:
+        for (cls, gap), (width, area) in expected.items():
+            rp = _roll_pass(cls, gap)
+            assert rp.usable_width == pytest.approx(width)
+            assert rp.usable_cross_section.area == pytest.approx(area)
+
+    assert memo.stats["ThreeRollPass.usable_width"]["misses"] == 2
+    assert "TwoRollPass.usable_width" not in memo.stats
+    assert memo.stats["BaseRollPass.usable_cross_section"]["misses"] == 4
@@ -0,0 +1,78 @@
+import json
+import logging
+
+import pytest
+
+from pyroll.cli.program import main
+from pyroll.cli.program.state import State
+from pyroll.cli.config import RES_DIR
+import click.testing
+import os
+
+INPUT = (RES_DIR / f"input.py").read_text()
+
+SPEC = """
+[parameters.units."Oval I"]
+gap = { min = 1e-3, max = 6e-3 }
+
+[targets.units."Oval I".out_profile]
+height = 0.0195
+
+[search]
+tolerance = 1e-3
+"""
+
+
+def test_optimize(tmp_path):
+    (tmp_path / "input.py").write_text(INPUT)
+    (tmp_path / "optimize.toml").write_text(SPEC)
+    runner = click.testing.CliRunner()
+
+    os.chdir(tmp_path)
+    result = runner.invoke(main, ["input-py", "optimize", "-j", "2", "-o", "optimize.json"])
+    print(result.output)
+
+    assert result.exit_code == 0
+
+    results = json.loads((tmp_path / "optimize.json").read_text())
+    assert results["objective"] <= 1e-3
+    assert results["achieved"]["Oval I.out_profile.height"] == pytest.approx(0.0195, rel=1e-3)
+    assert results["parameters"]["Oval I.gap"] == pytest.approx(3.5e-3, rel=1e-2)
+    assert len(results["history"]) > 1
+
+
+def test_set_groove_parameter():
+    from pyroll.cli.program.spec import set_parameter
+    from pyroll.cli.program.input import load_input_py
+
+    _, sequence = load_input_py(RES_DIR / "input.py")
+    groove = sequence["Oval I"].roll.groove
+    set_parameter(sequence, ("units", "Oval I", "roll", "groove", "depth"), groove.depth * 1.1)
+
+    assert sequence["Oval I"].roll.groove is not groove
+    assert sequence["Oval I"].roll.groove.depth == pytest.approx(groove.depth * 1.1)
+    assert sequence["Oval I"].roll.groove.r1 == groove.r1
+
+
+def test_optimize_loaded_input(tmp_path):
+    (tmp_path / "input.py").write_text(INPUT)
+    (tmp_path / "optimize.toml").write_text(SPEC)
+    runner = click.testing.CliRunner()
+    state = State(config=dict(pyroll=dict()), logger=logging.getLogger("pyroll.cli"))
+
+    os.chdir(tmp_path)
+    result = runner.invoke(main, ["-nC", "input-py"], obj=state)
+    assert result.exit_code == 0
+    input_hash, fingerprints = state.input_hash, state.input_fingerprints
+
+    result = runner.invoke(main, ["-nC", "optimize", "-j", "1"], obj=state)
+    print(result.output)
+
+    assert result.exit_code == 0
+    assert state.sequence.in_profile is not None
+    assert state.input_hash not in [None, input_hash]
+
+    # only the fingerprint of the optimized unit changes, those of the others are still the unsolved ones
+    assert state.input_fingerprints[0] == fingerprints[0]
+    assert state.input_fingerprints[1] != fingerprints[1]
+    assert state.input_fingerprints[2:] == fingerprints[2:]
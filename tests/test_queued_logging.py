@@ -0,0 +1,87 @@
+import logging
+import logging.handlers
+import os
+
+import click.testing
+import pytest
+
+from pyroll.cli.config import RES_DIR
+from pyroll.cli.program import main
+from pyroll.cli.program.main import stop_queued_logging
+
+INPUT = (RES_DIR / f"input.py").read_text()
+
+CONFIG = """
+[pyroll]
+
+[logging]
+version = 1
+queue = true
+
+formatters.file.format = '%(asctime)s [%(levelname)s] %(name)s: %(message)s'
+
+[logging.handlers.file]
+class = "logging.FileHandler"
+level = "INFO"
+formatter = "file"
+filename = "pyroll.log"
+
+[logging.root]
+level = "WARNING"
+handlers = ["file"]
+
+[logging.loggers.pyroll]
+level = "DEBUG"
+"""
+
+
+@pytest.fixture
+def restore_logging():
+    """Restores the handlers, levels and disabled flags of all loggers changed by configuring logging from config."""
+    manager = logging.getLogger().manager
+    loggers = [logging.getLogger(), *(l for l in manager.loggerDict.values() if isinstance(l, logging.Logger))]
+    saved = {l: (list(l.handlers), l.level, l.disabled, l.propagate) for l in loggers}
+
+    try:
+        yield
+    finally:
+        stop_queued_logging()
+
+        for logger in [logging.getLogger(), *manager.loggerDict.values()]:
+            if not isinstance(logger, logging.Logger):
+                continue
+            handlers, level, disabled, propagate = saved.get(logger, ([], logging.NOTSET, False, True))
+
+            for h in logger.handlers:
+                if h not in handlers:
+                    h.close()
+            logger.handlers = handlers
+            logger.setLevel(level)
+            logger.disabled = disabled
+            logger.propagate = propagate
+
+
+def test_queued_logging(tmp_path, restore_logging):
+    (tmp_path / "input.py").write_text(INPUT)
+    (tmp_path / "config.toml").write_text(CONFIG)
+    runner = click.testing.CliRunner()
+
+    os.chdir(tmp_path)
+    result = runner.invoke(main, ["-nC", "input-py", "solve"])
+    print(result.output)
+
+    assert result.exit_code == 0
+
+    handlers = logging.getLogger().handlers
+    assert len(handlers) == 1
+    assert isinstance(handlers[0], logging.handlers.QueueHandler)
+    assert handlers[0].level == logging.INFO
+
+    stop_queued_logging()
+
+    assert isinstance(logging.getLogger().handlers[0], logging.FileHandler)
+
+    log = (tmp_path / "pyroll.log").read_text()
+    assert "Loaded in profile" in log
+    assert "Finished solution process" in log
+    assert "[DEBUG]" not in log
@@ -0,0 +1,79 @@
+import logging
+import os
+
+import click.testing
+
+from pyroll.cli.config import RES_DIR
+from pyroll.cli.program import main
+from pyroll.cli.program.retention import deep_size
+from pyroll.cli.program.state import State
+
+INPUT = (RES_DIR / f"input.py").read_text().replace("gap=2e-3,", "gap=2e-3, disk_element_count=5,")
+
+
+def _invoke(tmp_path, mode: str, *args):
+    (tmp_path / "input.py").write_text(INPUT)
+    runner = click.testing.CliRunner()
+    state = State(config=dict(pyroll=dict(), retention=dict(mode=mode)), logger=logging.getLogger("pyroll.cli"))
+
+    os.chdir(tmp_path)
+    result = runner.invoke(main, ["-nC", "input-py", "solve", *args], obj=state)
+    print(result.output)
+
+    assert result.exit_code == 0
+    return state, result
+
+
+def test_retention_full(tmp_path):
+    state, _ = _invoke(tmp_path, "full")
+
+    assert len(state.sequence[0].disk_elements) == 5
+
+
+def test_retention_compact(tmp_path):
+    state, result = _invoke(tmp_path, "compact", "mem")
+
+    assert not state.sequence[0].disk_elements
+    assert not state.sequence[0].convergence_history
+    assert state.sequence.out_profile.cross_section.area > 0
+    assert "Memory Footprint" in result.output
+
+
+def test_retention_summary(tmp_path):
+    state, _ = _invoke(tmp_path, "summary")
+
+    assert state.sequence is None
+    assert state.summary["out_cross_section_area"] > 0
+
+
+def test_deep_size():
+    shared = list(range(1000))
+    seen = set()
+
+    assert deep_size([shared], seen) > deep_size(list(range(10)))
+    assert deep_size([shared], seen) < deep_size(list(range(10)))
+
+
+def test_retention_compact_hook_cache(tmp_path):
+    state, _ = _invoke(tmp_path, "compact")
+    roll_pass = state.sequence[0]
+
+    assert not roll_pass.__cache__
+    assert not roll_pass.out_profile.__cache__
+    assert not roll_pass.roll.__cache__
+    assert roll_pass.roll.contact_area > 0
+
+
+def test_retention_keep_last(tmp_path):
+    (tmp_path / "input.py").write_text(INPUT)
+    runner = click.testing.CliRunner()
+    state = State(config=dict(pyroll=dict(), retention=dict(keep_last=2)), logger=logging.getLogger("pyroll.cli"))
+
+    os.chdir(tmp_path)
+    result = runner.invoke(main, ["-nC", *["input-py", "solve"] * 4, "input-py"], obj=state)
+    print(result.output)
+
+    assert result.exit_code == 0
+    assert state.previous_solution is not None
+    assert len(state.solution_history) == 1
+    assert state.solution_history[0][1] is not state.previous_solution[1]
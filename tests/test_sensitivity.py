@@ -0,0 +1,70 @@
+import json
+import os
+
+import click.testing
+import pytest
+
+from pyroll.cli.config import RES_DIR
+from pyroll.cli.program import main
+from pyroll.cli.program.sensitivity import parse_sensitivity_spec
+
+INPUT = (RES_DIR / f"input.py").read_text()
+
+SPEC = """
+[in_profile]
+flow_stress = true
+
+[units."Oval I"]
+gap = true
+
+[units."Round II"]
+gap = 0.05
+
+[units."Round II".roll]
+nominal_radius = true
+"""
+
+
+def test_sensitivity(tmp_path):
+    (tmp_path / "input.py").write_text(INPUT)
+    (tmp_path / "sensitivity.toml").write_text(SPEC)
+    runner = click.testing.CliRunner()
+
+    os.chdir(tmp_path)
+    result = runner.invoke(
+        main, [
+            "-nC", "input-py",
+            "sensitivity", "-j", "2", "-o", "reused.json",
+            "sensitivity", "-j", "1", "--no-reuse-prefix", "--central", "-o", "full.json",
+        ]
+    )
+    print(result.output)
+
+    assert result.exit_code == 0
+
+    reused = json.loads((tmp_path / "reused.json").read_text())
+    full = json.loads((tmp_path / "full.json").read_text())
+
+    assert list(reused["jacobian"]) == [
+        "in_profile.flow_stress", "Oval I.gap", "Round II.gap", "Round II.roll.nominal_radius"
+    ]
+    assert reused["parameters"]["Round II.gap"]["step"] == pytest.approx(0.05 * 2e-3)
+
+    jacobian = reused["jacobian"]
+    assert jacobian["Round II.gap"]["Oval I.roll_force"] == 0
+    assert jacobian["Round II.gap"]["out_height"] == pytest.approx(1, rel=1e-3)
+    assert jacobian["Oval I.gap"]["Oval I.roll_force"] < 0
+    assert jacobian["in_profile.flow_stress"]["Round II.roll_force"] > 0
+
+    for p, row in jacobian.items():
+        for o, d in row.items():
+            assert d == pytest.approx(full["jacobian"][p][o], rel=0.05, abs=1e-9), (p, o)
+
+
+def test_parse_sensitivity_spec():
+    parameters = parse_sensitivity_spec({"units": {"Oval I": {"roll": {"nominal_radius": 0.1}, "gap": True}}}, 1e-2)
+    assert parameters == [(("units", "Oval I", "roll", "nominal_radius"), 0.1), (("units", "Oval I", "gap"), 1e-2)]
+
+    for spec in [{}, {"units": {"Oval I": {"gap": -1}}}, {"units": {"Oval I": {"gap": False}}}, {"roll": {}}]:
+        with pytest.raises(ValueError):
+            parse_sensitivity_spec(spec, 1e-2)
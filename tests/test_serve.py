@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+import time
+
+from pyroll.cli.client import request
+from pyroll.cli.config import RES_DIR
+
+INPUT = (RES_DIR / f"input.py").read_text()
+
+
+def test_serve(tmp_path, capsys):
+    (tmp_path / "input.py").write_text(INPUT)
+    socket_file = tmp_path / "serve.sock"
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "pyroll.cli", "-nC", "serve", "-s", str(socket_file), "-j", "2"],
+        cwd=tmp_path, env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path)),
+    )
+
+    try:
+        for _ in range(100):
+            if socket_file.exists():
+                break
+            time.sleep(0.1)
+
+        assert request(socket_file, ["input-py", "solve"], cwd=tmp_path) == 0
+        assert "Finished solution process." in capsys.readouterr().out
+
+        assert request(socket_file, ["input-py", "-f", "missing.py"], cwd=tmp_path) == 2
+    finally:
+        server.terminate()
+        server.wait()
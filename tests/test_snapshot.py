@@ -0,0 +1,62 @@
+import logging
+import os
+
+import click.testing
+import numpy as np
+
+from pyroll.cli.config import RES_DIR
+from pyroll.cli.program import main
+from pyroll.cli.program.export import read_columns
+from pyroll.cli.program.state import State
+
+INPUT = (RES_DIR / f"input.py").read_text()
+
+
+def test_save_load_state(tmp_path):
+    (tmp_path / "input.py").write_text(INPUT)
+    runner = click.testing.CliRunner()
+
+    os.chdir(tmp_path)
+    result = runner.invoke(main, ["-nC", "input-py", "solve", "save-state", "export", "-o", "solved"])
+    print(result.output)
+
+    assert result.exit_code == 0
+    assert (tmp_path / "state.pickle.gz").exists()
+
+    state = State(config=dict(pyroll=dict()), logger=logging.getLogger("pyroll.cli"))
+    result = runner.invoke(main, ["-nC", "load-state", "export", "-o", "loaded"], obj=state)
+    print(result.output)
+
+    assert result.exit_code == 0
+    assert state.input_hash is not None
+    assert state.sequence.parent is None
+    assert state.sequence[0].parent is state.sequence
+
+    solved = read_columns(tmp_path / "solved")
+    loaded = read_columns(tmp_path / "loaded")
+    for c in solved:
+        assert np.array_equal(solved[c], loaded[c], equal_nan=c not in ["label", "type"])
+
+
+def test_save_state_nothing_loaded(tmp_path):
+    runner = click.testing.CliRunner()
+
+    os.chdir(tmp_path)
+    result = runner.invoke(main, ["-nC", "save-state"])
+    print(result.output)
+
+    assert result.exit_code == 1
+    assert not (tmp_path / "state.pickle.gz").exists()
+
+
+def test_save_state_unpicklable(tmp_path, caplog):
+    (tmp_path / "input.py").write_text(INPUT.replace("duration=1", "duration=1, note=lambda: None"))
+    runner = click.testing.CliRunner()
+
+    os.chdir(tmp_path)
+    result = runner.invoke(main, ["-nC", "input-py", "save-state"])
+    print(result.output)
+
+    assert result.exit_code == 1
+    assert "Could not save state snapshot" in caplog.text
+    assert not list(tmp_path.glob("state.pickle.gz*"))
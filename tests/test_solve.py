@@ -1,3 +1,4 @@
+import json
 from pyroll.cli.program import main
 from pyroll.cli.config import RES_DIR
 import click.testing
@@ -15,3 +16,45 @@ def test_solve(tmp_path):
     print(result.output)
 
     assert result.exit_code == 0
+
+
+def test_solve_profile(tmp_path):
+    (tmp_path / "input.py").write_text(INPUT)
+    runner = click.testing.CliRunner()
+
+    os.chdir(tmp_path)
+    result = runner.invoke(main, ["input-py", "solve", "--profile", "profile.json", "solve", "--profile", "p.pstats"])
+    print(result.output)
+
+    assert result.exit_code == 0
+
+    profile = json.loads((tmp_path / "profile.json").read_text())
+    assert {u["unit"] for u in profile["units"]} >= {"TwoRollPass 'Oval I'", "TwoRollPass 'Round II'"}
+    assert profile["hooks"]
+
+    import pstats
+    assert pstats.Stats(str(tmp_path / "p.pstats")).total_calls > 0
+
+
+def test_solve_events(tmp_path):
+    (tmp_path / "input.py").write_text(INPUT)
+    runner = click.testing.CliRunner()
+
+    os.chdir(tmp_path)
+    result = runner.invoke(main, ["-nC", "input-py", "solve", "--events", "jsonl", "--events-file", "events.jsonl"])
+    print(result.output)
+
+    assert result.exit_code == 0
+
+    events = [json.loads(l) for l in (tmp_path / "events.jsonl").read_text().splitlines()]
+    kinds = [e["event"] for e in events]
+
+    assert kinds[0] == "solve_start"
+    assert events[0]["units"] == 3
+    assert kinds[-1] == "solve_finish"
+    assert events[-1]["status"] == "ok"
+    assert "sequence_iteration" in kinds
+
+    finished = [e for e in events if e["event"] == "unit_finish"]
+    assert {e["unit"] for e in finished} == {"Oval I", "I => II", "Round II"}
+    assert all(e["status"] == "ok" and e["iterations"] > 0 for e in finished)
@@ -0,0 +1,56 @@
+import json
+from pathlib import Path
+
+from pyroll.cli.program import main
+from pyroll.cli.config import RES_DIR
+import click.testing
+import os
+
+INPUT = (RES_DIR / f"input.py").read_text()
+
+
+def test_solve_batch(tmp_path):
+    (tmp_path / "inputs").mkdir()
+    for i in range(3):
+        (tmp_path / "inputs" / f"input{i}.py").write_text(INPUT)
+    (tmp_path / "inputs" / "broken.py").write_text("raise ValueError()")
+    runner = click.testing.CliRunner()
+
+    os.chdir(tmp_path)
+    result = runner.invoke(main, ["-nC", "solve-batch", "-g", "inputs/*.py", "-j", "2", "-o", "results.jsonl"])
+    print(result.output)
+
+    assert result.exit_code == 0
+
+    records = {r["file"]: r for r in map(json.loads, (tmp_path / "results.jsonl").read_text().splitlines())}
+    assert len(records) == 4
+    assert records[str(tmp_path / "inputs" / "broken.py")]["status"] == "failed"
+    assert all(r["status"] == "ok" for f, r in records.items() if not f.endswith("broken.py"))
+
+
+HOOK = """
+import pyroll.core as pr
+
+
+@pr.RollPass.roll_force
+def constant_roll_force(self):
+    return 1.0
+"""
+
+
+def test_solve_batch_isolated(tmp_path):
+    (tmp_path / "inputs").mkdir()
+    (tmp_path / "inputs" / "a_hook.py").write_text(HOOK + INPUT)
+    (tmp_path / "inputs" / "b_plain.py").write_text(INPUT)
+    runner = click.testing.CliRunner()
+
+    os.chdir(tmp_path)
+    result = runner.invoke(main, ["-nC", "solve-batch", "-g", "inputs/*.py", "-j", "1"])
+    print(result.output)
+
+    assert result.exit_code == 0
+
+    # stdout holds only the records, console output goes to stderr
+    records = {Path(r["file"]).name: r for r in map(json.loads, result.stdout.splitlines())}
+    assert records["a_hook.py"]["max_roll_force"] == 1.0
+    assert records["b_plain.py"]["max_roll_force"] > 1e3
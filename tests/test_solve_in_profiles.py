@@ -0,0 +1,97 @@
+import os
+
+import click.testing
+import pytest
+
+from pyroll.cli.config import RES_DIR
+from pyroll.cli.program import main
+from pyroll.cli.program.in_profiles import load_in_profiles, solve_in_profiles
+from pyroll.cli.program.input import InputDocumentError, load_input_py
+from pyroll.cli.program.state import State
+
+INPUT = (RES_DIR / f"input.py").read_text()
+
+IN_PROFILES = """
+[defaults]
+shape = "round"
+temperature = 1473.15
+strain = 0
+material = ["C45", "steel"]
+flow_stress = 40e6
+density = 7.7e3
+specific_heat_capacity = 465
+thermal_conductivity = 23
+
+[[in_profiles]]
+name = "d29"
+diameter = 29e-3
+
+[[in_profiles]]
+name = "d30"
+diameter = 30e-3
+
+[[in_profiles]]
+name = "d31 hot"
+diameter = 31e-3
+temperature = 1523.15
+"""
+
+
+def test_load_in_profiles(tmp_path):
+    (tmp_path / "in_profiles.toml").write_text(IN_PROFILES)
+    in_profiles = load_in_profiles(tmp_path / "in_profiles.toml")
+
+    assert [n for n, _ in in_profiles] == ["d29", "d30", "d31 hot"]
+    assert [p.width for _, p in in_profiles] == pytest.approx([29e-3, 30e-3, 31e-3])
+    assert in_profiles[2][1].temperature == 1523.15
+
+    (tmp_path / "invalid.json").write_text('[{"shape": "blob"}]')
+    with pytest.raises(InputDocumentError, match="in_profiles\\[0\\].shape"):
+        load_in_profiles(tmp_path / "invalid.json")
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_solve_in_profiles(tmp_path, workers):
+    (tmp_path / "input.py").write_text(INPUT)
+    (tmp_path / "in_profiles.toml").write_text(IN_PROFILES)
+    runner = click.testing.CliRunner()
+
+    os.chdir(tmp_path)
+    result = runner.invoke(
+        main, ["-nC", "input-py", "solve", "--in-profiles", "in_profiles.toml", "-j", str(workers)]
+    )
+    print(result.output)
+
+    assert result.exit_code == 0
+    assert "In Profile Results" in result.output
+    assert "d30" in result.output
+
+
+@pytest.mark.parametrize("option", [["--background"], ["--timeout", "10"]])
+def test_solve_in_profiles_unsupported_options(tmp_path, option):
+    (tmp_path / "input.py").write_text(INPUT)
+    (tmp_path / "in_profiles.toml").write_text(IN_PROFILES)
+    runner = click.testing.CliRunner()
+
+    os.chdir(tmp_path)
+    result = runner.invoke(main, ["-nC", "input-py", "solve", "--in-profiles", "in_profiles.toml", *option])
+    print(result.output)
+
+    assert result.exit_code == 2
+    assert "cannot be combined" in result.output
+    assert "In Profile Results" not in result.output
+
+
+def test_solve_in_profiles_results(tmp_path):
+    (tmp_path / "in_profiles.toml").write_text(IN_PROFILES)
+    in_profiles = [p for _, p in load_in_profiles(tmp_path / "in_profiles.toml")]
+
+    state = State(config=dict(pyroll=dict()))
+    state.load(*load_input_py(RES_DIR / "input.py"))
+
+    results = dict(solve_in_profiles(state, in_profiles, workers=2))
+
+    assert sorted(results) == [0, 1, 2]
+    assert all(r["status"] == "ok" for r in results.values())
+    assert results[0]["max_roll_force"] < results[1]["max_roll_force"] < results[2]["max_roll_force"]
+    assert state.sequence.in_profile is None
@@ -0,0 +1,137 @@
+from pyroll.cli.program import main
+from pyroll.cli.program.incremental import reuse_previous_solution
+from pyroll.cli.program.input import load_input_py
+from pyroll.cli.program.state import State
+from pyroll.cli.config import RES_DIR
+import click.testing
+import logging
+import os
+import pytest
+import time
+
+INPUT = (RES_DIR / f"input.py").read_text()
+CHANGED_INPUT = INPUT.replace("depth=11.5e-3", "depth=11e-3")
+
+
+def test_solve_incremental(tmp_path):
+    (tmp_path / "input.py").write_text(INPUT)
+    (tmp_path / "changed.py").write_text(CHANGED_INPUT)
+
+    state = State()
+    state.load(*load_input_py(tmp_path / "input.py"))
+    state.sequence.solve(state.in_profile)
+    first_unit = state.sequence[0]
+
+    state.load(*load_input_py(tmp_path / "changed.py"))
+    with reuse_previous_solution(state) as reused:
+        state.sequence.solve(state.in_profile)
+
+    assert reused == 2
+    assert state.sequence[0] is first_unit
+
+    in_profile, expected = load_input_py(tmp_path / "changed.py")
+    expected.solve(in_profile)
+
+    assert state.sequence.out_profile.cross_section.area == pytest.approx(expected.out_profile.cross_section.area)
+    assert state.sequence.out_profile.temperature == pytest.approx(expected.out_profile.temperature)
+
+
+def test_solve_incremental_cli(tmp_path):
+    (tmp_path / "input.py").write_text(INPUT)
+    (tmp_path / "changed.py").write_text(CHANGED_INPUT)
+    runner = click.testing.CliRunner()
+
+    os.chdir(tmp_path)
+    result = runner.invoke(main, ["-nC", "input-py", "solve", "input-py", "-f", "changed.py", "solve", "-i"])
+    print(result.output)
+
+    assert result.exit_code == 0
+
+
+def test_solve_incremental_history(tmp_path):
+    (tmp_path / "input.py").write_text(INPUT)
+    (tmp_path / "changed.py").write_text(CHANGED_INPUT)
+
+    state = State(config=dict(retention=dict(keep_last=2)))
+    state.load(*load_input_py(tmp_path / "input.py"))
+    state.sequence.solve(state.in_profile)
+    first_unit = state.sequence[0]
+
+    state.load(*load_input_py(tmp_path / "changed.py"))
+    state.sequence.solve(state.in_profile)
+
+    state.load(*load_input_py(tmp_path / "input.py"))
+    with reuse_previous_solution(state) as reused:
+        state.sequence.solve(state.in_profile)
+
+    assert reused == len(state.sequence)
+    assert state.sequence[0] is first_unit
+    assert state.solution_history == []
+    assert state.previous_solution is not None
+
+
+HOOK = """
+import pyroll.core as pr
+
+
+@pr.RollPass.roll_force
+def constant_roll_force(self):
+    return {value}
+"""
+
+
+@pytest.fixture
+def restore_roll_force_hook():
+    from pyroll.core import RollPass
+
+    functions = list(RollPass.roll_force._functions)
+    try:
+        yield
+    finally:
+        RollPass.roll_force._functions[:] = functions
+
+
+def test_solve_incremental_changed_hook(tmp_path, caplog, restore_roll_force_hook):
+    caplog.set_level(logging.INFO, "pyroll.cli")
+    (tmp_path / "input.py").write_text(HOOK.format(value=1.0) + INPUT)
+    (tmp_path / "changed.py").write_text(HOOK.format(value=2.0) + INPUT)
+    runner = click.testing.CliRunner()
+    state = State(config=dict(pyroll=dict()), logger=logging.getLogger("pyroll.cli"))
+
+    os.chdir(tmp_path)
+    result = runner.invoke(main, ["-nC", "input-py", "solve", "input-py", "solve", "-i"], obj=state)
+    assert result.exit_code == 0
+    assert "Reusing the previous solution" in caplog.text
+
+    caplog.clear()
+    result = runner.invoke(main, ["-nC", "input-py", "-f", "changed.py", "solve", "-i"], obj=state)
+    print(result.output)
+
+    assert result.exit_code == 0
+    assert "Reusing the previous solution" not in caplog.text
+    assert all(rp.roll_force == 2.0 for rp in state.sequence.roll_passes)
+
+
+def test_watch_file_replaced(tmp_path, monkeypatch):
+    (tmp_path / "input.py").write_text(INPUT)
+    runner = click.testing.CliRunner()
+    ticks = []
+
+    def _sleep(_):
+        # the file is missing for one tick, as while an editor replaces it
+        ticks.append(None)
+        if len(ticks) == 1:
+            (tmp_path / "input.py").unlink()
+        elif len(ticks) == 2:
+            (tmp_path / "input.py").write_text(CHANGED_INPUT)
+        else:
+            raise KeyboardInterrupt()
+
+    monkeypatch.setattr(time, "sleep", _sleep)
+
+    os.chdir(tmp_path)
+    result = runner.invoke(main, ["-nC", "watch", "-i", "0.01"])
+    print(result.output)
+
+    assert result.exit_code == 0
+    assert len(ticks) == 3
@@ -0,0 +1,33 @@
+import json
+
+from pyroll.cli.program import main
+from pyroll.cli.config import RES_DIR
+import click.testing
+import os
+
+INPUT = (RES_DIR / f"input.py").read_text()
+
+SWEEP = """
+[in_profile]
+temperature = [1423.15, 1473.15]
+
+[units."Oval I"]
+gap = { start = 1e-3, stop = 3e-3, num = 3 }
+"""
+
+
+def test_solve_sweep(tmp_path):
+    (tmp_path / "input.py").write_text(INPUT)
+    (tmp_path / "sweep.toml").write_text(SWEEP)
+    runner = click.testing.CliRunner()
+
+    os.chdir(tmp_path)
+    result = runner.invoke(main, ["input-py", "solve-sweep", "-j", "2", "-o", "sweep.jsonl"])
+    print(result.output)
+
+    assert result.exit_code == 0
+
+    results = [json.loads(l) for l in (tmp_path / "sweep.jsonl").read_text().splitlines()]
+    assert len(results) == 6
+    assert all(r["status"] == "ok" for r in results)
+    assert {r["Oval I.gap"] for r in results} == {1e-3, 2e-3, 3e-3}
@@ -0,0 +1,51 @@
+import logging
+import os
+
+import click.testing
+
+from pyroll.cli.config import RES_DIR
+from pyroll.cli.program import main
+from pyroll.cli.program.state import State
+
+INPUT = (RES_DIR / f"input.py").read_text()
+
+
+def test_solve_timeout(tmp_path):
+    (tmp_path / "input.py").write_text(INPUT)
+    runner = click.testing.CliRunner()
+
+    os.chdir(tmp_path)
+    result = runner.invoke(main, ["-nC", "input-py", "solve", "--timeout", "1e-6"])
+    print(result.output)
+
+    assert result.exit_code == 1
+    assert "Solution Aborted" in result.output
+    assert "total" in result.output
+
+
+def test_solve_unit_timeout(tmp_path):
+    (tmp_path / "input.py").write_text(INPUT)
+    runner = click.testing.CliRunner()
+    state = State(
+        config=dict(pyroll=dict(), solve=dict(unit_timeouts={"Round II": 1e-9})),
+        logger=logging.getLogger("pyroll.cli")
+    )
+
+    os.chdir(tmp_path)
+    result = runner.invoke(main, ["-nC", "input-py", "solve"], obj=state)
+    print(result.output)
+
+    assert result.exit_code == 1
+    assert "Round II" in result.output
+    assert state.sequence[0].out_profile.width > 0
+
+
+def test_solve_within_budget(tmp_path):
+    (tmp_path / "input.py").write_text(INPUT)
+    runner = click.testing.CliRunner()
+
+    os.chdir(tmp_path)
+    result = runner.invoke(main, ["-nC", "input-py", "solve", "--timeout", "600"])
+    print(result.output)
+
+    assert result.exit_code == 0
@@ -0,0 +1,93 @@
+from pyroll.cli.program import main
+from pyroll.cli.program.input import load_input_py
+from pyroll.cli.program.state import State
+from pyroll.cli.program.warmstart import warm_start, iteration_count
+from pyroll.cli.config import RES_DIR
+import click.testing
+import logging
+import os
+import pytest
+
+INPUT = (RES_DIR / f"input.py").read_text()
+CHANGED_INPUT = INPUT.replace("gap=2e-3", "gap=2.1e-3", 1)
+
+
+def test_solve_warm_start(tmp_path):
+    (tmp_path / "input.py").write_text(INPUT)
+    (tmp_path / "changed.py").write_text(CHANGED_INPUT)
+
+    state = State()
+    state.load(*load_input_py(tmp_path / "input.py"))
+    state.sequence.solve(state.in_profile)
+    cold_iterations = iteration_count(state.sequence)
+
+    state.load(*load_input_py(tmp_path / "input.py"))
+    with warm_start(state) as (seeded, previous_iterations):
+        state.sequence.solve(state.in_profile)
+
+    assert seeded == len(state.sequence)
+    assert previous_iterations == cold_iterations
+    assert iteration_count(state.sequence) < cold_iterations
+    assert "init_solve" not in state.sequence[0].__dict__
+
+    state.load(*load_input_py(tmp_path / "changed.py"))
+    with warm_start(state):
+        state.sequence.solve(state.in_profile)
+
+    in_profile, expected = load_input_py(tmp_path / "changed.py")
+    expected.solve(in_profile)
+
+    assert state.sequence.out_profile.cross_section.area == pytest.approx(expected.out_profile.cross_section.area)
+    assert state.sequence.out_profile.temperature == pytest.approx(expected.out_profile.temperature)
+    assert state.sequence[0].roll_force == pytest.approx(expected[0].roll_force, rel=1e-3)
+
+
+def test_solve_warm_start_cli(tmp_path, caplog):
+    (tmp_path / "input.py").write_text(INPUT)
+    (tmp_path / "changed.py").write_text(CHANGED_INPUT)
+    runner = click.testing.CliRunner()
+    caplog.set_level(logging.INFO, "pyroll.cli")
+
+    os.chdir(tmp_path)
+    result = runner.invoke(main, ["-nC", "input-py", "solve", "input-py", "-f", "changed.py", "solve"])
+    print(result.output)
+
+    assert result.exit_code == 0
+    assert "Warm-started 3 of 3 solved units" in caplog.text
+
+    caplog.clear()
+    result = runner.invoke(main, ["-nC", "input-py", "solve", "input-py", "-f", "changed.py", "solve", "--cold-start"])
+
+    assert result.exit_code == 0
+    assert "Warm-started" not in caplog.text
+
+    # units reused by --incremental are not solved, so they do not count as warm-started
+    (tmp_path / "last_changed.py").write_text(INPUT.replace("depth=11.5e-3", "depth=11e-3"))
+    caplog.clear()
+    result = runner.invoke(main, ["-nC", "input-py", "solve", "input-py", "-f", "last_changed.py", "solve", "-i"])
+
+    assert result.exit_code == 0
+    assert "Reusing the previous solution of 2 unchanged leading units" in caplog.text
+    assert "Warm-started 1 of 1 solved units" in caplog.text
+
+
+def test_pairs():
+    from pyroll.core import Transport
+    from pyroll.cli.program.warmstart import _pairs
+
+    def _unit(label, solved=False):
+        unit = Transport(label=label, duration=1)
+        if solved:
+            unit.out_profile = object()
+        return unit
+
+    previous = [_unit("a", True), _unit("b", True)]
+
+    same = [_unit("a"), _unit("b")]
+    assert _pairs(same, previous) == list(zip(same, previous))
+
+    swapped = [_unit("b"), _unit("a")]
+    assert _pairs(swapped, previous) == [(swapped[0], previous[1]), (swapped[1], previous[0])]
+
+    unrelated = [_unit("x"), _unit("y")]
+    assert _pairs(unrelated, previous) == []
@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+STARTUP_BUDGET = 1.0
+"""Maximum wall time in seconds for importing the CLI and running a lightweight command."""
+
+HEAVY_MODULES = ["pyroll.core", "numpy", "jinja2", "click_repl", "prompt_toolkit"]
+
+SCRIPT = """
+import sys, time
+start = time.perf_counter()
+from pyroll.cli.program import main
+main({args!r}, standalone_mode=False)
+print(time.perf_counter() - start)
+print(",".join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+
+@pytest.mark.parametrize("args", [["--help"], ["-nC", "create-input-py"]])
+def test_startup(tmp_path, args):
+    result = subprocess.run(
+        [sys.executable, "-c", SCRIPT.format(args=args, heavy=HEAVY_MODULES)],
+        cwd=tmp_path, capture_output=True, text=True, check=True,
+        env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path)),
+    )
+    print(result.stdout)
+
+    *_, duration, imported = result.stdout.splitlines()
+
+    assert imported == ""
+    assert float(duration) < STARTUP_BUDGET
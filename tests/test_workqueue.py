@@ -0,0 +1,87 @@
+import os
+import time
+
+import click.testing
+
+from pyroll.cli.config import RES_DIR
+from pyroll.cli.program import main
+from pyroll.cli.program.workqueue import WorkQueue
+
+INPUT = (RES_DIR / f"input.py").read_text()
+
+
+def test_enqueue_worker(tmp_path):
+    (tmp_path / "input.py").write_text(INPUT)
+    (tmp_path / "input.toml").write_text((RES_DIR / "input.toml").read_text())
+    (tmp_path / "broken.py").write_text("raise ValueError('broken')")
+    runner = click.testing.CliRunner()
+
+    os.chdir(tmp_path)
+    result = runner.invoke(main, ["-nC", "enqueue", "-a", "2", "input.py", "input.toml", "broken.py"])
+    print(result.output)
+
+    assert result.exit_code == 0
+
+    result = runner.invoke(main, ["-nC", "worker", "-x", "-i", "0.01", "queue-status"])
+    print(result.output)
+
+    assert result.exit_code == 0
+
+    queue = WorkQueue(tmp_path / "queue.sqlite")
+    assert queue.counts() == dict(pending=0, running=0, done=2, failed=1)
+
+    records = {r["file"]: r for r in queue.results()}
+    assert records[str(tmp_path / "input.py")]["result"]["out_cross_section_area"] > 0
+    assert records[str(tmp_path / "broken.py")]["attempts"] == 2
+    assert "broken" in records[str(tmp_path / "broken.py")]["error"]
+
+
+def test_lease_expiry(tmp_path):
+    (tmp_path / "input.py").write_text(INPUT)
+    queue = WorkQueue(tmp_path / "queue.sqlite")
+    queue.enqueue([tmp_path / "input.py"], "key", max_attempts=2)
+
+    job = queue.claim("a", "key", lease=0.01)
+    assert job.attempts == 1
+    assert queue.claim("b", "key", lease=10) is None
+    assert queue.claim("b", "other key", lease=10) is None
+
+    time.sleep(0.05)
+    retried = queue.claim("b", "key", lease=0.01)
+    assert retried.id == job.id
+    assert retried.attempts == 2
+
+    assert not queue.complete(job, "a", dict(status="ok"))
+
+    time.sleep(0.05)
+    assert queue.claim("c", "key", lease=10) is None
+    assert queue.counts()["failed"] == 1
+
+
+HOOK = """
+import pyroll.core as pr
+
+
+@pr.RollPass.roll_force
+def constant_roll_force(self):
+    return 1.0
+"""
+
+
+def test_worker_isolated(tmp_path):
+    (tmp_path / "hook.py").write_text(HOOK + INPUT)
+    (tmp_path / "plain.py").write_text(INPUT)
+    runner = click.testing.CliRunner()
+
+    os.chdir(tmp_path)
+    result = runner.invoke(main, ["-nC", "enqueue", "hook.py", "plain.py"])
+    assert result.exit_code == 0
+
+    result = runner.invoke(main, ["-nC", "worker", "-x", "-i", "0.01"])
+    print(result.output)
+
+    assert result.exit_code == 0
+
+    records = {r["file"]: r for r in WorkQueue(tmp_path / "queue.sqlite").results()}
+    assert records[str(tmp_path / "hook.py")]["result"]["max_roll_force"] == 1.0
+    assert records[str(tmp_path / "plain.py")]["result"]["max_roll_force"] > 1e3